@@ -3,17 +3,26 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Tuple
+from functools import cached_property
+from typing import List, Tuple
 
 import numpy as np
 from numpy.typing import ArrayLike, NDArray
+from scipy.linalg import solve_triangular
 from sklearn.mixture import GaussianMixture
 from sklearn.naive_bayes import GaussianNB
 
+_LOG_CACHES = {"transition": "log_transition", "startprob": "log_startprob"}
+
 
 @dataclass
 class HiddenMarkovModel:
-    """Container for Gaussian-emission HMM parameters."""
+    """Container for Gaussian-emission HMM parameters.
+
+    ``log_transition`` and ``log_startprob`` are cached and recomputed after
+    ``transition`` or ``startprob`` is reassigned. Modifying those arrays in
+    place does not refresh the cache; assign a new array instead.
+    """
 
     transition: NDArray[np.float64]
     startprob: NDArray[np.float64]
@@ -37,6 +46,26 @@ class HiddenMarkovModel:
             msg = "Covariances must match number of hidden states."
             raise ValueError(msg)
 
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        # Reassigning a parameter invalidates the cached log of that parameter.
+        if name in _LOG_CACHES:
+            self.__dict__.pop(_LOG_CACHES[name], None)
+
+    @cached_property
+    def log_transition(self) -> NDArray[np.float64]:
+        """Element-wise log of the transition matrix, computed once per model."""
+
+        with np.errstate(divide="ignore"):
+            return np.log(self.transition)
+
+    @cached_property
+    def log_startprob(self) -> NDArray[np.float64]:
+        """Element-wise log of the initial state distribution."""
+
+        with np.errstate(divide="ignore"):
+            return np.log(self.startprob)
+
 
 def generate_probabilistic_dataset(
     n_samples: int = 400,
@@ -131,25 +160,6 @@ def bayesian_log_posterior(model: GaussianNB, X: ArrayLike) -> NDArray[np.float6
     return np.asarray(model.predict_log_proba(np.asarray(X)))
 
 
-def _gaussian_log_pdf(
-    x: NDArray[np.float64], mean: NDArray[np.float64], cov: NDArray[np.float64]
-) -> float:
-    """Log probability density of a multivariate normal distribution."""
-
-    x = np.atleast_1d(x)
-    mean = np.atleast_1d(mean)
-    cov = np.asarray(cov)
-    diff = x - mean
-    sign, logdet = np.linalg.slogdet(cov)
-    if sign <= 0:
-        msg = "Covariance matrix must be positive definite."
-        raise ValueError(msg)
-    inv_cov = np.linalg.inv(cov)
-    dim = mean.size
-    exponent = float(diff.T @ inv_cov @ diff)
-    return -0.5 * (dim * np.log(2.0 * np.pi) + logdet + exponent)
-
-
 def _logsumexp(
     arr: NDArray[np.float64], axis: int | None = None
 ) -> NDArray[np.float64]:
@@ -165,26 +175,207 @@ def _logsumexp(
     return np.squeeze(result, axis=axis)
 
 
-def hmm_log_likelihood(model: HiddenMarkovModel, observations: ArrayLike) -> float:
-    """Compute the log-likelihood of observations under a Gaussian HMM."""
+def gaussian_emission_log_probs(
+    model: HiddenMarkovModel, observations: ArrayLike
+) -> NDArray[np.float64]:
+    """Return emission log-densities with one Cholesky factorisation per state.
+
+    ``observations`` may be a single sequence ``(T, D)`` or a batch ``(B, T, D)``;
+    the result has the same leading shape with a trailing state axis.
+    """
 
     obs = np.asarray(observations, dtype=float)
+    dim = obs.shape[-1]
+    flat = obs.reshape(-1, dim)
     n_states = model.transition.shape[0]
-    n_obs = obs.shape[0]
-    emission_log_probs = np.empty((n_obs, n_states))
+    log_probs = np.empty((flat.shape[0], n_states))
     for state in range(n_states):
-        emission_log_probs[:, state] = [
-            _gaussian_log_pdf(point, model.means[state], model.covariances[state])
-            for point in obs
-        ]
+        cov = np.asarray(model.covariances[state], dtype=float).reshape(dim, dim)
+        try:
+            chol = np.linalg.cholesky(cov)
+        except np.linalg.LinAlgError as exc:
+            msg = "Covariance matrix must be positive definite."
+            raise ValueError(msg) from exc
+        diff = flat - np.atleast_1d(model.means[state])
+        whitened = solve_triangular(chol, diff.T, lower=True)
+        mahalanobis = np.einsum("ij,ij->j", whitened, whitened)
+        logdet = 2.0 * np.sum(np.log(np.diag(chol)))
+        log_probs[:, state] = -0.5 * (dim * np.log(2.0 * np.pi) + logdet + mahalanobis)
+    return log_probs.reshape(obs.shape[:-1] + (n_states,))
+
+
+def _as_batch(observations: ArrayLike) -> Tuple[NDArray[np.float64], bool]:
+    """Promote a single ``(T, D)`` sequence to a batch of one."""
+
+    obs = np.asarray(observations, dtype=float)
+    if obs.ndim == 2:
+        return obs[np.newaxis], True
+    if obs.ndim != 3:
+        msg = "Observations must have shape (T, D) or (B, T, D)."
+        raise ValueError(msg)
+    return obs, False
+
+
+def _forward(
+    model: HiddenMarkovModel, emission_log_probs: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """Batched forward recursion returning ``log_alpha`` of shape ``(B, T, K)``."""
+
+    log_alpha = np.empty_like(emission_log_probs)
+    log_alpha[:, 0] = model.log_startprob + emission_log_probs[:, 0]
+    log_transition = model.log_transition
+    for t in range(1, emission_log_probs.shape[1]):
+        log_alpha[:, t] = (
+            _logsumexp(log_alpha[:, t - 1, :, np.newaxis] + log_transition, axis=1)
+            + emission_log_probs[:, t]
+        )
+    return log_alpha
+
+
+def _backward(
+    model: HiddenMarkovModel, emission_log_probs: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """Batched backward recursion returning ``log_beta`` of shape ``(B, T, K)``."""
+
+    log_beta = np.zeros_like(emission_log_probs)
+    log_transition = model.log_transition
+    for t in range(emission_log_probs.shape[1] - 2, -1, -1):
+        log_beta[:, t] = _logsumexp(
+            log_transition
+            + (emission_log_probs[:, t + 1] + log_beta[:, t + 1])[:, np.newaxis, :],
+            axis=2,
+        )
+    return log_beta
+
+
+@dataclass
+class ForwardBackwardResult:
+    """Posterior quantities produced by the forward-backward algorithm."""
+
+    log_likelihood: NDArray[np.float64]
+    state_posteriors: NDArray[np.float64]
+    transition_counts: NDArray[np.float64]
+
+
+def forward_backward(
+    model: HiddenMarkovModel, observations: ArrayLike
+) -> ForwardBackwardResult:
+    """Compute per-sequence likelihoods, state posteriors and expected transitions.
+
+    ``state_posteriors`` has shape ``(B, T, K)`` and ``transition_counts`` holds
+    the expected number of ``i -> j`` transitions summed over the whole batch.
+    """
+
+    obs, _ = _as_batch(observations)
+    emission_log_probs = gaussian_emission_log_probs(model, obs)
+    log_alpha = _forward(model, emission_log_probs)
+    log_beta = _backward(model, emission_log_probs)
+    log_likelihood = _logsumexp(log_alpha[:, -1], axis=1)
+    log_gamma = log_alpha + log_beta - log_likelihood[:, np.newaxis, np.newaxis]
+    if obs.shape[1] > 1:
+        log_xi = (
+            log_alpha[:, :-1, :, np.newaxis]
+            + model.log_transition
+            + (emission_log_probs[:, 1:] + log_beta[:, 1:])[:, :, np.newaxis, :]
+            - log_likelihood[:, np.newaxis, np.newaxis, np.newaxis]
+        )
+        transition_counts = np.exp(log_xi).sum(axis=(0, 1))
+    else:
+        transition_counts = np.zeros_like(model.transition)
+    return ForwardBackwardResult(
+        log_likelihood=np.atleast_1d(log_likelihood),
+        state_posteriors=np.exp(log_gamma),
+        transition_counts=transition_counts,
+    )
+
+
+def viterbi_decode(
+    model: HiddenMarkovModel, observations: ArrayLike
+) -> Tuple[NDArray[np.int_], NDArray[np.float64]]:
+    """Return the most likely state path and its log-probability.
 
-    log_alpha = np.log(model.startprob) + emission_log_probs[0]
+    A single ``(T, D)`` sequence yields a ``(T,)`` path and scalar score; a
+    ``(B, T, D)`` batch yields ``(B, T)`` paths and ``(B,)`` scores.
+    """
+
+    obs, single = _as_batch(observations)
+    emission_log_probs = gaussian_emission_log_probs(model, obs)
+    n_batch, n_obs, n_states = emission_log_probs.shape
+    log_transition = model.log_transition
+    delta = model.log_startprob + emission_log_probs[:, 0]
+    backpointers = np.empty((n_batch, n_obs, n_states), dtype=np.int_)
     for t in range(1, n_obs):
-        log_alpha = (
-            _logsumexp(log_alpha[:, np.newaxis] + np.log(model.transition), axis=0)
-            + emission_log_probs[t]
+        scores = delta[:, :, np.newaxis] + log_transition
+        backpointers[:, t] = np.argmax(scores, axis=1)
+        delta = np.max(scores, axis=1) + emission_log_probs[:, t]
+    paths = np.empty((n_batch, n_obs), dtype=np.int_)
+    paths[:, -1] = np.argmax(delta, axis=1)
+    rows = np.arange(n_batch)
+    for t in range(n_obs - 1, 0, -1):
+        paths[:, t - 1] = backpointers[rows, t, paths[:, t]]
+    best = delta.max(axis=1)
+    if single:
+        return paths[0], best[0]
+    return paths, best
+
+
+def fit_hmm_baum_welch(
+    model: HiddenMarkovModel,
+    observations: ArrayLike,
+    n_iter: int = 50,
+    tol: float = 1e-4,
+    min_covar: float = 1e-6,
+) -> Tuple[HiddenMarkovModel, List[float]]:
+    """Refine Gaussian HMM parameters with Baum-Welch EM on a batch of sequences.
+
+    Returns the fitted model and the total log-likelihood recorded before each
+    M-step so callers can confirm monotone improvement.
+    """
+
+    obs, _ = _as_batch(observations)
+    dim = obs.shape[-1]
+    flat_obs = obs.reshape(-1, dim)
+    history: List[float] = []
+    for _ in range(n_iter):
+        result = forward_backward(model, obs)
+        total = float(result.log_likelihood.sum())
+        if history and abs(total - history[-1]) < tol:
+            history.append(total)
+            break
+        history.append(total)
+
+        gamma = result.state_posteriors
+        startprob = gamma[:, 0].mean(axis=0)
+        transition = result.transition_counts / result.transition_counts.sum(
+            axis=1, keepdims=True
+        )
+        flat_gamma = gamma.reshape(-1, gamma.shape[-1])
+        occupancy = flat_gamma.sum(axis=0)
+        means = (flat_gamma.T @ flat_obs) / occupancy[:, np.newaxis]
+        covariances = np.empty((len(occupancy), dim, dim))
+        for state in range(len(occupancy)):
+            diff = flat_obs - means[state]
+            covariances[state] = (flat_gamma[:, state, np.newaxis] * diff).T @ diff
+            covariances[state] /= occupancy[state]
+            covariances[state] += min_covar * np.eye(dim)
+        model = HiddenMarkovModel(
+            transition=transition,
+            startprob=startprob / startprob.sum(),
+            means=means,
+            covariances=covariances,
         )
-    return float(_logsumexp(log_alpha))
+    return model, history
+
+
+def hmm_log_likelihood(model: HiddenMarkovModel, observations: ArrayLike) -> float:
+    """Compute the log-likelihood of observations under a Gaussian HMM.
+
+    Batches of sequences ``(B, T, D)`` return the summed log-likelihood.
+    """
+
+    obs, _ = _as_batch(observations)
+    log_alpha = _forward(model, gaussian_emission_log_probs(model, obs))
+    return float(np.sum(_logsumexp(log_alpha[:, -1], axis=1)))
 
 
 def build_demo_hmm(random_state: int = 54) -> HiddenMarkovModel:
@@ -2,8 +2,24 @@
 
 from __future__ import annotations
 
+import queue
+import signal
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Callable, Dict, Tuple
+from multiprocessing import Manager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Literal, Mapping, Tuple
 
 import numpy as np
 import pandas as pd
@@ -20,6 +36,7 @@ class ForecastResult:
     forecast: pd.Series
     lower: pd.Series | None
     upper: pd.Series | None
+    params: np.ndarray | None = None
 
 
 def generate_seasonal_series(
@@ -56,11 +73,16 @@ def fit_arima_forecast(
     train: pd.Series,
     order: Tuple[int, int, int] = (1, 1, 1),
     steps: int = 12,
+    start_params: ArrayLike | None = None,
 ) -> ForecastResult:
-    """Fit an ARIMA model and forecast the specified number of steps."""
+    """Fit an ARIMA model and forecast the specified number of steps.
+
+    ``start_params`` warm-starts the optimiser, e.g. from a previous fit's
+    ``ForecastResult.params`` on a slightly shorter window.
+    """
 
     model = ARIMA(train, order=order)
-    fitted = model.fit()
+    fitted = model.fit(start_params=start_params)
     forecast_res = fitted.get_forecast(steps=steps)
     mean = forecast_res.predicted_mean
     conf_int = forecast_res.conf_int(alpha=0.05)
@@ -68,6 +90,7 @@ def fit_arima_forecast(
         forecast=mean,
         lower=conf_int.iloc[:, 0],
         upper=conf_int.iloc[:, 1],
+        params=np.asarray(fitted.params, dtype=float),
     )
 
 
@@ -76,6 +99,7 @@ def fit_sarimax_forecast(
     order: Tuple[int, int, int] = (1, 0, 0),
     seasonal_order: Tuple[int, int, int, int] = (0, 1, 1, 12),
     steps: int = 12,
+    start_params: ArrayLike | None = None,
 ) -> ForecastResult:
     """Fit a SARIMAX model that captures seasonal structure."""
 
@@ -87,7 +111,7 @@ def fit_sarimax_forecast(
         enforce_stationarity=False,
         enforce_invertibility=False,
     )
-    fitted = model.fit(disp=False)
+    fitted = model.fit(start_params=start_params, disp=False)
     forecast_res = fitted.get_forecast(steps=steps)
     mean = forecast_res.predicted_mean
     conf_int = forecast_res.conf_int(alpha=0.05)
@@ -95,6 +119,7 @@ def fit_sarimax_forecast(
         forecast=mean,
         lower=conf_int.iloc[:, 0],
         upper=conf_int.iloc[:, 1],
+        params=np.asarray(fitted.params, dtype=float),
     )
 
 
@@ -119,46 +144,308 @@ def fit_exponential_smoothing(
 
 
 def forecast_metrics(y_true: ArrayLike, y_pred: ArrayLike) -> Dict[str, float]:
-    """Return common time-series error metrics."""
+    """Return common time-series error metrics.
+
+    A zero forecast for a zero actual counts as a perfect forecast in MAPE and
+    sMAPE. Missing actuals or forecasts make every metric NaN.
+    """
 
     y_true = np.asarray(y_true, dtype=float)
     y_pred = np.asarray(y_pred, dtype=float)
     mae = np.mean(np.abs(y_true - y_pred))
     rmse = float(np.sqrt(np.mean((y_true - y_pred) ** 2)))
-    with np.errstate(divide="ignore", invalid="ignore"):
-        mape = np.mean(np.abs((y_true - y_pred) / y_true)) * 100
-        smape = 100 * np.mean(
-            np.abs(y_true - y_pred) / ((np.abs(y_true) + np.abs(y_pred)) / 2)
-        )
+    ape, sape = _percentage_errors(y_true, y_pred)
     return {
         "mae": float(mae),
         "rmse": rmse,
-        "mape": float(np.nan_to_num(mape)),
-        "smape": float(np.nan_to_num(smape)),
+        "mape": float(np.nan_to_num(np.mean(ape) * 100, nan=np.nan)),
+        "smape": float(np.nan_to_num(np.mean(sape) * 100, nan=np.nan)),
+    }
+
+
+def _percentage_errors(
+    actual: np.ndarray, predicted: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Absolute and symmetric percentage errors, with 0/0 defined as 0."""
+
+    abs_err = np.abs(actual - predicted)
+    perfect = (actual == 0) & (predicted == 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ape = np.where(perfect, 0.0, abs_err / np.abs(actual))
+        sape = np.where(
+            perfect, 0.0, abs_err / ((np.abs(actual) + np.abs(predicted)) / 2)
+        )
+    return ape, sape
+
+
+def naive_scale(
+    history: pd.DataFrame,
+    group_cols: str | List[str],
+    value_col: str = "value",
+    seasonality: int = 1,
+) -> pd.Series:
+    """Mean absolute seasonal-naive error per series, the MASE denominator.
+
+    ``history`` must already be sorted by time within each group.
+    """
+
+    keys = [group_cols] if isinstance(group_cols, str) else list(group_cols)
+    grouped = history.groupby(keys, sort=True, observed=True)[value_col]
+    diffs = (history[value_col] - grouped.shift(seasonality)).abs()
+    return diffs.groupby(
+        [history[key] for key in keys], sort=True, observed=True
+    ).mean()
+
+
+def grouped_forecast_metrics(
+    frame: pd.DataFrame,
+    group_cols: str | List[str],
+    *,
+    actual_col: str = "actual",
+    forecast_col: str = "forecast",
+    weight_col: str | None = None,
+    scale: pd.Series | None = None,
+) -> pd.DataFrame:
+    """Compute ``forecast_metrics`` for every group in a single groupby pass.
+
+    Besides MAE, RMSE, MAPE and sMAPE, each group gets WAPE (total absolute
+    error over total absolute actuals). ``weight_col`` adds weighted MAE,
+    RMSE and MAPE, and ``scale`` (for example from ``naive_scale``, indexed
+    like the groups) adds MASE. Include a horizon column in ``group_cols``
+    to score each step separately.
+
+    Percentage errors follow ``forecast_metrics``: 0/0 counts as a perfect
+    forecast, and a group with a missing actual or forecast gets NaN metrics.
+    """
+
+    keys = [group_cols] if isinstance(group_cols, str) else list(group_cols)
+    actual = frame[actual_col].to_numpy(dtype=float)
+    predicted = frame[forecast_col].to_numpy(dtype=float)
+    abs_err = np.abs(actual - predicted)
+    ape, sape = _percentage_errors(actual, predicted)
+    terms = {
+        "missing": np.isnan(abs_err),
+        "abs_err": abs_err,
+        "sq_err": abs_err**2,
+        "ape": ape,
+        "sape": sape,
+        "abs_actual": np.abs(actual),
     }
+    if weight_col is not None:
+        weights = frame[weight_col].to_numpy(dtype=float)
+        terms.update(
+            weight=weights,
+            w_abs_err=weights * abs_err,
+            w_sq_err=weights * abs_err**2,
+            w_ape=weights * ape,
+        )
+    work = pd.DataFrame(terms, index=frame.index)
+    grouped = work.groupby([frame[key] for key in keys], sort=True, observed=True)
+    totals = grouped.sum()
+    n = grouped.size()
+
+    def _clean(values: pd.Series) -> pd.Series:
+        return pd.Series(np.nan_to_num(values.to_numpy()), index=values.index)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = pd.DataFrame(
+            {
+                "mae": totals["abs_err"] / n,
+                "rmse": np.sqrt(totals["sq_err"] / n),
+                "mape": _clean(totals["ape"] / n * 100),
+                "smape": _clean(totals["sape"] / n * 100),
+                "wape": _clean(totals["abs_err"] / totals["abs_actual"] * 100),
+                "count": n,
+            }
+        )
+        if weight_col is not None:
+            result["weighted_mae"] = totals["w_abs_err"] / totals["weight"]
+            result["weighted_rmse"] = np.sqrt(totals["w_sq_err"] / totals["weight"])
+            result["weighted_mape"] = _clean(totals["w_ape"] / totals["weight"] * 100)
+        if scale is not None:
+            lookup = result.index.to_frame(index=False)[list(scale.index.names)]
+            aligned = scale.reindex(
+                pd.MultiIndex.from_frame(lookup)
+                if scale.index.nlevels > 1
+                else pd.Index(lookup.iloc[:, 0])
+            )
+            result["mase"] = result["mae"].to_numpy() / aligned.to_numpy()
+    # ``sum`` skips NaN terms; a missing value must not shrink the errors.
+    metric_cols = result.columns.drop("count")
+    result.loc[totals["missing"] > 0, metric_cols] = np.nan
+    return result.reset_index()
+
+
+@dataclass(frozen=True)
+class BacktestFold:
+    """Positional train/test boundaries for one backtest origin."""
+
+    fold: int
+    train_start: int
+    train_end: int
+
+
+def backtest_folds(
+    n_obs: int,
+    initial_train_size: int,
+    horizon: int,
+    *,
+    window: Literal["expanding", "sliding"] = "expanding",
+    stride: int = 1,
+) -> List[BacktestFold]:
+    """Enumerate rolling origins for expanding or fixed-length sliding windows."""
+
+    if initial_train_size + horizon > n_obs:
+        msg = "Not enough observations for the specified horizon."
+        raise ValueError(msg)
+    if stride < 1:
+        msg = "stride must be at least 1"
+        raise ValueError(msg)
+    if window not in {"expanding", "sliding"}:
+        msg = "window must be 'expanding' or 'sliding'"
+        raise ValueError(msg)
+    origins = range(initial_train_size, n_obs - horizon + 1, stride)
+    return [
+        BacktestFold(
+            fold=fold,
+            train_start=0 if window == "expanding" else end - initial_train_size,
+            train_end=end,
+        )
+        for fold, end in enumerate(origins)
+    ]
+
+
+def _iter_backtest_chunk(
+    series: pd.Series,
+    folds: List[BacktestFold],
+    horizon: int,
+    model_builder: Callable[..., ForecastResult],
+    warm_start: bool,
+) -> Iterator[Dict[str, object]]:
+    """Evaluate consecutive folds, carrying fitted parameters forward."""
+
+    params = None
+    for spec in folds:
+        train = series.iloc[spec.train_start : spec.train_end]
+        test = series.iloc[spec.train_end : spec.train_end + horizon]
+        if warm_start:
+            forecast = model_builder(train, horizon, start_params=params)
+            params = forecast.params
+        else:
+            forecast = model_builder(train, horizon)
+        metrics: Dict[str, object] = dict(
+            forecast_metrics(test.values, forecast.forecast.values)
+        )
+        metrics["start"] = series.index[spec.train_end]
+        metrics["fold"] = spec.fold
+        metrics["train_size"] = spec.train_end - spec.train_start
+        yield metrics
+
+
+def _backtest_chunk(
+    series: pd.Series,
+    folds: List[BacktestFold],
+    horizon: int,
+    model_builder: Callable[..., ForecastResult],
+    warm_start: bool,
+    rows: "queue.Queue[Dict[str, object]]",
+) -> None:
+    """Worker entry point: push each fold's metrics to ``rows`` as it finishes."""
+
+    for metrics in _iter_backtest_chunk(
+        series, folds, horizon, model_builder, warm_start
+    ):
+        rows.put(metrics)
+
+
+def iter_rolling_origin_backtest(
+    series: pd.Series,
+    initial_train_size: int,
+    horizon: int,
+    model_builder: Callable[..., ForecastResult],
+    *,
+    window: Literal["expanding", "sliding"] = "expanding",
+    stride: int = 1,
+    warm_start: bool = False,
+    n_jobs: int = 1,
+    chunk_size: int | None = None,
+) -> Iterator[Dict[str, object]]:
+    """Yield per-fold metrics as soon as each fold finishes.
+
+    Folds are grouped into contiguous chunks that run in separate worker
+    processes when ``n_jobs > 1`` (``model_builder`` must then be picklable,
+    e.g. a module-level function or ``functools.partial``). With
+    ``warm_start=True`` the builder is called as
+    ``model_builder(train, horizon, start_params=...)`` and each fold starts
+    from the previous fold's ``ForecastResult.params`` within its chunk. The
+    default chunking gives every worker one chunk so warm starts chain across
+    as many folds as possible. Workers send each fold's row back through a
+    queue, so long chunks still stream; in parallel mode, rows arrive in
+    completion order.
+    """
+
+    folds = backtest_folds(
+        len(series), initial_train_size, horizon, window=window, stride=stride
+    )
+    n_workers = max(1, min(n_jobs, len(folds)))
+    if chunk_size is None:
+        chunk_size = -(-len(folds) // n_workers) if warm_start else 1
+    chunks = [folds[i : i + chunk_size] for i in range(0, len(folds), chunk_size)]
+    if n_workers == 1:
+        for chunk in chunks:
+            yield from _iter_backtest_chunk(
+                series, chunk, horizon, model_builder, warm_start
+            )
+        return
+    with Manager() as manager, ProcessPoolExecutor(max_workers=n_workers) as pool:
+        rows = manager.Queue()
+        pending = {
+            pool.submit(
+                _backtest_chunk, series, chunk, horizon, model_builder, warm_start, rows
+            )
+            for chunk in chunks
+        }
+        remaining = len(folds)
+        while remaining:
+            try:
+                row = rows.get(timeout=0.1)
+            except queue.Empty:
+                # Surface a worker failure instead of waiting for rows that
+                # will never arrive.
+                for future in [future for future in pending if future.done()]:
+                    pending.discard(future)
+                    future.result()
+                continue
+            remaining -= 1
+            yield row
 
 
 def rolling_origin_backtest(
     series: pd.Series,
     initial_train_size: int,
     horizon: int,
-    model_builder: Callable[[pd.Series, int], ForecastResult],
+    model_builder: Callable[..., ForecastResult],
+    *,
+    window: Literal["expanding", "sliding"] = "expanding",
+    stride: int = 1,
+    warm_start: bool = False,
+    n_jobs: int = 1,
+    chunk_size: int | None = None,
 ) -> pd.DataFrame:
     """Perform a rolling-origin backtest returning metrics per split."""
 
-    if initial_train_size + horizon > len(series):
-        msg = "Not enough observations for the specified horizon."
-        raise ValueError(msg)
-    rows = []
-    for start in range(len(series) - initial_train_size - horizon + 1):
-        train_end = initial_train_size + start
-        train = series.iloc[:train_end]
-        test = series.iloc[train_end : train_end + horizon]
-        forecast = model_builder(train, horizon)
-        metrics = forecast_metrics(test.values, forecast.forecast.values)
-        metrics["start"] = series.index[train_end]
-        rows.append(metrics)
-    return pd.DataFrame(rows)
+    rows = iter_rolling_origin_backtest(
+        series,
+        initial_train_size,
+        horizon,
+        model_builder,
+        window=window,
+        stride=stride,
+        warm_start=warm_start,
+        n_jobs=n_jobs,
+        chunk_size=chunk_size,
+    )
+    return pd.DataFrame(list(rows)).sort_values("fold").reset_index(drop=True)
 
 
 def prophet_style_forecast(train: pd.Series, steps: int = 12) -> ForecastResult:
@@ -171,6 +458,303 @@ def prophet_style_forecast(train: pd.Series, steps: int = 12) -> ForecastResult:
     return result
 
 
+class SeriesTimeoutError(TimeoutError):
+    """Raised when a single series exceeds its fitting budget."""
+
+
+@contextmanager
+def _time_limit(seconds: float | None) -> Iterator[None]:
+    """Interrupt the block after ``seconds`` using ``SIGALRM`` where available.
+
+    Signals can only be installed from the main thread, so elsewhere the block
+    runs unguarded and the caller must enforce the limit some other way.
+    """
+
+    if (
+        not seconds
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def _raise(signum: int, frame: object) -> None:
+        raise SeriesTimeoutError(f"fit exceeded {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, _raise)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+@dataclass
+class BatchForecastResult:
+    """Long-format forecasts for every series that fitted, plus per-series failures."""
+
+    forecasts: pd.DataFrame
+    failures: pd.DataFrame
+
+
+_FORECAST_COLUMNS = ["step", "period", "forecast", "lower", "upper"]
+
+
+def _series_from_long(group: pd.DataFrame, time_col: str, value_col: str) -> pd.Series:
+    index = pd.DatetimeIndex(group[time_col])
+    freq = pd.infer_freq(index) if len(index) >= 3 else None
+    values = group[value_col].to_numpy(dtype=float)
+    return pd.Series(values, index=pd.DatetimeIndex(index, freq=freq))
+
+
+def _forecast_series_chunk(
+    items: List[Tuple[Any, pd.Series]],
+    model_builder: Callable[..., ForecastResult],
+    steps: int,
+    model_kwargs: Mapping[str, Any],
+    timeout: float | None,
+) -> Tuple[List[pd.DataFrame], List[Dict[str, Any]]]:
+    """Fit each series independently so one failure never sinks the chunk."""
+
+    frames: List[pd.DataFrame] = []
+    failures: List[Dict[str, Any]] = []
+    for series_id, series in items:
+        try:
+            with warnings.catch_warnings(), _time_limit(timeout):
+                warnings.simplefilter("ignore")
+                result = model_builder(series, steps=steps, **model_kwargs)
+        except Exception as exc:
+            failures.append(
+                {"series_id": series_id, "error": f"{type(exc).__name__}: {exc}"}
+            )
+            continue
+        nan = np.full(steps, np.nan)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "series_id": series_id,
+                    "step": np.arange(1, steps + 1),
+                    "period": result.forecast.index,
+                    "forecast": result.forecast.to_numpy(),
+                    "lower": nan if result.lower is None else result.lower.to_numpy(),
+                    "upper": nan if result.upper is None else result.upper.to_numpy(),
+                }
+            )
+        )
+    return frames, failures
+
+
+# Extra seconds per series before a worker that ignores ``SIGALRM`` (for
+# example stuck inside compiled code) is killed.
+_WORKER_GRACE = 5.0
+
+
+def _shutdown_pool(pool: ProcessPoolExecutor) -> None:
+    """Stop a pool without waiting for hung fits to return."""
+
+    terminate = getattr(pool, "terminate_workers", None)  # Python 3.14+
+    if terminate is not None:
+        terminate()
+    else:
+        # Older Pythons have no public way to kill the workers. ``_processes``
+        # is a CPython implementation detail (pid -> Process), used only here
+        # as a fallback.
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+    pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _forecast_chunks_in_processes(
+    chunks: List[List[Tuple[Any, pd.Series]]],
+    n_workers: int,
+    args: Tuple[Any, ...],
+    timeout: float | None,
+    collect: Callable[[Tuple[List[pd.DataFrame], List[Dict[str, Any]]]], None],
+) -> None:
+    """Run chunks in worker processes, recycling workers that hang or crash.
+
+    Each chunk gets ``(timeout + _WORKER_GRACE)`` seconds per series. A chunk
+    that overruns that budget or takes its worker down is retried one series
+    at a time. A single series that overruns is recorded as a failure. A
+    crash breaks every chunk in flight, so a single series caught in one is
+    rerun alone and recorded only if it crashes its worker by itself. Chunks
+    that were merely in flight when the pool was recycled are requeued as
+    they were.
+    """
+
+    # ``isolated`` chunks are suspects of a crash and run with no neighbours.
+    pending = deque((chunk, False) for chunk in chunks)
+    running: Dict[Future, Tuple[List[Tuple[Any, pd.Series]], bool, float]] = {}
+
+    def _retry(chunk: List[Tuple[Any, pd.Series]], isolate: bool, error: str) -> None:
+        if len(chunk) > 1:
+            pending.extend(([item], False) for item in chunk)
+        elif isolate:
+            pending.append((chunk, True))
+        else:
+            collect(([], [{"series_id": chunk[0][0], "error": error}]))
+
+    pool = ProcessPoolExecutor(max_workers=n_workers)
+    try:
+        while pending or running:
+            while pending and len(running) < n_workers:
+                if any(isolated for _, isolated, _ in running.values()) or (
+                    pending[0][1] and running
+                ):
+                    break
+                chunk, isolated = pending.popleft()
+                future = pool.submit(_forecast_series_chunk, chunk, *args, timeout)
+                deadline = (
+                    time.monotonic() + (timeout + _WORKER_GRACE) * len(chunk)
+                    if timeout
+                    else float("inf")
+                )
+                running[future] = (chunk, isolated, deadline)
+            next_deadline = min(deadline for _, _, deadline in running.values())
+            done, _ = wait(
+                running,
+                timeout=max(next_deadline - time.monotonic(), 0)
+                if next_deadline != float("inf")
+                else None,
+                return_when=FIRST_COMPLETED,
+            )
+            recycle = False
+            for future in done:
+                chunk, isolated, _ = running.pop(future)
+                try:
+                    part = future.result()
+                except BrokenProcessPool as exc:
+                    recycle = True
+                    _retry(chunk, not isolated, f"{type(exc).__name__}: {exc}")
+                    continue
+                except Exception as exc:
+                    # For example a model that cannot be pickled.
+                    error = f"{type(exc).__name__}: {exc}"
+                    part = (
+                        [],
+                        [{"series_id": sid, "error": error} for sid, _ in chunk],
+                    )
+                collect(part)
+            now = time.monotonic()
+            for future, (chunk, _, deadline) in list(running.items()):
+                if deadline <= now:
+                    recycle = True
+                    del running[future]
+                    _retry(
+                        chunk,
+                        False,
+                        f"SeriesTimeoutError: worker exceeded {timeout:g}s "
+                        "and was terminated",
+                    )
+            if recycle:
+                for chunk, isolated, _ in running.values():
+                    pending.appendleft((chunk, isolated))
+                running.clear()
+                _shutdown_pool(pool)
+                pool = ProcessPoolExecutor(max_workers=n_workers)
+    finally:
+        _shutdown_pool(pool)
+
+
+_MODEL_BUILDERS: Dict[str, Callable[..., ForecastResult]] = {
+    "arima": fit_arima_forecast,
+    "sarimax": fit_sarimax_forecast,
+    "exponential_smoothing": fit_exponential_smoothing,
+}
+
+
+def forecast_many_series(
+    frame: pd.DataFrame,
+    *,
+    id_col: str = "series_id",
+    time_col: str = "date",
+    value_col: str = "value",
+    model: str | Callable[..., ForecastResult] = "exponential_smoothing",
+    steps: int = 12,
+    model_kwargs: Mapping[str, Any] | None = None,
+    n_jobs: int = 1,
+    chunk_size: int = 100,
+    timeout: float | None = None,
+    output_path: str | Path | None = None,
+    overwrite: bool = False,
+) -> BatchForecastResult:
+    """Forecast every series in a long-format frame with isolated, parallel fits.
+
+    Series are grouped by ``id_col`` and dispatched in chunks of ``chunk_size``
+    to ``n_jobs`` worker processes. A series that raises, or runs longer than
+    ``timeout`` seconds, is recorded in ``failures`` while the rest of its
+    chunk continues. When ``output_path`` is given, forecasts are appended to
+    that CSV as each chunk completes, so a long nightly run leaves usable
+    partial output behind. The run starts a new file: an existing file at
+    ``output_path`` raises ``FileExistsError`` unless ``overwrite=True``, in
+    which case it is replaced.
+
+    With a ``timeout`` the fits always run in worker processes, even with
+    ``n_jobs=1``, so the caller's signal handlers and timers are never touched
+    and the call works from any thread; ``model`` must then be picklable.
+    Inside a worker the limit is enforced with ``SIGALRM`` where available.
+    Workers that hang in compiled code or crash are killed and replaced, and
+    the affected series are recorded in ``failures``.
+    """
+
+    builder = _MODEL_BUILDERS[model] if isinstance(model, str) else model
+    kwargs = dict(model_kwargs or {})
+    missing = {id_col, time_col, value_col} - set(frame.columns)
+    if missing:
+        msg = f"Frame missing required columns: {sorted(missing)}"
+        raise KeyError(msg)
+    ordered = frame.sort_values([id_col, time_col], kind="stable")
+    items = [
+        (series_id, _series_from_long(group, time_col, value_col))
+        for series_id, group in ordered.groupby(id_col, sort=False)
+    ]
+    chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+    path = Path(output_path) if output_path is not None else None
+    if path is not None and path.exists():
+        if not overwrite:
+            msg = f"{path} already exists; pass overwrite=True to replace it."
+            raise FileExistsError(msg)
+        path.unlink()
+
+    forecasts: List[pd.DataFrame] = []
+    failures: List[Dict[str, Any]] = []
+
+    def _collect(part: Tuple[List[pd.DataFrame], List[Dict[str, Any]]]) -> None:
+        frames, errors = part
+        failures.extend(errors)
+        if not frames:
+            return
+        block = pd.concat(frames, ignore_index=True).rename(
+            columns={"series_id": id_col}
+        )
+        forecasts.append(block)
+        if path is not None:
+            block.to_csv(path, mode="a", header=not path.exists(), index=False)
+
+    n_workers = max(1, min(n_jobs, len(chunks)))
+    if n_workers == 1 and not timeout:
+        for chunk in chunks:
+            _collect(_forecast_series_chunk(chunk, builder, steps, kwargs, None))
+    elif chunks:
+        _forecast_chunks_in_processes(
+            chunks, n_workers, (builder, steps, kwargs), timeout, _collect
+        )
+
+    columns = [id_col, *_FORECAST_COLUMNS]
+    forecast_frame = (
+        pd.concat(forecasts, ignore_index=True)
+        .sort_values([id_col, "step"], kind="stable")
+        .reset_index(drop=True)
+        if forecasts
+        else pd.DataFrame(columns=columns)
+    )
+    failure_frame = pd.DataFrame(failures, columns=["series_id", "error"]).rename(
+        columns={"series_id": id_col}
+    )
+    return BatchForecastResult(forecasts=forecast_frame, failures=failure_frame)
+
+
 def demo_forecasting_pipeline(random_state: int = 56) -> Dict[str, float]:
     """Generate a dataset, fit multiple models, and return evaluation metrics."""
 
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List
 
 import numpy as np
@@ -14,6 +14,30 @@ class TrainingLog:
 
     losses: List[float]
     reconstructions: np.ndarray
+    parameters: Dict[str, np.ndarray] = field(default_factory=dict)
+
+
+@dataclass
+class TrainingConfig:
+    """Shared optimisation settings for the generative training loops.
+
+    ``batch_size=None`` keeps the original full-batch updates. ``patience``
+    enables early stopping once the epoch loss fails to improve by more than
+    ``min_delta`` for that many consecutive epochs.
+    """
+
+    epochs: int = 200
+    lr: float = 0.05
+    batch_size: int | None = None
+    dtype: str = "float64"
+    patience: int | None = None
+    min_delta: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.dtype not in {"float32", "float64"}:
+            raise ValueError("dtype must be 'float32' or 'float64'.")
+        if self.batch_size is not None and self.batch_size <= 0:
+            raise ValueError("batch_size must be positive.")
 
 
 def generate_swiss_roll(n_samples: int = 128, random_state: int = 59) -> np.ndarray:
@@ -35,9 +59,285 @@ def _tanh(x: np.ndarray) -> np.ndarray:
     return np.tanh(x)
 
 
-def _tanh_grad(x: np.ndarray) -> np.ndarray:
-    t = np.tanh(x)
-    return 1.0 - t**2
+def _apply_update(param: np.ndarray, grad: np.ndarray, lr: float) -> None:
+    """SGD step that reuses the gradient buffer instead of allocating ``lr * grad``."""
+
+    grad *= lr
+    param -= grad
+
+
+class _AutoencoderObjective:
+    """Tanh autoencoder whose forward/backward passes write into fixed buffers."""
+
+    def __init__(
+        self, n_features: int, hidden_dim: int, rng: np.random.Generator, dtype: str
+    ) -> None:
+        self.W1 = rng.normal(0.0, 0.2, size=(n_features, hidden_dim)).astype(dtype)
+        self.b1 = np.zeros(hidden_dim, dtype=dtype)
+        self.W2 = rng.normal(0.0, 0.2, size=(hidden_dim, n_features)).astype(dtype)
+        self.b2 = np.zeros(n_features, dtype=dtype)
+        self.grads = {
+            name: np.empty_like(value) for name, value in self.params().items()
+        }
+
+    def params(self) -> Dict[str, np.ndarray]:
+        return {"W1": self.W1, "b1": self.b1, "W2": self.W2, "b2": self.b2}
+
+    def allocate(self, batch_size: int) -> None:
+        dtype = self.W1.dtype
+        hidden_dim, n_features = self.W2.shape
+        self.z_lin = np.empty((batch_size, hidden_dim), dtype=dtype)
+        self.z = np.empty_like(self.z_lin)
+        self.grad_hidden = np.empty_like(self.z_lin)
+        self.recon = np.empty((batch_size, n_features), dtype=dtype)
+        self.diff = np.empty_like(self.recon)
+
+    def step(self, X: np.ndarray, lr: float, rng: np.random.Generator) -> float:
+        n = X.shape[0]
+        z_lin, z, grad_hidden = self.z_lin[:n], self.z[:n], self.grad_hidden[:n]
+        recon, diff = self.recon[:n], self.diff[:n]
+        g = self.grads
+
+        np.matmul(X, self.W1, out=z_lin)
+        z_lin += self.b1
+        np.tanh(z_lin, out=z)
+        np.matmul(z, self.W2, out=recon)
+        recon += self.b2
+        np.subtract(recon, X, out=diff)
+        loss = float(np.vdot(diff, diff)) / diff.size
+
+        diff *= 2.0 / n
+        np.matmul(z.T, diff, out=g["W2"])
+        np.sum(diff, axis=0, out=g["b2"])
+        np.matmul(diff, self.W2.T, out=grad_hidden)
+        np.multiply(z, z, out=z_lin)
+        np.subtract(1.0, z_lin, out=z_lin)
+        grad_hidden *= z_lin
+        np.matmul(X.T, grad_hidden, out=g["W1"])
+        np.sum(grad_hidden, axis=0, out=g["b1"])
+
+        for name, param in self.params().items():
+            _apply_update(param, g[name], lr)
+        return loss
+
+    def reconstruct(self, X: np.ndarray) -> np.ndarray:
+        return _tanh(X @ self.W1 + self.b1) @ self.W2 + self.b2
+
+
+class _VariationalObjective:
+    """Linear-Gaussian encoder VAE trained with the reparameterisation trick."""
+
+    def __init__(
+        self,
+        n_features: int,
+        latent_dim: int,
+        kl_weight: float,
+        rng: np.random.Generator,
+        dtype: str,
+    ) -> None:
+        shape_enc, shape_dec = (n_features, latent_dim), (latent_dim, n_features)
+        self.W_mu = rng.normal(0.0, 0.2, size=shape_enc).astype(dtype)
+        self.b_mu = np.zeros(latent_dim, dtype=dtype)
+        self.W_logvar = rng.normal(0.0, 0.2, size=shape_enc).astype(dtype)
+        self.b_logvar = np.zeros(latent_dim, dtype=dtype)
+        self.W_dec = rng.normal(0.0, 0.2, size=shape_dec).astype(dtype)
+        self.b_dec = np.zeros(n_features, dtype=dtype)
+        self.kl_weight = kl_weight
+        self.grads = {
+            name: np.empty_like(value) for name, value in self.params().items()
+        }
+
+    def params(self) -> Dict[str, np.ndarray]:
+        return {
+            "W_dec": self.W_dec,
+            "b_dec": self.b_dec,
+            "W_mu": self.W_mu,
+            "b_mu": self.b_mu,
+            "W_logvar": self.W_logvar,
+            "b_logvar": self.b_logvar,
+        }
+
+    def allocate(self, batch_size: int) -> None:
+        dtype = self.W_mu.dtype
+        latent_dim, n_features = self.W_dec.shape
+        latent = (batch_size, latent_dim)
+        self.mu, self.logvar, self.std, self.var = (
+            np.empty(latent, dtype=dtype) for _ in range(4)
+        )
+        self.eps, self.z, self.grad_hidden, self.grad_mu, self.grad_logvar = (
+            np.empty(latent, dtype=dtype) for _ in range(5)
+        )
+        self.recon = np.empty((batch_size, n_features), dtype=dtype)
+        self.diff = np.empty_like(self.recon)
+
+    def step(self, X: np.ndarray, lr: float, rng: np.random.Generator) -> float:
+        n = X.shape[0]
+        mu, logvar, std, var = self.mu[:n], self.logvar[:n], self.std[:n], self.var[:n]
+        eps, z, grad_hidden = self.eps[:n], self.z[:n], self.grad_hidden[:n]
+        grad_mu, grad_logvar = self.grad_mu[:n], self.grad_logvar[:n]
+        recon, diff = self.recon[:n], self.diff[:n]
+        g = self.grads
+        kl = self.kl_weight
+
+        np.matmul(X, self.W_mu, out=mu)
+        mu += self.b_mu
+        np.matmul(X, self.W_logvar, out=logvar)
+        logvar += self.b_logvar
+        np.multiply(logvar, 0.5, out=std)
+        np.exp(std, out=std)
+        np.multiply(std, std, out=var)
+        rng.standard_normal(dtype=eps.dtype, out=eps)
+        np.multiply(eps, std, out=z)
+        z += mu
+        np.tanh(z, out=z)
+        np.matmul(z, self.W_dec, out=recon)
+        recon += self.b_dec
+        np.subtract(recon, X, out=diff)
+        recon_loss = float(np.vdot(diff, diff)) / diff.size
+        kl_sum = (
+            mu.size + float(logvar.sum()) - float(np.vdot(mu, mu)) - float(var.sum())
+        )
+        loss = recon_loss + kl * (-0.5 * kl_sum / mu.size)
+
+        diff *= 2.0 / n
+        np.matmul(z.T, diff, out=g["W_dec"])
+        np.sum(diff, axis=0, out=g["b_dec"])
+        np.matmul(diff, self.W_dec.T, out=grad_hidden)
+        np.multiply(z, z, out=z)
+        np.subtract(1.0, z, out=z)
+        grad_hidden *= z
+
+        np.multiply(mu, kl / n, out=grad_mu)
+        grad_mu += grad_hidden
+        np.multiply(grad_hidden, eps, out=grad_logvar)
+        grad_logvar *= std
+        grad_logvar *= 0.5
+        var -= 1.0
+        var *= kl * 0.5 / n
+        grad_logvar += var
+
+        np.matmul(X.T, grad_mu, out=g["W_mu"])
+        np.sum(grad_mu, axis=0, out=g["b_mu"])
+        np.matmul(X.T, grad_logvar, out=g["W_logvar"])
+        np.sum(grad_logvar, axis=0, out=g["b_logvar"])
+
+        for name, param in self.params().items():
+            _apply_update(param, g[name], lr)
+        return loss
+
+    def reconstruct(self, X: np.ndarray) -> np.ndarray:
+        return _tanh(X @ self.W_mu + self.b_mu) @ self.W_dec + self.b_dec
+
+
+def _diffusion_schedule(timesteps: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the linear beta schedule with its alphas and cumulative products."""
+
+    betas = np.linspace(1e-3, 5e-2, timesteps)
+    alphas = 1.0 - betas
+    return betas, alphas, np.cumprod(alphas)
+
+
+class _DiffusionObjective:
+    """Linear noise-prediction network trained on a single random timestep per step."""
+
+    def __init__(
+        self, n_features: int, timesteps: int, rng: np.random.Generator, dtype: str
+    ) -> None:
+        self.W = rng.normal(0.0, 0.2, size=(n_features, n_features)).astype(dtype)
+        self.b = np.zeros(n_features, dtype=dtype)
+        self.timesteps = timesteps
+        self.betas, _, alpha_bar = _diffusion_schedule(timesteps)
+        self.signal_scale = np.sqrt(alpha_bar)
+        self.noise_scale = np.sqrt(1 - alpha_bar)
+        self.grads = {
+            name: np.empty_like(value) for name, value in self.params().items()
+        }
+
+    def params(self) -> Dict[str, np.ndarray]:
+        return {"W": self.W, "b": self.b}
+
+    def allocate(self, batch_size: int) -> None:
+        shape = (batch_size, self.W.shape[0])
+        self.noise, self.noisy, self.diff = (
+            np.empty(shape, dtype=self.W.dtype) for _ in range(3)
+        )
+
+    def step(self, X: np.ndarray, lr: float, rng: np.random.Generator) -> float:
+        n = X.shape[0]
+        noise, noisy, diff = self.noise[:n], self.noisy[:n], self.diff[:n]
+        g = self.grads
+
+        t = rng.integers(0, self.timesteps)
+        rng.standard_normal(dtype=noise.dtype, out=noise)
+        np.multiply(X, self.signal_scale[t], out=noisy)
+        np.multiply(noise, self.noise_scale[t], out=diff)
+        noisy += diff
+        np.matmul(noisy, self.W, out=diff)
+        diff += self.b
+        diff -= noise
+        loss = float(np.vdot(diff, diff)) / diff.size
+
+        diff *= 2.0 / n
+        np.matmul(noisy.T, diff, out=g["W"])
+        np.sum(diff, axis=0, out=g["b"])
+        for name, param in self.params().items():
+            _apply_update(param, g[name], lr)
+        return loss
+
+    def reconstruct(self, X: np.ndarray) -> np.ndarray:
+        return X @ self.W + self.b
+
+
+def _run_training_loop(
+    objective: _AutoencoderObjective | _VariationalObjective | _DiffusionObjective,
+    X: np.ndarray,
+    config: TrainingConfig,
+    rng: np.random.Generator,
+) -> TrainingLog:
+    """Drive ``objective`` through shuffled mini-batches with optional early stopping.
+
+    Work buffers are sized for one batch and reused every step; the final
+    (possibly shorter) batch writes into leading slices of the same buffers.
+    """
+
+    n_samples = X.shape[0]
+    batch_size = min(config.batch_size or n_samples, n_samples)
+    objective.allocate(batch_size)
+    full_batch = batch_size == n_samples
+    batch = X if full_batch else np.empty((batch_size, X.shape[1]), dtype=X.dtype)
+
+    losses: List[float] = []
+    best_loss = np.inf
+    stale_epochs = 0
+    for _ in range(config.epochs):
+        if full_batch:
+            epoch_loss = objective.step(X, config.lr, rng)
+        else:
+            order = rng.permutation(n_samples)
+            total = 0.0
+            for start in range(0, n_samples, batch_size):
+                idx = order[start : start + batch_size]
+                view = batch[: idx.size]
+                np.take(X, idx, axis=0, out=view)
+                total += objective.step(view, config.lr, rng) * idx.size
+            epoch_loss = total / n_samples
+        losses.append(epoch_loss)
+
+        if config.patience is not None:
+            if epoch_loss < best_loss - config.min_delta:
+                best_loss = epoch_loss
+                stale_epochs = 0
+            else:
+                stale_epochs += 1
+                if stale_epochs >= config.patience:
+                    break
+
+    parameters = {name: value.copy() for name, value in objective.params().items()}
+    return TrainingLog(
+        losses=losses,
+        reconstructions=objective.reconstruct(X),
+        parameters=parameters,
+    )
 
 
 def train_autoencoder_synthetic(
@@ -46,40 +346,26 @@ def train_autoencoder_synthetic(
     epochs: int = 200,
     lr: float = 0.05,
     random_state: int = 59,
+    batch_size: int | None = None,
+    dtype: str = "float64",
+    patience: int | None = None,
+    min_delta: float = 0.0,
 ) -> TrainingLog:
     """Train a deterministic autoencoder on synthetic data."""
 
+    config = TrainingConfig(
+        epochs=epochs,
+        lr=lr,
+        batch_size=batch_size,
+        dtype=dtype,
+        patience=patience,
+        min_delta=min_delta,
+    )
     X = data if data is not None else generate_swiss_roll(random_state=random_state)
+    X = np.ascontiguousarray(X, dtype=config.dtype)
     rng = np.random.default_rng(random_state)
-    n_features = X.shape[1]
-    W1 = rng.normal(0.0, 0.2, size=(n_features, hidden_dim))
-    b1 = np.zeros(hidden_dim)
-    W2 = rng.normal(0.0, 0.2, size=(hidden_dim, n_features))
-    b2 = np.zeros(n_features)
-
-    losses: List[float] = []
-    for _ in range(epochs):
-        z_lin = X @ W1 + b1
-        z = _tanh(z_lin)
-        recon = z @ W2 + b2
-        diff = recon - X
-        loss = float(np.mean(diff**2))
-        losses.append(loss)
-
-        grad_recon = (2.0 / X.shape[0]) * diff
-        grad_W2 = z.T @ grad_recon
-        grad_b2 = grad_recon.sum(axis=0)
-        grad_hidden = (grad_recon @ W2.T) * _tanh_grad(z_lin)
-        grad_W1 = X.T @ grad_hidden
-        grad_b1 = grad_hidden.sum(axis=0)
-
-        W2 -= lr * grad_W2
-        b2 -= lr * grad_b2
-        W1 -= lr * grad_W1
-        b1 -= lr * grad_b1
-
-    final_recon = _tanh(X @ W1 + b1) @ W2 + b2
-    return TrainingLog(losses=losses, reconstructions=final_recon)
+    objective = _AutoencoderObjective(X.shape[1], hidden_dim, rng, config.dtype)
+    return _run_training_loop(objective, X, config, rng)
 
 
 def train_variational_autoencoder_synthetic(
@@ -89,59 +375,28 @@ def train_variational_autoencoder_synthetic(
     lr: float = 0.05,
     kl_weight: float = 0.01,
     random_state: int = 59,
+    batch_size: int | None = None,
+    dtype: str = "float64",
+    patience: int | None = None,
+    min_delta: float = 0.0,
 ) -> TrainingLog:
     """Run a minimal VAE with reparameterisation on synthetic data."""
 
+    config = TrainingConfig(
+        epochs=epochs,
+        lr=lr,
+        batch_size=batch_size,
+        dtype=dtype,
+        patience=patience,
+        min_delta=min_delta,
+    )
     X = data if data is not None else generate_swiss_roll(random_state=random_state + 1)
+    X = np.ascontiguousarray(X, dtype=config.dtype)
     rng = np.random.default_rng(random_state)
-    n_features = X.shape[1]
-    W_mu = rng.normal(0.0, 0.2, size=(n_features, latent_dim))
-    b_mu = np.zeros(latent_dim)
-    W_logvar = rng.normal(0.0, 0.2, size=(n_features, latent_dim))
-    b_logvar = np.zeros(latent_dim)
-    W_dec = rng.normal(0.0, 0.2, size=(latent_dim, n_features))
-    b_dec = np.zeros(n_features)
-
-    losses: List[float] = []
-    for _ in range(epochs):
-        mu = X @ W_mu + b_mu
-        logvar = X @ W_logvar + b_logvar
-        std = np.exp(0.5 * logvar)
-        eps = rng.normal(0.0, 1.0, size=mu.shape)
-        z = mu + eps * std
-        recon = _tanh(z) @ W_dec + b_dec
-        diff = recon - X
-        recon_loss = np.mean(diff**2)
-        kl_div = -0.5 * np.mean(1 + logvar - mu**2 - np.exp(logvar))
-        loss = float(recon_loss + kl_weight * kl_div)
-        losses.append(loss)
-
-        grad_recon = (2.0 / X.shape[0]) * diff
-        grad_W_dec = (_tanh(z)).T @ grad_recon
-        grad_b_dec = grad_recon.sum(axis=0)
-        grad_hidden = (grad_recon @ W_dec.T) * (1 - np.tanh(z) ** 2)
-
-        grad_mu = grad_hidden + kl_weight * (mu / X.shape[0])
-        grad_logvar = (
-            grad_hidden * eps * std * 0.5
-            + kl_weight * 0.5 * (np.exp(logvar) - 1) / X.shape[0]
-        )
-
-        grad_W_mu = X.T @ grad_mu
-        grad_b_mu = grad_mu.sum(axis=0)
-        grad_W_logvar = X.T @ grad_logvar
-        grad_b_logvar = grad_logvar.sum(axis=0)
-
-        W_dec -= lr * grad_W_dec
-        b_dec -= lr * grad_b_dec
-        W_mu -= lr * grad_W_mu
-        b_mu -= lr * grad_b_mu
-        W_logvar -= lr * grad_W_logvar
-        b_logvar -= lr * grad_b_logvar
-
-    final_z = X @ W_mu + b_mu
-    final_recon = _tanh(final_z) @ W_dec + b_dec
-    return TrainingLog(losses=losses, reconstructions=final_recon)
+    objective = _VariationalObjective(
+        X.shape[1], latent_dim, kl_weight, rng, config.dtype
+    )
+    return _run_training_loop(objective, X, config, rng)
 
 
 def train_diffusion_denoiser(
@@ -150,37 +405,70 @@ def train_diffusion_denoiser(
     epochs: int = 200,
     lr: float = 0.05,
     random_state: int = 59,
+    batch_size: int | None = None,
+    dtype: str = "float64",
+    patience: int | None = None,
+    min_delta: float = 0.0,
 ) -> TrainingLog:
-    """Train a denoiser to recover clean data from a simple diffusion step."""
-
+    """Train a denoiser to recover clean data from a simple diffusion step.
+
+    The schedule length is stored as ``log.parameters["timesteps"]`` so that
+    ``sample_diffusion`` reverses the same noise schedule.
+    """
+
+    config = TrainingConfig(
+        epochs=epochs,
+        lr=lr,
+        batch_size=batch_size,
+        dtype=dtype,
+        patience=patience,
+        min_delta=min_delta,
+    )
     X = data if data is not None else generate_swiss_roll(random_state=random_state + 2)
+    X = np.ascontiguousarray(X, dtype=config.dtype)
     rng = np.random.default_rng(random_state)
-    n_features = X.shape[1]
-    W = rng.normal(0.0, 0.2, size=(n_features, n_features))
-    b = np.zeros(n_features)
-    losses: List[float] = []
+    objective = _DiffusionObjective(X.shape[1], timesteps, rng, config.dtype)
+    log = _run_training_loop(objective, X, config, rng)
+    log.parameters["timesteps"] = np.array(timesteps)
+    return log
 
-    betas = np.linspace(1e-3, 5e-2, timesteps)
-    alphas = 1.0 - betas
-    alpha_bar = np.cumprod(alphas)
-
-    for _ in range(epochs):
-        t = rng.integers(0, timesteps)
-        noise = rng.normal(0.0, 1.0, size=X.shape)
-        noisy = np.sqrt(alpha_bar[t]) * X + np.sqrt(1 - alpha_bar[t]) * noise
-        pred_noise = noisy @ W + b
-        diff = pred_noise - noise
-        loss = float(np.mean(diff**2))
-        losses.append(loss)
-
-        grad = (2.0 / X.shape[0]) * diff
-        grad_W = noisy.T @ grad
-        grad_b = grad.sum(axis=0)
-        W -= lr * grad_W
-        b -= lr * grad_b
-
-    final_noise = X @ W + b
-    return TrainingLog(losses=losses, reconstructions=final_noise)
+
+def sample_diffusion(
+    log: TrainingLog,
+    n_samples: int = 1000,
+    timesteps: int | None = None,
+    random_state: int = 59,
+) -> np.ndarray:
+    """Generate ``n_samples`` points by running the reverse process on one batch.
+
+    Every reverse step updates the whole ``(n_samples, n_features)`` array at
+    once, so sampling cost is ``timesteps`` matrix products regardless of how
+    many samples are requested. ``timesteps`` defaults to the schedule length
+    the denoiser was trained with.
+    """
+
+    if "W" not in log.parameters:
+        raise ValueError("TrainingLog does not contain diffusion denoiser parameters.")
+    W, b = log.parameters["W"], log.parameters["b"]
+    if timesteps is None:
+        # Logs from before the schedule length was recorded used the default.
+        timesteps = int(log.parameters.get("timesteps", 10))
+    betas, alphas, alpha_bar = _diffusion_schedule(timesteps)
+    rng = np.random.default_rng(random_state)
+    x = rng.standard_normal(size=(n_samples, W.shape[0])).astype(W.dtype)
+    pred_noise = np.empty_like(x)
+    fresh_noise = np.empty_like(x)
+    for t in range(timesteps - 1, -1, -1):
+        np.matmul(x, W, out=pred_noise)
+        pred_noise += b
+        pred_noise *= betas[t] / np.sqrt(1.0 - alpha_bar[t])
+        x -= pred_noise
+        x /= np.sqrt(alphas[t])
+        if t > 0:
+            rng.standard_normal(dtype=x.dtype, out=fresh_noise)
+            fresh_noise *= np.sqrt(betas[t])
+            x += fresh_noise
+    return x
 
 
 def gan_training_summary(
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List
 
 import numpy as np
+import pandas as pd
 
 
 @dataclass
@@ -127,29 +131,258 @@ def run_contextual_bandit(
     )
 
 
+@dataclass
+class LoggedBanditData:
+    """Logged bandit decisions stored as aligned numpy arrays."""
+
+    actions: np.ndarray
+    rewards: np.ndarray
+    propensities: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.actions.shape[0])
+
+
+@dataclass
+class OffPolicyStatistics:
+    """Mergeable sufficient statistics for IPS, SNIPS and doubly-robust estimates."""
+
+    count: int = 0
+    weight_sum: float = 0.0
+    weight_sq_sum: float = 0.0
+    weighted_reward_sum: float = 0.0
+    doubly_robust_sum: float = 0.0
+
+    def merge(self, other: "OffPolicyStatistics") -> "OffPolicyStatistics":
+        """Return the combined statistics of two partial aggregates."""
+
+        return OffPolicyStatistics(
+            count=self.count + other.count,
+            weight_sum=self.weight_sum + other.weight_sum,
+            weight_sq_sum=self.weight_sq_sum + other.weight_sq_sum,
+            weighted_reward_sum=self.weighted_reward_sum + other.weighted_reward_sum,
+            doubly_robust_sum=self.doubly_robust_sum + other.doubly_robust_sum,
+        )
+
+    def estimates(self) -> Dict[str, float]:
+        """Convert the accumulated sums into policy value estimates."""
+
+        if self.count == 0:
+            raise ValueError("No logged decisions have been accumulated.")
+        return {
+            "ips": self.weighted_reward_sum / self.count,
+            "snips": self.weighted_reward_sum / (self.weight_sum + 1e-9),
+            "doubly_robust": self.doubly_robust_sum / self.count,
+            "effective_sample_size": (self.weight_sum**2) / (self.weight_sq_sum + 1e-9),
+        }
+
+
+def simulate_logged_bandit(
+    num_samples: int = 500,
+    behaviour_policy: np.ndarray | None = None,
+    reward_means: np.ndarray | None = None,
+    random_state: int = 61,
+) -> LoggedBanditData:
+    """Draw logged decisions from a behaviour policy in a single vectorised call."""
+
+    rng = np.random.default_rng(random_state)
+    if reward_means is None:
+        reward_means = np.array([0.2, 0.5, 1.0])
+    if behaviour_policy is None:
+        behaviour_policy = np.array([0.5, 0.4, 0.1])
+    actions = rng.choice(len(behaviour_policy), size=num_samples, p=behaviour_policy)
+    rewards = rng.normal(reward_means[actions], 0.1)
+    return LoggedBanditData(
+        actions=actions,
+        rewards=rewards,
+        propensities=np.asarray(behaviour_policy)[actions],
+    )
+
+
+def _policy_terms(
+    data: LoggedBanditData,
+    evaluation_policy: np.ndarray,
+    reward_model: np.ndarray | None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return per-decision importance weights, IPS terms and doubly-robust terms.
+
+    ``evaluation_policy`` and ``reward_model`` may be 1-D (one distribution or
+    reward estimate per action) or 2-D with one row per logged decision.
+    """
+
+    actions = np.asarray(data.actions, dtype=np.int64)
+    rewards = np.asarray(data.rewards, dtype=float)
+    policy = np.asarray(evaluation_policy, dtype=float)
+    if policy.ndim == 1:
+        target_probs = policy[actions]
+    else:
+        target_probs = np.take_along_axis(policy, actions[:, None], axis=1)[:, 0]
+    weights = target_probs / np.asarray(data.propensities, dtype=float)
+    ips_terms = weights * rewards
+    if reward_model is None:
+        return weights, ips_terms, ips_terms
+    q_hat = np.asarray(reward_model, dtype=float)
+    if q_hat.ndim == 1:
+        q_logged = q_hat[actions]
+    else:
+        q_logged = np.take_along_axis(q_hat, actions[:, None], axis=1)[:, 0]
+    direct = np.broadcast_to((policy * q_hat).sum(axis=-1), actions.shape)
+    dr_terms = direct + weights * (rewards - q_logged)
+    return weights, ips_terms, dr_terms
+
+
+def off_policy_statistics(
+    data: LoggedBanditData,
+    evaluation_policy: np.ndarray,
+    reward_model: np.ndarray | None = None,
+) -> OffPolicyStatistics:
+    """Summarise a batch of logged decisions into mergeable OPE statistics."""
+
+    weights, ips_terms, dr_terms = _policy_terms(data, evaluation_policy, reward_model)
+    return OffPolicyStatistics(
+        count=len(data),
+        weight_sum=float(weights.sum()),
+        weight_sq_sum=float(np.dot(weights, weights)),
+        weighted_reward_sum=float(ips_terms.sum()),
+        doubly_robust_sum=float(dr_terms.sum()),
+    )
+
+
+def iter_logged_bandit_chunks(
+    path: str | Path,
+    chunk_size: int = 1_000_000,
+    columns: tuple[str, str, str] = ("action", "reward", "propensity"),
+) -> Iterator[LoggedBanditData]:
+    """Stream logged decisions from a CSV file without loading it all in memory."""
+
+    action_col, reward_col, propensity_col = columns
+    for chunk in pd.read_csv(path, usecols=list(columns), chunksize=chunk_size):
+        yield LoggedBanditData(
+            actions=chunk[action_col].to_numpy(dtype=np.int64),
+            rewards=chunk[reward_col].to_numpy(dtype=float),
+            propensities=chunk[propensity_col].to_numpy(dtype=float),
+        )
+
+
+def evaluate_policy_stream(
+    chunks: Iterable[LoggedBanditData],
+    evaluation_policy: np.ndarray,
+    reward_model: np.ndarray | None = None,
+) -> Dict[str, float]:
+    """Compute IPS, SNIPS and doubly-robust estimates over streamed chunks."""
+
+    stats = OffPolicyStatistics()
+    for chunk in chunks:
+        stats = stats.merge(
+            off_policy_statistics(chunk, evaluation_policy, reward_model)
+        )
+    return stats.estimates()
+
+
+def _poisson_bootstrap_sums(
+    block: np.ndarray, n_replicates: int, seed: np.random.SeedSequence
+) -> np.ndarray:
+    """Return ``(n_replicates, 4)`` Poisson-reweighted column sums of one block.
+
+    ``block`` holds one row per decision with columns (1, weight, IPS term, DR
+    term). Each replicate reweights every decision by a Poisson(1) count, so
+    the replicate sums are a single matrix product and add up across blocks.
+    """
+
+    rng = np.random.default_rng(seed)
+    counts = rng.poisson(1.0, size=(n_replicates, block.shape[0]))
+    return counts @ block
+
+
+def _iter_term_blocks(
+    chunks: Iterable[LoggedBanditData],
+    evaluation_policy: np.ndarray,
+    reward_model: np.ndarray | None,
+    block_size: int,
+) -> Iterator[np.ndarray]:
+    for chunk in chunks:
+        weights, ips_terms, dr_terms = _policy_terms(
+            chunk, evaluation_policy, reward_model
+        )
+        terms = np.column_stack([np.ones_like(weights), weights, ips_terms, dr_terms])
+        for start in range(0, terms.shape[0], block_size):
+            yield terms[start : start + block_size]
+
+
+def bootstrap_off_policy_intervals(
+    data: LoggedBanditData | Iterable[LoggedBanditData],
+    evaluation_policy: np.ndarray,
+    reward_model: np.ndarray | None = None,
+    n_bootstrap: int = 1000,
+    confidence: float = 0.95,
+    n_jobs: int = 1,
+    block_size: int = 2_048,
+    random_state: int = 61,
+) -> Dict[str, tuple[float, float]]:
+    """Poisson-bootstrap confidence intervals for IPS, SNIPS and doubly-robust.
+
+    ``data`` may be one in-memory log or an iterable of chunks such as
+    :func:`iter_logged_bandit_chunks`; only per-replicate sums are kept, so the
+    log never has to fit in memory. The log is cut into blocks of
+    ``block_size`` decisions, each with its own child seed, and ``n_jobs``
+    worker processes each receive only the blocks they process. Results depend
+    on ``random_state``, ``block_size`` and the chunk boundaries, not on
+    ``n_jobs``.
+    """
+
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must lie strictly between 0 and 1.")
+    chunks = [data] if isinstance(data, LoggedBanditData) else data
+    blocks = _iter_term_blocks(chunks, evaluation_policy, reward_model, block_size)
+    root = np.random.SeedSequence(random_state)
+    sums = np.zeros((n_bootstrap, 4))
+    if n_jobs <= 1:
+        for block in blocks:
+            sums += _poisson_bootstrap_sums(block, n_bootstrap, root.spawn(1)[0])
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            # A bounded FIFO keeps memory flat and adds the blocks in order, so
+            # the floating-point sums match the serial path.
+            in_flight: Deque[Future] = deque()
+            for block in blocks:
+                in_flight.append(
+                    pool.submit(
+                        _poisson_bootstrap_sums, block, n_bootstrap, root.spawn(1)[0]
+                    )
+                )
+                if len(in_flight) >= 2 * n_jobs:
+                    sums += in_flight.popleft().result()
+            while in_flight:
+                sums += in_flight.popleft().result()
+    if not sums[:, 0].any():
+        raise ValueError("No logged decisions have been accumulated.")
+    counts_total = np.maximum(sums[:, 0], 1.0)
+    replicates = np.column_stack(
+        [
+            sums[:, 2] / counts_total,
+            sums[:, 2] / (sums[:, 1] + 1e-9),
+            sums[:, 3] / counts_total,
+        ]
+    )
+    alpha = (1.0 - confidence) / 2.0
+    lower, upper = np.quantile(replicates, [alpha, 1.0 - alpha], axis=0)
+    names = ("ips", "snips", "doubly_robust")
+    return {name: (float(lo), float(hi)) for name, lo, hi in zip(names, lower, upper)}
+
+
 def offline_evaluation(
     num_samples: int = 500,
     random_state: int = 61,
 ) -> Dict[str, float]:
     """Estimate evaluation policy performance with weighted importance sampling."""
 
-    rng = np.random.default_rng(random_state)
-    reward_means = np.array([0.2, 0.5, 1.0])
-    behaviour_policy = np.array([0.5, 0.4, 0.1])
+    data = simulate_logged_bandit(num_samples=num_samples, random_state=random_state)
     evaluation_policy = np.array([0.1, 0.2, 0.7])
-    weights: List[float] = []
-    weighted_rewards: List[float] = []
-    for _ in range(num_samples):
-        action = rng.choice(3, p=behaviour_policy)
-        reward = float(rng.normal(reward_means[action], 0.1))
-        importance = evaluation_policy[action] / behaviour_policy[action]
-        weights.append(importance)
-        weighted_rewards.append(importance * reward)
-    weights_arr = np.array(weights)
-    weighted_rewards_arr = np.array(weighted_rewards)
-    estimate = float(weighted_rewards_arr.sum() / (weights_arr.sum() + 1e-9))
-    ess = float((weights_arr.sum() ** 2) / (np.sum(weights_arr**2) + 1e-9))
-    return {"estimate": estimate, "effective_sample_size": ess}
+    estimates = off_policy_statistics(data, evaluation_policy).estimates()
+    return {
+        "estimate": estimates["snips"],
+        "effective_sample_size": estimates["effective_sample_size"],
+    }
 
 
 def run_rl_suite(random_state: int = 61) -> Dict[str, object]:
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Mapping, Sequence, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -21,6 +23,11 @@ class LinearModel:
         vector = np.asarray(features, dtype=float)
         return float(self.intercept + np.dot(self.coefficients, vector))
 
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        """Score every row (or trailing feature vector) with one matrix product."""
+
+        return self.intercept + np.asarray(features, dtype=float) @ self.coefficients
+
 
 @dataclass
 class ShapExplanation:
@@ -46,6 +53,25 @@ class LimeExplanation:
         return float(self.intercept + np.dot(self.weights, vector))
 
 
+@dataclass
+class BatchLimeExplanation:
+    """Stacked LIME surrogates, one row per explained instance."""
+
+    intercepts: np.ndarray
+    weights: np.ndarray
+    predictions: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.predictions.shape[0])
+
+    def explanation(self, index: int) -> LimeExplanation:
+        return LimeExplanation(
+            intercept=float(self.intercepts[index]),
+            weights=self.weights[index],
+            prediction=float(self.predictions[index]),
+        )
+
+
 @dataclass
 class CounterfactualResult:
     """Result of a counterfactual search."""
@@ -94,18 +120,22 @@ def load_credit_dataset() -> pd.DataFrame:
     return pd.DataFrame.from_records(records)
 
 
+def _encode_features(dataset: pd.DataFrame) -> np.ndarray:
+    return np.column_stack(
+        [
+            dataset["credit_score"].to_numpy(dtype=float),
+            dataset["income"].to_numpy(dtype=float),
+            (dataset["gender"] == "F").to_numpy(dtype=float),
+        ]
+    )
+
+
 def train_default_risk_model() -> LinearModel:
     """Fit a closed-form linear regression on the credit dataset."""
 
     df = load_credit_dataset()
     feature_names = ["credit_score", "income", "is_female"]
-    X = np.column_stack(
-        [
-            df["credit_score"].to_numpy(dtype=float),
-            df["income"].to_numpy(dtype=float),
-            (df["gender"] == "F").to_numpy(dtype=float),
-        ]
-    )
+    X = _encode_features(df)
     y = df["default_risk"].to_numpy(dtype=float)
     X_design = np.column_stack([np.ones(len(df)), X])
     coefficients, *_ = np.linalg.lstsq(X_design, y, rcond=None)
@@ -116,18 +146,20 @@ def train_default_risk_model() -> LinearModel:
     )
 
 
+@lru_cache(maxsize=1)
+def _default_baseline_features() -> np.ndarray:
+    baseline = _encode_features(load_credit_dataset()).mean(axis=0)
+    baseline.setflags(write=False)
+    return baseline
+
+
 def _baseline_from_dataset(
     model: LinearModel, dataset: pd.DataFrame | None = None
 ) -> Tuple[float, np.ndarray]:
     if dataset is None:
-        dataset = load_credit_dataset()
-    baseline_features = np.column_stack(
-        [
-            dataset["credit_score"].to_numpy(dtype=float),
-            dataset["income"].to_numpy(dtype=float),
-            (dataset["gender"] == "F").to_numpy(dtype=float),
-        ]
-    ).mean(axis=0)
+        baseline_features = _default_baseline_features()
+    else:
+        baseline_features = _encode_features(dataset).mean(axis=0)
     base_value = model.predict(baseline_features)
     return base_value, baseline_features
 
@@ -145,9 +177,55 @@ def compute_shap_values(
     return ShapExplanation(base_value=base_value, contributions=contributions)
 
 
+_LIME_NOISE_SCALE = np.array([20.0, 5_000.0, 0.2])
+
+
 def _kernel_weights(distances: np.ndarray, kernel_width: float) -> np.ndarray:
     weights = np.exp(-(distances**2) / (kernel_width**2))
-    return weights / (weights.sum() + 1e-12)
+    return weights / (weights.sum(axis=-1, keepdims=True) + 1e-12)
+
+
+def _weighted_least_squares(
+    samples: np.ndarray, targets: np.ndarray, weights: np.ndarray
+) -> np.ndarray:
+    """Solve weighted least squares for stacked problems without building ``diag(w)``.
+
+    ``samples`` has shape ``(..., num_samples, n_features)``; an intercept column
+    is added internally and the returned coefficients include it first.
+    """
+
+    ones = np.ones(samples.shape[:-1] + (1,))
+    X_design = np.concatenate([ones, samples], axis=-1)
+    weighted = X_design * weights[..., np.newaxis]
+    gram = np.swapaxes(weighted, -1, -2) @ X_design
+    moment = np.einsum("...si,...s->...i", weighted, targets)
+    return np.einsum("...ij,...j->...i", np.linalg.pinv(gram), moment)
+
+
+def _lime_surrogates(
+    model: LinearModel,
+    instances: np.ndarray,
+    num_samples: int,
+    kernel_width: float,
+    rng: np.random.Generator,
+) -> BatchLimeExplanation:
+    """Fit LIME surrogates for a ``(n_instances, n_features)`` block at once."""
+
+    noise = rng.normal(
+        scale=_LIME_NOISE_SCALE,
+        size=(instances.shape[0], num_samples, instances.shape[1]),
+    )
+    samples = instances[:, np.newaxis, :] + noise
+    predictions = model.predict_batch(samples)
+    distances = np.linalg.norm(noise, axis=-1)
+    weights = _kernel_weights(distances, kernel_width)
+    beta = _weighted_least_squares(samples, predictions, weights)
+    coefs = beta[:, 1:]
+    instance_predictions = model.predict_batch(instances)
+    intercepts = instance_predictions - np.einsum("ij,ij->i", coefs, instances)
+    return BatchLimeExplanation(
+        intercepts=intercepts, weights=coefs, predictions=instance_predictions
+    )
 
 
 def lime_explanation(
@@ -161,20 +239,89 @@ def lime_explanation(
 
     rng = np.random.default_rng(random_state)
     instance_arr = np.asarray(instance, dtype=float)
-    noise = rng.normal(
-        scale=[20.0, 5_000.0, 0.2], size=(num_samples, instance_arr.size)
+    batch = _lime_surrogates(
+        model, instance_arr[np.newaxis, :], num_samples, kernel_width, rng
     )
-    samples = instance_arr + noise
-    predictions = np.apply_along_axis(model.predict, 1, samples)
-    distances = np.linalg.norm(samples - instance_arr, axis=1)
-    weights = _kernel_weights(distances, kernel_width)
-    X_design = np.column_stack([np.ones(num_samples), samples])
-    W = np.diag(weights)
-    beta = np.linalg.pinv(X_design.T @ W @ X_design) @ (X_design.T @ W @ predictions)
-    coefs = np.asarray(beta[1:], dtype=float)
-    prediction = model.predict(instance_arr)
-    intercept = float(prediction - np.dot(coefs, instance_arr))
-    return LimeExplanation(intercept=intercept, weights=coefs, prediction=prediction)
+    return batch.explanation(0)
+
+
+def _lime_chunk_worker(
+    model: LinearModel,
+    instances: np.ndarray,
+    num_samples: int,
+    kernel_width: float,
+    seed: np.random.SeedSequence,
+) -> BatchLimeExplanation:
+    return _lime_surrogates(
+        model, instances, num_samples, kernel_width, np.random.default_rng(seed)
+    )
+
+
+@dataclass
+class BatchExplainer:
+    """Explain many decisions against a baseline computed once.
+
+    Build it with :meth:`from_dataset` so the reference dataset is encoded and
+    averaged a single time, then call :meth:`shap_values` or :meth:`lime` with
+    an ``(n_instances, n_features)`` matrix.
+    """
+
+    model: LinearModel
+    baseline_features: np.ndarray
+    base_value: float
+
+    @classmethod
+    def from_dataset(
+        cls, model: LinearModel, dataset: pd.DataFrame | None = None
+    ) -> "BatchExplainer":
+        base_value, baseline_features = _baseline_from_dataset(model, dataset)
+        return cls(
+            model=model, baseline_features=baseline_features, base_value=base_value
+        )
+
+    def shap_values(self, instances: np.ndarray) -> np.ndarray:
+        """Return a ``(n_instances, n_features)`` matrix of additive contributions."""
+
+        instances = np.asarray(instances, dtype=float)
+        return (instances - self.baseline_features) * self.model.coefficients
+
+    def lime(
+        self,
+        instances: np.ndarray,
+        num_samples: int = 200,
+        kernel_width: float = 0.75,
+        chunk_size: int = 256,
+        n_jobs: int = 1,
+        random_state: int = 62,
+    ) -> BatchLimeExplanation:
+        """Fit LIME surrogates for every row, ``chunk_size`` instances at a time.
+
+        Chunks are distributed over ``n_jobs`` worker processes; each chunk
+        draws perturbations from its own child seed, so results are identical
+        for any ``n_jobs``.
+        """
+
+        instances = np.atleast_2d(np.asarray(instances, dtype=float))
+        starts = range(0, instances.shape[0], chunk_size)
+        chunks = [instances[start : start + chunk_size] for start in starts]
+        seeds = np.random.SeedSequence(random_state).spawn(len(chunks))
+        args = (
+            [self.model] * len(chunks),
+            chunks,
+            [num_samples] * len(chunks),
+            [kernel_width] * len(chunks),
+            seeds,
+        )
+        if n_jobs == 1 or len(chunks) <= 1:
+            parts = list(map(_lime_chunk_worker, *args))
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                parts = list(pool.map(_lime_chunk_worker, *args))
+        return BatchLimeExplanation(
+            intercepts=np.concatenate([part.intercepts for part in parts]),
+            weights=np.vstack([part.weights for part in parts]),
+            predictions=np.concatenate([part.predictions for part in parts]),
+        )
 
 
 def generate_counterfactual(
@@ -204,42 +351,168 @@ def generate_counterfactual(
     )
 
 
-def fairness_metrics(dataset: pd.DataFrame) -> FairnessReport:
-    """Compute key bias metrics for the approval outcome."""
+def _as_columns(protected: str | Sequence[str]) -> List[str]:
+    return [protected] if isinstance(protected, str) else list(protected)
+
+
+def _group_index(frame: pd.DataFrame, columns: List[str]) -> pd.Index:
+    """Return an index aligning each row with its (possibly intersectional) group."""
+
+    if len(columns) == 1:
+        return pd.Index(frame[columns[0]])
+    return pd.MultiIndex.from_frame(frame[columns])
+
 
-    grouped = dataset.groupby("gender")
-    approval_rate = grouped["approved"].mean()
-    female_rate = float(approval_rate.get("F", np.nan))
-    male_rate = float(approval_rate.get("M", np.nan))
-    statistical_parity = female_rate - male_rate
-    disparate_impact = female_rate / male_rate if male_rate > 0 else np.nan
+def group_outcome_sums(
+    frame: pd.DataFrame,
+    protected: str | Sequence[str] = "gender",
+    outcome: str = "approved",
+    risk_column: str = "default_risk",
+    risk_threshold: float | None = None,
+    weight_column: str | None = None,
+) -> pd.DataFrame:
+    """Aggregate the additive statistics behind every group metric in one pass.
 
-    # Equal opportunity: P(approval=1 | default risk below threshold)
-    low_risk = dataset[dataset["default_risk"] < dataset["default_risk"].median()]
-    eq_grouped = low_risk.groupby("gender")["approved"].mean()
-    female_eq = float(eq_grouped.get("F", np.nan))
-    male_eq = float(eq_grouped.get("M", np.nan))
-    equal_opportunity = female_eq - male_eq
+    Rows with ``risk_column`` below ``risk_threshold`` (the column median by
+    default) count as qualified for equal opportunity. The returned sums can be
+    added across chunks before calling :func:`group_fairness_report`.
+    """
 
+    columns = _as_columns(protected)
+    if risk_threshold is None:
+        risk_threshold = float(frame[risk_column].median())
+    weight = (
+        frame[weight_column].to_numpy(dtype=float)
+        if weight_column is not None
+        else np.ones(len(frame))
+    )
+    positive = weight * frame[outcome].to_numpy(dtype=float)
+    qualified = (frame[risk_column].to_numpy(dtype=float) < risk_threshold).astype(
+        float
+    )
+    # Like ``groupby``, rows with a missing protected value belong to no group.
+    known = frame[columns].notna().all(axis=1).to_numpy()
+    weight, positive, qualified = weight[known], positive[known], qualified[known]
+    codes, groups = _group_index(frame[known], columns).factorize(sort=True)
+    n_groups = len(groups)
+    return pd.DataFrame(
+        {
+            "weight": np.bincount(codes, weights=weight, minlength=n_groups),
+            "positive": np.bincount(codes, weights=positive, minlength=n_groups),
+            "qualified": np.bincount(
+                codes, weights=weight * qualified, minlength=n_groups
+            ),
+            "qualified_positive": np.bincount(
+                codes, weights=positive * qualified, minlength=n_groups
+            ),
+        },
+        index=groups,
+    )
+
+
+def group_fairness_report(
+    sums: pd.DataFrame, reference_group: object | None = None
+) -> pd.DataFrame:
+    """Turn group sums into selection rates and gaps relative to a reference group.
+
+    ``reference_group`` defaults to the group with the highest selection rate;
+    pass a tuple for intersectional groups.
+    """
+
+    report = pd.DataFrame(index=sums.index)
+    report["count"] = sums["weight"]
+    report["selection_rate"] = sums["positive"] / sums["weight"]
+    report["true_positive_rate"] = sums["qualified_positive"] / sums["qualified"]
+    if reference_group is None:
+        reference_group = report["selection_rate"].idxmax()
+    if reference_group in report.index:
+        reference = report.loc[reference_group]
+        reference_rate = float(reference["selection_rate"])
+        reference_tpr = float(reference["true_positive_rate"])
+    else:
+        reference_rate = reference_tpr = np.nan
+    report["statistical_parity"] = report["selection_rate"] - reference_rate
+    report["disparate_impact"] = (
+        report["selection_rate"] / reference_rate if reference_rate > 0 else np.nan
+    )
+    report["equal_opportunity"] = report["true_positive_rate"] - reference_tpr
+    return report
+
+
+def stream_group_fairness(
+    chunks: Iterable[pd.DataFrame],
+    protected: str | Sequence[str] = "gender",
+    outcome: str = "approved",
+    risk_column: str = "default_risk",
+    risk_threshold: float = 0.0,
+    weight_column: str | None = None,
+    reference_group: object | None = None,
+) -> pd.DataFrame:
+    """Build a group fairness report from chunks, e.g. ``pd.read_csv(chunksize=...)``.
+
+    A fixed ``risk_threshold`` is required because a median cannot be merged
+    across chunks.
+    """
+
+    total: pd.DataFrame | None = None
+    for chunk in chunks:
+        sums = group_outcome_sums(
+            chunk, protected, outcome, risk_column, risk_threshold, weight_column
+        )
+        total = sums if total is None else total.add(sums, fill_value=0.0)
+    if total is None:
+        raise ValueError("No chunks were provided.")
+    return group_fairness_report(total, reference_group)
+
+
+def _gender_report(report: pd.DataFrame) -> FairnessReport:
+    female = report.loc["F"] if "F" in report.index else None
+    if female is None:
+        return FairnessReport(np.nan, np.nan, np.nan)
     return FairnessReport(
-        statistical_parity=statistical_parity,
-        disparate_impact=disparate_impact,
-        equal_opportunity=equal_opportunity,
+        statistical_parity=float(female["statistical_parity"]),
+        disparate_impact=float(female["disparate_impact"]),
+        equal_opportunity=float(female["equal_opportunity"]),
     )
 
 
-def apply_reweighing(dataset: pd.DataFrame) -> pd.DataFrame:
+def fairness_metrics(dataset: pd.DataFrame) -> FairnessReport:
+    """Compute key bias metrics for the approval outcome."""
+
+    # Equal opportunity: P(approval=1 | default risk below the median)
+    sums = group_outcome_sums(dataset, "gender")
+    return _gender_report(group_fairness_report(sums, reference_group="M"))
+
+
+def reweighing_weights(
+    frame: pd.DataFrame,
+    protected: str | Sequence[str] = "gender",
+    outcome: str = "approved",
+    group_rates: pd.Series | None = None,
+    target_rate: float | None = None,
+) -> np.ndarray:
+    """Return per-row weights ``target_rate / group_rate`` without row iteration.
+
+    Supplying ``group_rates`` and ``target_rate`` (for example from
+    :func:`stream_group_fairness`) lets each chunk be weighted independently.
+    """
+
+    columns = _as_columns(protected)
+    if group_rates is None:
+        group_rates = frame.groupby(columns, sort=True)[outcome].mean()
+    if target_rate is None:
+        target_rate = float(frame[outcome].mean())
+    rates = group_rates.reindex(_group_index(frame, columns)).to_numpy(dtype=float)
+    return target_rate / (rates + 1e-12)
+
+
+def apply_reweighing(
+    dataset: pd.DataFrame, protected: str | Sequence[str] = "gender"
+) -> pd.DataFrame:
     """Return a dataframe with sample weights that mitigate statistical parity gaps."""
 
     df = dataset.copy()
-    grouped = df.groupby("gender")
-    approval_rate = grouped["approved"].mean()
-    target_rate = float(df["approved"].mean())
-    weights = []
-    for _, row in df.iterrows():
-        group_rate = float(approval_rate[row["gender"]])
-        weights.append(target_rate / (group_rate + 1e-12))
-    df["sample_weight"] = weights
+    df["sample_weight"] = reweighing_weights(df, protected)
     return df
 
 
@@ -247,31 +520,8 @@ def mitigation_effect(dataset: pd.DataFrame) -> FairnessReport:
     """Recompute fairness metrics after reweighing."""
 
     reweighted = apply_reweighing(dataset)
-    weighted = {
-        gender: float(np.average(grp["approved"], weights=grp["sample_weight"]))
-        for gender, grp in reweighted.groupby("gender")
-    }
-    female_rate = float(weighted.get("F", np.nan))
-    male_rate = float(weighted.get("M", np.nan))
-    statistical_parity = female_rate - male_rate
-    disparate_impact = female_rate / male_rate if male_rate > 0 else np.nan
-
-    low_risk = reweighted[
-        reweighted["default_risk"] < reweighted["default_risk"].median()
-    ]
-    eq_weighted = {
-        gender: float(np.average(grp["approved"], weights=grp["sample_weight"]))
-        for gender, grp in low_risk.groupby("gender")
-    }
-    female_eq = float(eq_weighted.get("F", np.nan))
-    male_eq = float(eq_weighted.get("M", np.nan))
-    equal_opportunity = female_eq - male_eq
-
-    return FairnessReport(
-        statistical_parity=statistical_parity,
-        disparate_impact=disparate_impact,
-        equal_opportunity=equal_opportunity,
-    )
+    sums = group_outcome_sums(reweighted, "gender", weight_column="sample_weight")
+    return _gender_report(group_fairness_report(sums, reference_group="M"))
 
 
 def run_interpretability_suite() -> Dict[str, object]:
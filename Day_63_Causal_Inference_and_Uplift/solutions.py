@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import copy
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Any, Dict, Mapping, Protocol, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -105,19 +107,41 @@ def difference_in_means(data: pd.DataFrame) -> ABTestResult:
     )
 
 
+_FEATURE_COLUMNS = ("age", "browsing_time", "income")
+
+
 def _prepare_design_matrix(
     data: pd.DataFrame, include_intercept: bool = True
 ) -> np.ndarray:
-    features = data[["age", "browsing_time", "income"]].to_numpy(dtype=float)
+    features = data[list(_FEATURE_COLUMNS)].to_numpy(dtype=float)
     if include_intercept:
         return np.column_stack([np.ones(len(data)), features])
     return features
 
 
+def _sigmoid(logits: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-logits))
+
+
 def fit_propensity_model(
-    data: pd.DataFrame, lr: float = 0.05, epochs: int = 800
+    data: pd.DataFrame,
+    lr: float = 0.05,
+    epochs: int = 800,
+    solver: str = "newton",
+    max_iter: int = 25,
+    tol: float = 1e-8,
+    ridge: float = 1e-6,
 ) -> PropensityModel:
-    """Fit logistic regression via gradient descent for propensity scores."""
+    """Fit logistic regression for propensity scores.
+
+    The default ``solver="newton"`` runs iteratively reweighted least squares,
+    which typically converges in under ten passes over the data. A small
+    ``ridge`` penalty keeps the Hessian invertible with collinear features,
+    and each step is halved until the penalised log-likelihood improves, so
+    separable data cannot make the iterates diverge.
+    ``solver="gradient"`` keeps the original fixed-step gradient descent that
+    uses ``lr`` and ``epochs``.
+    """
 
     X = _prepare_design_matrix(data)
     y = data["treatment"].to_numpy(dtype=float)
@@ -126,11 +150,42 @@ def fit_propensity_model(
     X_scaled = X.copy()
     X_scaled[:, 1:] = (X_scaled[:, 1:] - feature_mean) / feature_scale
     weights = np.zeros(X.shape[1], dtype=float)
-    for _ in range(epochs):
-        logits = X_scaled @ weights
-        preds = 1.0 / (1.0 + np.exp(-logits))
-        gradient = X_scaled.T @ (preds - y) / len(y)
-        weights -= lr * gradient
+    if solver == "gradient":
+        for _ in range(epochs):
+            preds = _sigmoid(X_scaled @ weights)
+            gradient = X_scaled.T @ (preds - y) / len(y)
+            weights -= lr * gradient
+    elif solver == "newton":
+
+        def objective(w: np.ndarray) -> float:
+            logits = X_scaled @ w
+            log_lik = y @ logits - np.logaddexp(0.0, logits).sum()
+            return float(log_lik - 0.5 * ridge * (w @ w))
+
+        current = objective(weights)
+        penalty = ridge * np.eye(X.shape[1])
+        for _ in range(max_iter):
+            preds = _sigmoid(X_scaled @ weights)
+            curvature = np.clip(preds * (1.0 - preds), 1e-10, None)
+            hessian = (X_scaled * curvature[:, np.newaxis]).T @ X_scaled + penalty
+            gradient = X_scaled.T @ (y - preds) - ridge * weights
+            step = np.linalg.solve(hessian, gradient)
+            # Step halving: the full Newton step can overshoot far from the
+            # optimum, e.g. on (nearly) separable data.
+            for _ in range(30):
+                candidate = objective(weights + step)
+                if candidate >= current:
+                    break
+                step /= 2.0
+            else:
+                break
+            weights += step
+            current = candidate
+            if np.max(np.abs(step)) < tol:
+                break
+    else:
+        msg = "solver must be 'newton' or 'gradient'."
+        raise ValueError(msg)
     return PropensityModel(
         weights=weights, feature_mean=feature_mean, feature_scale=feature_scale
     )
@@ -156,47 +211,143 @@ def _linear_regression(X: np.ndarray, y: np.ndarray) -> np.ndarray:
     return beta
 
 
-def double_machine_learning(data: pd.DataFrame) -> DoubleMLResult:
-    """Compute double ML ATE with two-fold cross fitting."""
+class Regressor(Protocol):
+    """Minimal scikit-learn style interface for nuisance models."""
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> object: ...
+
+    def predict(self, X: np.ndarray) -> np.ndarray: ...
+
+
+class LeastSquaresRegressor:
+    """Ordinary least squares with an intercept, the default nuisance model."""
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> "LeastSquaresRegressor":
+        self.coef_ = _linear_regression(np.column_stack([np.ones(len(X)), X]), y)
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.coef_[0] + X @ self.coef_[1:]
+
+
+def _r2_score(y: np.ndarray, y_hat: np.ndarray) -> float:
+    ss_tot = np.sum((y - y.mean()) ** 2)
+    ss_res = np.sum((y - y_hat) ** 2)
+    return float(1 - ss_res / (ss_tot + 1e-12))
 
+
+def _fit_nuisance_fold(
+    X: np.ndarray,
+    T: np.ndarray,
+    Y: np.ndarray,
+    train_idx: np.ndarray,
+    test_idx: np.ndarray,
+    outcome_model: Regressor,
+    treatment_model: Regressor,
+) -> Tuple[np.ndarray, np.ndarray, float, float]:
+    """Fit both nuisance models on one training fold and residualise its held-out fold."""
+
+    model_y = copy.deepcopy(outcome_model).fit(X[train_idx], Y[train_idx])
+    model_t = copy.deepcopy(treatment_model).fit(X[train_idx], T[train_idx])
+    residual_y = Y[test_idx] - model_y.predict(X[test_idx])
+    residual_t = T[test_idx] - model_t.predict(X[test_idx])
+    r2_y = _r2_score(Y[train_idx], model_y.predict(X[train_idx]))
+    r2_t = _r2_score(T[train_idx], model_t.predict(X[train_idx]))
+    return residual_y, residual_t, r2_y, r2_t
+
+
+def _cross_fit_residuals(
+    data: pd.DataFrame,
+    n_folds: int = 5,
+    outcome_model: Regressor | None = None,
+    treatment_model: Regressor | None = None,
+    features: Sequence[str] = _FEATURE_COLUMNS,
+    shuffle: bool = False,
+    random_state: int = 63,
+    n_jobs: int = 1,
+) -> Tuple[np.ndarray, np.ndarray, float, float]:
+    """Return out-of-fold outcome/treatment residuals and mean in-fold R^2 values."""
+
+    if n_folds < 2:
+        msg = "n_folds must be at least 2."
+        raise ValueError(msg)
     n = len(data)
-    fold = n // 2
-    indices = np.arange(n)
-    X = data[["age", "browsing_time", "income"]].to_numpy(dtype=float)
+    X = data[list(features)].to_numpy(dtype=float)
     T = data["treatment"].to_numpy(dtype=float)
     Y = data["outcome"].to_numpy(dtype=float)
-    residuals_y = np.zeros_like(Y)
-    residuals_t = np.zeros_like(T)
-    r2_y: List[float] = []  # type: ignore[name-defined]
-    r2_t: List[float] = []  # type: ignore[name-defined]
-    for train_idx, test_idx in (
-        (indices[:fold], indices[fold:]),
-        (indices[fold:], indices[:fold]),
-    ):
-        X_train = X[train_idx]
-        X_test = X[test_idx]
-        Y_train = Y[train_idx]
-        T_train = T[train_idx]
-        X_design_train = np.column_stack([np.ones(len(train_idx)), X_train])
-        beta_y = _linear_regression(X_design_train, Y_train)
-        beta_t = _linear_regression(X_design_train, T_train)
-        X_design_test = np.column_stack([np.ones(len(test_idx)), X_test])
-        y_hat = X_design_test @ beta_y
-        t_hat = X_design_test @ beta_t
-        residuals_y[test_idx] = Y[test_idx] - y_hat
-        residuals_t[test_idx] = T[test_idx] - t_hat
-        ss_tot_y = np.sum((Y[train_idx] - Y[train_idx].mean()) ** 2)
-        ss_res_y = np.sum((Y_train - X_design_train @ beta_y) ** 2)
-        ss_tot_t = np.sum((T_train - T_train.mean()) ** 2)
-        ss_res_t = np.sum((T_train - X_design_train @ beta_t) ** 2)
-        r2_y.append(1 - ss_res_y / (ss_tot_y + 1e-12))
-        r2_t.append(1 - ss_res_t / (ss_tot_t + 1e-12))
+    if outcome_model is None:
+        outcome_model = LeastSquaresRegressor()
+    if treatment_model is None:
+        treatment_model = LeastSquaresRegressor()
+
+    order = (
+        np.random.default_rng(random_state).permutation(n) if shuffle else np.arange(n)
+    )
+    bounds = [k * n // n_folds for k in range(n_folds + 1)]
+    test_folds = [order[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+    train_folds = [np.setdiff1d(order, fold, assume_unique=True) for fold in test_folds]
+    args = (
+        [X] * n_folds,
+        [T] * n_folds,
+        [Y] * n_folds,
+        train_folds,
+        test_folds,
+        [outcome_model] * n_folds,
+        [treatment_model] * n_folds,
+    )
+    if n_jobs == 1:
+        fold_results = list(map(_fit_nuisance_fold, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            fold_results = list(pool.map(_fit_nuisance_fold, *args))
+
+    residuals_y = np.empty_like(Y)
+    residuals_t = np.empty_like(T)
+    for test_idx, (res_y, res_t, _, _) in zip(test_folds, fold_results):
+        residuals_y[test_idx] = res_y
+        residuals_t[test_idx] = res_t
+    r2_y = float(np.mean([result[2] for result in fold_results]))
+    r2_t = float(np.mean([result[3] for result in fold_results]))
+    return residuals_y, residuals_t, r2_y, r2_t
+
+
+def cross_fit_double_ml(
+    data: pd.DataFrame,
+    n_folds: int = 5,
+    outcome_model: Regressor | None = None,
+    treatment_model: Regressor | None = None,
+    features: Sequence[str] = _FEATURE_COLUMNS,
+    shuffle: bool = False,
+    random_state: int = 63,
+    n_jobs: int = 1,
+) -> DoubleMLResult:
+    """Estimate the ATE with K-fold cross-fitted partialling-out.
+
+    ``outcome_model`` and ``treatment_model`` accept any object with
+    ``fit``/``predict`` (scikit-learn regressors included); a fresh copy is
+    fitted per fold. Folds are dispatched to ``n_jobs`` worker processes.
+    """
+
+    residuals_y, residuals_t, r2_y, r2_t = _cross_fit_residuals(
+        data,
+        n_folds,
+        outcome_model,
+        treatment_model,
+        features,
+        shuffle,
+        random_state,
+        n_jobs,
+    )
     ate = float(
         np.dot(residuals_t, residuals_y) / (np.dot(residuals_t, residuals_t) + 1e-12)
     )
-    return DoubleMLResult(
-        ate=ate, nuisance_r2=(float(np.mean(r2_y)), float(np.mean(r2_t)))
-    )
+    return DoubleMLResult(ate=ate, nuisance_r2=(r2_y, r2_t))
+
+
+def double_machine_learning(data: pd.DataFrame) -> DoubleMLResult:
+    """Compute double ML ATE with two-fold cross fitting."""
+
+    return cross_fit_double_ml(data, n_folds=2)
 
 
 def two_model_uplift(data: pd.DataFrame) -> UpliftResult:
@@ -234,6 +385,184 @@ def two_model_uplift(data: pd.DataFrame) -> UpliftResult:
     )
 
 
+@dataclass
+class BootstrapInterval:
+    """Point estimate with a percentile bootstrap confidence interval."""
+
+    estimate: float
+    stderr: float
+    ci_low: float
+    ci_high: float
+
+
+def _bootstrap_terms(
+    data: pd.DataFrame,
+    propensity_model: PropensityModel,
+    dml_residuals: Tuple[np.ndarray, np.ndarray],
+) -> np.ndarray:
+    """Stack the per-row terms whose weighted sums determine every estimator.
+
+    Each bootstrap replicate only needs ``weights @ terms``; the estimators are
+    then closed-form functions of those sums (see :func:`_effects_from_sums`).
+    """
+
+    X = _prepare_design_matrix(data)
+    T = data["treatment"].to_numpy(dtype=float)
+    Y = data["outcome"].to_numpy(dtype=float)
+    C = 1.0 - T
+    propensities = propensity_model.predict_proba(X)
+    ipw_t = T / (propensities + 1e-12)
+    ipw_c = C / (1 - propensities + 1e-12)
+    residual_y, residual_t = dml_residuals
+    outer = (X[:, :, np.newaxis] * X[:, np.newaxis, :]).reshape(len(X), -1)
+    return np.column_stack(
+        [
+            T,
+            T * Y,
+            C,
+            C * Y,
+            ipw_t,
+            ipw_t * Y,
+            ipw_c,
+            ipw_c * Y,
+            residual_t * residual_y,
+            residual_t * residual_t,
+            X,
+            outer * T[:, np.newaxis],
+            X * (T * Y)[:, np.newaxis],
+            outer * C[:, np.newaxis],
+            X * (C * Y)[:, np.newaxis],
+        ]
+    )
+
+
+def _effects_from_sums(sums: np.ndarray, n_params: int) -> np.ndarray:
+    """Map ``(B, n_terms)`` weighted sums to ``(B, 4)`` estimator values.
+
+    Columns are difference in means, IPW ATE, double ML ATE and two-model
+    uplift, in that order.
+    """
+
+    p, p2 = n_params, n_params * n_params
+    dim = sums[:, 1] / sums[:, 0] - sums[:, 3] / sums[:, 2]
+    ipw = sums[:, 5] / sums[:, 4] - sums[:, 7] / sums[:, 6]
+    dml = sums[:, 8] / (sums[:, 9] + 1e-12)
+    offset = 10
+    cohort_mean = sums[:, offset : offset + p]
+    offset += p
+    coefs = []
+    for _ in range(2):
+        gram = sums[:, offset : offset + p2].reshape(-1, p, p)
+        moment = sums[:, offset + p2 : offset + p2 + p]
+        coefs.append(np.einsum("bij,bj->bi", np.linalg.pinv(gram), moment))
+        offset += p2 + p
+    # The first design column is the intercept, so its sum is the row count.
+    cohort_mean = cohort_mean / cohort_mean[:, :1]
+    uplift = np.einsum("bi,bi->b", cohort_mean, coefs[0] - coefs[1])
+    return np.column_stack([dim, ipw, dml, uplift])
+
+
+def _bootstrap_worker(
+    terms: np.ndarray,
+    n_replicates: int,
+    method: str,
+    seed: np.random.SeedSequence,
+    block_size: int,
+) -> np.ndarray:
+    """Return ``(n_replicates, n_terms)`` resampled sums for one worker."""
+
+    rng = np.random.default_rng(seed)
+    n = terms.shape[0]
+    sums = np.zeros((n_replicates, terms.shape[1]))
+    if method == "poisson":
+        for start in range(0, n, block_size):
+            block = terms[start : start + block_size]
+            counts = rng.poisson(1.0, size=(n_replicates, block.shape[0]))
+            sums += counts @ block
+    else:
+        # Whole resamples are drawn as ``(replicates, n)`` count blocks sized
+        # like the Poisson row blocks.
+        batch = max(1, n_replicates * block_size // max(n, 1))
+        uniform = np.full(n, 1.0 / n)
+        for start in range(0, n_replicates, batch):
+            size = min(batch, n_replicates - start)
+            counts = rng.multinomial(n, uniform, size=size)
+            sums[start : start + size] = counts @ terms
+    return sums
+
+
+def bootstrap_effect_intervals(
+    data: pd.DataFrame,
+    n_bootstrap: int = 1000,
+    confidence: float = 0.95,
+    method: str = "poisson",
+    propensity_model: PropensityModel | None = None,
+    n_jobs: int = 1,
+    block_size: int = 2_048,
+    random_state: int = 63,
+    dml_options: Mapping[str, Any] | None = None,
+) -> Dict[str, BootstrapInterval]:
+    """Bootstrap confidence intervals for all Day 63 effect estimators at once.
+
+    Replicates are expressed as count-weight matrices applied to a fixed table
+    of per-row terms, so no DataFrame is ever resampled. ``method="poisson"``
+    draws independent Poisson(1) weights in row blocks; ``"multinomial"`` is the
+    classic resample-with-replacement bootstrap. The propensity model and the
+    cross-fitted DML residuals are held fixed across replicates.
+
+    ``dml_options`` takes the :func:`cross_fit_double_ml` keyword arguments
+    (``n_folds``, ``outcome_model``, ``shuffle``, ...), so the interval is for
+    the same estimator as the configured point estimate. The default matches
+    :func:`double_machine_learning` (two folds, least squares).
+    """
+
+    if method not in {"poisson", "multinomial"}:
+        msg = "method must be 'poisson' or 'multinomial'."
+        raise ValueError(msg)
+    if not 0.0 < confidence < 1.0:
+        msg = "confidence must lie strictly between 0 and 1."
+        raise ValueError(msg)
+    if propensity_model is None:
+        propensity_model = fit_propensity_model(data)
+    residual_y, residual_t, _, _ = _cross_fit_residuals(
+        data, **{"n_folds": 2, **(dml_options or {})}
+    )
+    terms = _bootstrap_terms(data, propensity_model, (residual_y, residual_t))
+    n_params = len(_FEATURE_COLUMNS) + 1
+    point = _effects_from_sums(terms.sum(axis=0, keepdims=True), n_params)[0]
+
+    n_workers = max(1, min(n_jobs, n_bootstrap))
+    sizes = [len(part) for part in np.array_split(np.arange(n_bootstrap), n_workers)]
+    seeds = np.random.SeedSequence(random_state).spawn(n_workers)
+    args = (
+        [terms] * n_workers,
+        sizes,
+        [method] * n_workers,
+        seeds,
+        [block_size] * n_workers,
+    )
+    if n_workers == 1:
+        parts = list(map(_bootstrap_worker, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            parts = list(pool.map(_bootstrap_worker, *args))
+    replicates = _effects_from_sums(np.vstack(parts), n_params)
+
+    alpha = (1.0 - confidence) / 2.0
+    lower, upper = np.nanquantile(replicates, [alpha, 1.0 - alpha], axis=0)
+    stderr = np.nanstd(replicates, axis=0, ddof=1)
+    names = ("difference_in_means", "ipw_ate", "double_ml_ate", "two_model_uplift")
+    return {
+        name: BootstrapInterval(
+            estimate=float(point[i]),
+            stderr=float(stderr[i]),
+            ci_low=float(lower[i]),
+            ci_high=float(upper[i]),
+        )
+        for i, name in enumerate(names)
+    }
+
+
 def run_causal_suite(random_state: int = 63) -> Dict[str, object]:
     """Execute all causal estimators for documentation demos."""
 
@@ -5,7 +5,7 @@ from __future__ import annotations
 import math
 from dataclasses import dataclass
 from statistics import NormalDist
-from typing import Dict, Iterable, List, MutableMapping, Sequence, Tuple
+from typing import Dict, Iterable, Mapping, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -16,48 +16,180 @@ import pandas as pd
 # ---------------------------------------------------------------------------
 
 
-def summarize_ab_test(
-    control: Iterable[float], treatment: Iterable[float]
-) -> pd.DataFrame:
-    """Return descriptive statistics and lift for an A/B test."""
+@dataclass
+class StreamingMoments:
+    """Running count, mean, and sum of squared deviations (Welford's algorithm).
+
+    Instances can be updated chunk by chunk and merged across workers, so the
+    experiment helpers below never need the raw observations in memory.
+    Missing (NaN) observations are skipped, as pandas skips NaN. Infinite
+    values are kept, so, as with a ``pd.Series``, the mean becomes infinite
+    and the variance NaN.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "StreamingMoments":
+        """Build moments from an in-memory array or any iterable of numbers."""
+
+        return cls().update(values)
+
+    def update(self, values: Iterable[float]) -> "StreamingMoments":
+        """Fold a chunk of observations into the running moments in place."""
 
-    control_series = pd.Series(list(control), dtype="float")
-    treatment_series = pd.Series(list(treatment), dtype="float")
-    if control_series.empty or treatment_series.empty:
+        if isinstance(values, (np.ndarray, pd.Series, list, tuple)):
+            data = np.asarray(values, dtype="float")
+        else:
+            data = np.fromiter(values, dtype="float")
+        data = data[~np.isnan(data)]
+        if data.size == 0:
+            return self
+        chunk_mean = float(data.mean())
+        chunk = StreamingMoments(
+            count=int(data.size),
+            mean=chunk_mean,
+            m2=float(np.square(data - chunk_mean).sum()),
+        )
+        merged = self.merge(chunk)
+        self.count, self.mean, self.m2 = merged.count, merged.mean, merged.m2
+        return self
+
+    def merge(self, other: "StreamingMoments") -> "StreamingMoments":
+        """Combine two partial states using Chan et al.'s parallel update."""
+
+        if other.count == 0:
+            return StreamingMoments(self.count, self.mean, self.m2)
+        if self.count == 0:
+            return StreamingMoments(other.count, other.mean, other.m2)
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        return StreamingMoments(
+            count=total,
+            mean=self.mean + delta * other.count / total,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / total,
+        )
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (``ddof=1``); ``nan`` with fewer than two observations."""
+
+        if self.count < 2:
+            return float("nan")
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance) if self.count >= 2 else float("nan")
+
+
+class ExperimentAccumulator:
+    """Per-variant streaming moments that can be fed chunks and merged across workers."""
+
+    def __init__(self) -> None:
+        self.variants: Dict[str, StreamingMoments] = {}
+
+    def ingest(self, variant: str, values: Iterable[float]) -> "ExperimentAccumulator":
+        """Add raw observations for a single variant."""
+
+        self.variants.setdefault(variant, StreamingMoments()).update(values)
+        return self
+
+    def ingest_frame(
+        self,
+        frame: pd.DataFrame,
+        *,
+        variant_col: str = "variant",
+        value_col: str = "value",
+    ) -> "ExperimentAccumulator":
+        """Add a long-format chunk (one row per event) covering any number of variants."""
+
+        missing = {variant_col, value_col} - set(frame.columns)
+        if missing:
+            raise KeyError(f"frame missing required columns: {sorted(missing)}")
+        # Same filter as ``StreamingMoments.update`` so both ingest paths agree.
+        frame = frame[~np.isnan(frame[value_col].to_numpy(dtype="float"))]
+        grouped = frame.groupby(variant_col, sort=False)[value_col]
+        stats = grouped.agg(["count", "mean"])
+        stats["m2"] = grouped.var(ddof=0) * stats["count"]
+        for variant, row in stats.iterrows():
+            partial = StreamingMoments(
+                int(row["count"]), float(row["mean"]), float(row["m2"])
+            )
+            current = self.variants.get(variant, StreamingMoments())
+            self.variants[variant] = current.merge(partial)
+        return self
+
+    def merge(self, other: "ExperimentAccumulator") -> "ExperimentAccumulator":
+        """Return a new accumulator combining the variants of both inputs."""
+
+        combined = ExperimentAccumulator()
+        for name in {**self.variants, **other.variants}:
+            left = self.variants.get(name, StreamingMoments())
+            combined.variants[name] = left.merge(
+                other.variants.get(name, StreamingMoments())
+            )
+        return combined
+
+    def __getitem__(self, variant: str) -> StreamingMoments:
+        return self.variants[variant]
+
+
+SampleLike = Iterable[float] | StreamingMoments
+
+
+def _as_moments(sample: SampleLike) -> StreamingMoments:
+    if isinstance(sample, StreamingMoments):
+        return sample
+    return StreamingMoments.from_values(sample)
+
+
+def summarize_ab_test(control: SampleLike, treatment: SampleLike) -> pd.DataFrame:
+    """Return descriptive statistics and lift for an A/B test.
+
+    Either argument may be raw observations or a :class:`StreamingMoments`
+    state produced by :class:`ExperimentAccumulator`.
+    """
+
+    control_stats = _as_moments(control)
+    treatment_stats = _as_moments(treatment)
+    if control_stats.count == 0 or treatment_stats.count == 0:
         raise ValueError("Control and treatment samples must contain data")
 
     summary = pd.DataFrame(
         {
             "group": ["control", "treatment"],
-            "mean": [control_series.mean(), treatment_series.mean()],
-            "std": [control_series.std(ddof=1), treatment_series.std(ddof=1)],
-            "count": [control_series.size, treatment_series.size],
+            "mean": [control_stats.mean, treatment_stats.mean],
+            "std": [control_stats.std, treatment_stats.std],
+            "count": [control_stats.count, treatment_stats.count],
         }
     )
     summary["standard_error"] = summary["std"] / np.sqrt(summary["count"])
-    control_mean = summary.loc[summary["group"] == "control", "mean"].iat[0]
-    summary["lift_vs_control"] = summary["mean"].apply(
-        lambda m: 0.0 if control_mean == 0 else (m - control_mean) / control_mean
-    )
+    control_mean = control_stats.mean
+    if control_mean == 0:
+        summary["lift_vs_control"] = 0.0
+    else:
+        summary["lift_vs_control"] = (summary["mean"] - control_mean) / control_mean
     return summary
 
 
 def welch_t_p_value(
-    control: Iterable[float], treatment: Iterable[float], *, alternative: str = "two-sided"
+    control: SampleLike, treatment: SampleLike, *, alternative: str = "two-sided"
 ) -> float:
     """Compute a Welch's t-test p-value without requiring SciPy."""
 
-    control_series = pd.Series(list(control), dtype="float")
-    treatment_series = pd.Series(list(treatment), dtype="float")
-    if control_series.empty or treatment_series.empty:
+    control_stats = _as_moments(control)
+    treatment_stats = _as_moments(treatment)
+    if control_stats.count == 0 or treatment_stats.count == 0:
         raise ValueError("Control and treatment samples must contain data")
 
-    mean_diff = treatment_series.mean() - control_series.mean()
-    var_control = control_series.var(ddof=1)
-    var_treatment = treatment_series.var(ddof=1)
-    n_control = control_series.size
-    n_treatment = treatment_series.size
-    se = math.sqrt(var_control / n_control + var_treatment / n_treatment)
+    mean_diff = treatment_stats.mean - control_stats.mean
+    se = math.sqrt(
+        control_stats.variance / control_stats.count
+        + treatment_stats.variance / treatment_stats.count
+    )
     if se == 0:
         return 0.0
     t_stat = mean_diff / se
@@ -70,7 +202,7 @@ def welch_t_p_value(
 
 
 def run_hypothesis_test(
-    sample: Iterable[float],
+    sample: SampleLike,
     *,
     baseline: float,
     alternative: str = "two-sided",
@@ -78,15 +210,15 @@ def run_hypothesis_test(
 ) -> Dict[str, float | bool]:
     """Perform a one-sample z-test and return decision metadata."""
 
-    series = pd.Series(list(sample), dtype="float")
-    if series.empty:
+    stats = _as_moments(sample)
+    if stats.count == 0:
         raise ValueError("Sample must contain observations")
-    sample_mean = series.mean()
-    sample_std = series.std(ddof=1)
+    sample_mean = stats.mean
+    sample_std = stats.std
     if sample_std == 0:
         z_score = 0.0
     else:
-        z_score = (sample_mean - baseline) / (sample_std / math.sqrt(series.size))
+        z_score = (sample_mean - baseline) / (sample_std / math.sqrt(stats.count))
     dist = NormalDist()
     if alternative == "greater":
         p_value = 1 - dist.cdf(z_score)
@@ -137,40 +269,111 @@ def interpret_p_value(p_value: float) -> str:
     return "Little evidence against the null"
 
 
-def cohort_retention(
-    events: pd.DataFrame,
-    *,
-    cohort_col: str = "cohort",
-    period_col: str = "period",
-    value_col: str = "active_users",
+def _cohort_activity_matrix(
+    events: pd.DataFrame, *, cohort_col: str, period_col: str, value_col: str
 ) -> pd.DataFrame:
-    """Compute cohort retention by normalising activity within each cohort."""
+    """Sum activity into a cohort x period matrix with one bincount pass.
+
+    Cohort and period labels are factorised, so there is no per-group Python
+    work. The result is dense: one row per observed cohort and one column per
+    observed period, with zeros where a pair has no events (the same shape as
+    ``groupby().sum().unstack(fill_value=0)``). As with ``groupby().sum()``,
+    rows with a missing cohort or period are dropped and missing activity
+    values count as zero.
+    """
 
     required_cols = {cohort_col, period_col, value_col}
     missing = required_cols - set(events.columns)
     if missing:
         raise KeyError(f"events missing required columns: {sorted(missing)}")
-    cohort_totals = (
-        events.loc[events[period_col] == 0, [cohort_col, value_col]]
-        .groupby(cohort_col)[value_col]
-        .sum()
+    cohort_codes, cohorts = pd.factorize(events[cohort_col], sort=True)
+    period_codes, periods = pd.factorize(events[period_col], sort=True)
+    n_cohorts, n_periods = len(cohorts), len(periods)
+    # factorize marks missing labels with -1.
+    known = (cohort_codes >= 0) & (period_codes >= 0)
+    values = np.nan_to_num(events[value_col].to_numpy(dtype="float"))
+    flat = np.bincount(
+        cohort_codes[known] * n_periods + period_codes[known],
+        weights=values[known],
+        minlength=n_cohorts * n_periods,
     )
-    pivot = (
-        events.groupby([cohort_col, period_col])[value_col]
-        .sum()
-        .unstack(fill_value=0)
-        .sort_index()
+    return pd.DataFrame(
+        flat.reshape(n_cohorts, n_periods),
+        index=pd.Index(np.asarray(cohorts), name=cohort_col),
+        columns=pd.Index(np.asarray(periods).astype(int), name=period_col),
     )
-    pivot = pivot.astype(float)
-    for cohort in pivot.index:
-        base = cohort_totals.get(cohort, 0)
-        if base == 0:
-            pivot.loc[cohort] = 0.0
+
+
+@dataclass
+class CohortRetentionState:
+    """Raw cohort x period activity that can be refreshed incrementally."""
+
+    counts: pd.DataFrame
+    cohort_col: str = "cohort"
+    period_col: str = "period"
+    value_col: str = "active_users"
+
+    @classmethod
+    def from_events(
+        cls,
+        events: pd.DataFrame,
+        *,
+        cohort_col: str = "cohort",
+        period_col: str = "period",
+        value_col: str = "active_users",
+    ) -> "CohortRetentionState":
+        counts = _cohort_activity_matrix(
+            events, cohort_col=cohort_col, period_col=period_col, value_col=value_col
+        )
+        return cls(counts, cohort_col, period_col, value_col)
+
+    def update(self, new_events: pd.DataFrame) -> "CohortRetentionState":
+        """Add a new period's events without re-aggregating the full history."""
+
+        delta = _cohort_activity_matrix(
+            new_events,
+            cohort_col=self.cohort_col,
+            period_col=self.period_col,
+            value_col=self.value_col,
+        )
+        counts = self.counts.add(delta, fill_value=0.0).fillna(0.0)
+        self.counts = counts.sort_index().sort_index(axis=1)
+        return self
+
+    def retention(self) -> pd.DataFrame:
+        """Normalise each cohort row by its period-0 size in a single broadcast."""
+
+        values = self.counts.to_numpy(dtype="float")
+        if 0 in self.counts.columns:
+            base = self.counts[0].to_numpy(dtype="float")[:, np.newaxis]
         else:
-            pivot.loc[cohort] = (pivot.loc[cohort] / base).round(4)
-    pivot.index.name = cohort_col
-    pivot.columns = [f"period_{int(col)}" for col in pivot.columns]
-    return pivot.reset_index()
+            base = np.zeros((values.shape[0], 1))
+        ratios = np.divide(values, base, out=np.zeros_like(values), where=base != 0)
+        table = pd.DataFrame(
+            ratios.round(4),
+            index=self.counts.index.rename(self.cohort_col),
+            columns=[f"period_{int(col)}" for col in self.counts.columns],
+        )
+        return table.reset_index()
+
+
+def cohort_retention(
+    events: pd.DataFrame,
+    *,
+    cohort_col: str = "cohort",
+    period_col: str = "period",
+    value_col: str = "active_users",
+) -> pd.DataFrame:
+    """Compute cohort retention by normalising activity within each cohort.
+
+    Use :class:`CohortRetentionState` directly to refresh an existing table
+    with new events instead of recomputing it from the full history.
+    """
+
+    state = CohortRetentionState.from_events(
+        events, cohort_col=cohort_col, period_col=period_col, value_col=value_col
+    )
+    return state.retention()
 
 
 # ---------------------------------------------------------------------------
@@ -178,38 +381,97 @@ def cohort_retention(
 # ---------------------------------------------------------------------------
 
 
-def estimate_trend_coefficients(values: Sequence[float]) -> Tuple[float, float]:
-    """Estimate intercept and slope for a linear trend using least squares."""
+def _trend_coefficients(y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Closed-form OLS intercepts and slopes for each row of ``y`` (series x time)."""
+
+    n = y.shape[-1]
+    x_centered = np.arange(n, dtype="float") - (n - 1) / 2
+    y_mean = y.mean(axis=-1)
+    denominator = float(x_centered @ x_centered)
+    slopes = (y @ x_centered) / denominator if denominator else np.zeros_like(y_mean)
+    intercepts = y_mean - slopes * (n - 1) / 2
+    return intercepts, slopes
+
+
+def estimate_trend_coefficients(
+    values: Sequence[float] | np.ndarray,
+) -> Tuple[float, float] | Tuple[np.ndarray, np.ndarray]:
+    """Estimate intercept and slope for a linear trend using least squares.
+
+    A 2-D input (series x time) returns arrays of intercepts and slopes, one
+    per row, computed in a single broadcasted pass.
+    """
 
     y = np.asarray(values, dtype="float")
     if y.size == 0:
         raise ValueError("values must contain at least one element")
-    x = np.arange(y.size, dtype="float")
-    X = np.column_stack([np.ones_like(x), x])
-    beta, *_ = np.linalg.lstsq(X, y, rcond=None)
-    intercept, slope = beta
-    return float(intercept), float(slope)
+    if y.ndim > 2:
+        raise ValueError("values must be 1-D or 2-D (series x time)")
+    intercepts, slopes = _trend_coefficients(y)
+    if y.ndim == 1:
+        return float(intercepts), float(slopes)
+    return intercepts, slopes
+
 
+def seasonal_pattern(
+    values: Sequence[float] | np.ndarray, season_length: int
+) -> np.ndarray:
+    """Return the average seasonal offsets for a given periodicity.
 
-def seasonal_pattern(values: Sequence[float], season_length: int) -> np.ndarray:
-    """Return the average seasonal offsets for a given periodicity."""
+    For a 2-D input (series x time) the result has shape
+    ``(n_series, season_length)``.
+    """
 
     data = np.asarray(values, dtype="float")
     if season_length <= 0:
         raise ValueError("season_length must be positive")
-    if data.size < season_length:
-        return np.zeros(season_length, dtype="float")
-    pattern = np.zeros(season_length, dtype="float")
-    counts = np.zeros(season_length, dtype=int)
-    intercept, slope = estimate_trend_coefficients(data)
-    trend = intercept + slope * np.arange(data.size)
-    residuals = data - trend
-    for idx, value in enumerate(residuals):
-        slot = idx % season_length
-        pattern[slot] += value
-        counts[slot] += 1
-    counts[counts == 0] = 1
-    return pattern / counts
+    n = data.shape[-1]
+    if n < season_length:
+        return np.zeros((*data.shape[:-1], season_length), dtype="float")
+    intercepts, slopes = _trend_coefficients(data)
+    time_index = np.arange(n)
+    residuals = data - (intercepts[..., None] + slopes[..., None] * time_index)
+    slots = time_index % season_length
+    membership = (slots[:, None] == np.arange(season_length)).astype("float")
+    counts = np.maximum(membership.sum(axis=0), 1)
+    return (residuals @ membership) / counts
+
+
+@dataclass(frozen=True)
+class TrendSeasonalFit:
+    """Linear trend plus seasonal offsets for one or more series (rows)."""
+
+    intercepts: np.ndarray
+    slopes: np.ndarray
+    pattern: np.ndarray
+    n_obs: int
+
+    def components(self, periods: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Trend and seasonal arrays (series x periods) for integer ``periods``."""
+
+        trend = self.intercepts[:, None] + self.slopes[:, None] * periods
+        seasonal = self.pattern[:, periods % self.pattern.shape[1]]
+        return trend, seasonal
+
+    def forecast(self, horizon: int) -> np.ndarray:
+        """Point forecasts (series x horizon) for the periods after the history."""
+
+        trend, seasonal = self.components(np.arange(self.n_obs, self.n_obs + horizon))
+        return trend + seasonal
+
+
+def fit_trend_seasonal(
+    values: Sequence[float] | np.ndarray, *, season_length: int = 1
+) -> TrendSeasonalFit:
+    """Fit trend and seasonality for every row of a (series x time) array at once."""
+
+    data = np.atleast_2d(np.asarray(values, dtype="float"))
+    if data.ndim != 2 or data.shape[1] == 0:
+        raise ValueError("values must contain at least one element")
+    season_length = max(1, season_length)
+    intercepts, slopes = _trend_coefficients(data)
+    pattern = seasonal_pattern(data, season_length)
+    return TrendSeasonalFit(intercepts, slopes, pattern, data.shape[1])
 
 
 def forecast_business_metric(
@@ -225,32 +487,60 @@ def forecast_business_metric(
         raise KeyError(f"history missing required column '{value_col}'")
     ordered = history.reset_index(drop=True).copy()
     values = ordered[value_col].astype(float).to_numpy()
-    intercept, slope = estimate_trend_coefficients(values)
-    trend = intercept + slope * np.arange(values.size)
-    pattern = seasonal_pattern(values, max(1, season_length))
-    season_length = max(1, season_length)
-    seasonal_component = np.array([pattern[i % season_length] for i in range(values.size)])
-    ordered["trend"] = trend
-    ordered["seasonality"] = seasonal_component
+    fit = fit_trend_seasonal(values, season_length=season_length)
+    trend, seasonal = fit.components(np.arange(values.size))
+    ordered["trend"] = trend[0]
+    ordered["seasonality"] = seasonal[0]
     ordered["fitted"] = ordered["trend"] + ordered["seasonality"]
 
     future_index = np.arange(values.size, values.size + horizon)
-    forecast_trend = intercept + slope * future_index
-    future_seasonal = np.array([
-        pattern[i % season_length] for i in range(values.size, values.size + horizon)
-    ])
-    forecast_values = forecast_trend + future_seasonal
+    forecast_trend, future_seasonal = fit.components(future_index)
     forecast_df = pd.DataFrame(
         {
             "period": future_index,
-            "forecast": forecast_values,
-            "trend": forecast_trend,
-            "seasonality": future_seasonal,
+            "forecast": forecast_trend[0] + future_seasonal[0],
+            "trend": forecast_trend[0],
+            "seasonality": future_seasonal[0],
         }
     )
     return ordered, forecast_df
 
 
+def forecast_business_metrics(
+    history: pd.DataFrame,
+    *,
+    value_cols: Sequence[str] | None = None,
+    horizon: int = 3,
+    season_length: int = 1,
+) -> pd.DataFrame:
+    """Forecast every KPI column of a wide history frame in one broadcasted fit.
+
+    Returns a long frame with one row per ``(metric, period)``.
+    """
+
+    columns = (
+        list(value_cols)
+        if value_cols is not None
+        else list(history.select_dtypes("number").columns)
+    )
+    missing = set(columns) - set(history.columns)
+    if missing:
+        raise KeyError(f"history missing required columns: {sorted(missing)}")
+    values = history[columns].astype(float).to_numpy().T
+    fit = fit_trend_seasonal(values, season_length=season_length)
+    future_index = np.arange(values.shape[1], values.shape[1] + horizon)
+    trend, seasonal = fit.components(future_index)
+    return pd.DataFrame(
+        {
+            "metric": np.repeat(columns, horizon),
+            "period": np.tile(future_index, len(columns)),
+            "forecast": (trend + seasonal).ravel(),
+            "trend": trend.ravel(),
+            "seasonality": seasonal.ravel(),
+        }
+    )
+
+
 def describe_time_series_components(df: pd.DataFrame) -> pd.DataFrame:
     """Provide summary statistics for level, trend, and seasonality components."""
 
@@ -336,6 +626,98 @@ def engineer_polynomial_features(
     return base
 
 
+@dataclass(frozen=True)
+class SegmentRule:
+    """Assign ``label`` when every ``high`` column is at/above its threshold and
+    every ``low`` column is below it."""
+
+    label: str
+    high: Tuple[str, ...] = ()
+    low: Tuple[str, ...] = ()
+
+
+def quantile_thresholds(
+    frame: pd.DataFrame,
+    columns: Sequence[str],
+    *,
+    quantile: float | Mapping[str, float] = 0.5,
+) -> Dict[str, float]:
+    """Compute per-dimension cut-offs (the median by default) in one call."""
+
+    missing = set(columns) - set(frame.columns)
+    if missing:
+        raise KeyError(f"Frame missing required columns: {sorted(missing)}")
+    if isinstance(quantile, Mapping):
+        return {
+            col: float(frame[col].quantile(quantile.get(col, 0.5))) for col in columns
+        }
+    values = frame[list(columns)].quantile(quantile)
+    return {col: float(values[col]) for col in columns}
+
+
+def segment_by_rules(
+    frame: pd.DataFrame,
+    rules: Sequence[SegmentRule],
+    *,
+    thresholds: Mapping[str, float] | None = None,
+    default: str = "other",
+    segment_col: str = "segment",
+) -> pd.DataFrame:
+    """Label rows with the first matching rule using boolean masks and ``np.select``.
+
+    Thresholds default to column medians of ``frame``; pass precomputed
+    ``thresholds`` to keep segments consistent across chunks.
+    """
+
+    rules = tuple(rules)
+    if not rules:
+        raise ValueError("rules must contain at least one SegmentRule")
+    if not all(isinstance(rule, SegmentRule) for rule in rules):
+        raise TypeError("rules must be SegmentRule instances")
+    columns = sorted({col for rule in rules for col in (*rule.high, *rule.low)})
+    if thresholds is None:
+        thresholds = quantile_thresholds(frame, columns)
+    missing = set(columns) - set(frame.columns)
+    if missing:
+        raise KeyError(f"Frame missing required columns: {sorted(missing)}")
+    is_high = {col: frame[col].to_numpy() >= thresholds[col] for col in columns}
+    conditions = []
+    for rule in rules:
+        mask = np.ones(len(frame), dtype=bool)
+        for col in rule.high:
+            mask &= is_high[col]
+        for col in rule.low:
+            mask &= ~is_high[col]
+        conditions.append(mask)
+    labels = [rule.label for rule in rules]
+    categories = list(dict.fromkeys([*labels, default]))
+    choices = [categories.index(label) for label in labels]
+    codes = np.select(conditions, choices, default=categories.index(default))
+    output = frame.copy()
+    output[segment_col] = pd.Categorical.from_codes(codes, categories=categories)
+    return output
+
+
+def segment_in_chunks(
+    chunks: Iterable[pd.DataFrame],
+    rules: Sequence[SegmentRule],
+    *,
+    thresholds: Mapping[str, float],
+    default: str = "other",
+    segment_col: str = "segment",
+) -> Iterable[pd.DataFrame]:
+    """Segment a stream of chunks (e.g. ``pd.read_csv(chunksize=...)``) lazily."""
+
+    for chunk in chunks:
+        yield segment_by_rules(
+            chunk,
+            rules,
+            thresholds=thresholds,
+            default=default,
+            segment_col=segment_col,
+        )
+
+
 def segment_customers_by_behavior(
     frame: pd.DataFrame,
     *,
@@ -348,23 +730,12 @@ def segment_customers_by_behavior(
     missing = required - set(frame.columns)
     if missing:
         raise KeyError(f"Frame missing required columns: {sorted(missing)}")
-    output = frame.copy()
-    spend_threshold = output[spend_col].median()
-    engagement_threshold = output[engagement_col].median()
-
-    def classify(row: MutableMapping[str, float]) -> str:
-        high_spend = row[spend_col] >= spend_threshold
-        high_engagement = row[engagement_col] >= engagement_threshold
-        if high_spend and high_engagement:
-            return "high_value"
-        if high_spend:
-            return "growing"
-        if high_engagement:
-            return "promising"
-        return "at_risk"
-
-    output["segment"] = output.apply(classify, axis=1)
-    return output
+    rules = [
+        SegmentRule("high_value", high=(spend_col, engagement_col)),
+        SegmentRule("growing", high=(spend_col,)),
+        SegmentRule("promising", high=(engagement_col,)),
+    ]
+    return segment_by_rules(frame, rules, default="at_risk")
 
 
 def epsilon_greedy_action(
@@ -399,29 +770,154 @@ def supervised_predictions(
 
 
 def unsupervised_scorecard(frame: pd.DataFrame) -> pd.DataFrame:
-    """Summarise customer segments for dashboarding."""
+    """Summarise customer segments for dashboarding, one row per segment sorted by name."""
 
     if "segment" not in frame.columns:
         raise KeyError("Frame must include a 'segment' column")
-    counts = frame.groupby("segment").size().rename("customers")
+    grouped = frame.groupby("segment", observed=True)
+    counts = grouped.size().rename("customers")
     metric_col = frame.columns[0]
-    spend = frame.groupby("segment")[metric_col].mean().rename("avg_value")
-    return pd.concat([counts, spend], axis=1).reset_index()
+    spend = grouped[metric_col].mean().rename("avg_value")
+    scorecard = pd.concat([counts, spend], axis=1).reset_index()
+    return scorecard.sort_values(
+        "segment", key=lambda col: col.astype(str), ignore_index=True
+    )
+
+
+@dataclass(frozen=True)
+class EpsilonGreedySimulation:
+    """Actions and exploration flags for ``runs`` independent epsilon-greedy runs."""
+
+    estimates: np.ndarray
+    epsilon: float
+    actions: np.ndarray
+    explore: np.ndarray
+
+    def run_summary(self) -> pd.DataFrame:
+        """One row per run with exploration rate, best-arm share, reward, and regret."""
+
+        best = int(np.argmax(self.estimates))
+        rewards = self.estimates[self.actions].mean(axis=1)
+        return pd.DataFrame(
+            {
+                "run": np.arange(self.actions.shape[0]),
+                "explore_rate": self.explore.mean(axis=1),
+                "best_action_share": (self.actions == best).mean(axis=1),
+                "mean_reward": rewards,
+                "regret": self.estimates[best] - rewards,
+            }
+        )
+
+    def action_shares(self) -> pd.DataFrame:
+        """Share of draws spent on each action, per run (runs x actions)."""
+
+        n_runs, n_draws = self.actions.shape
+        n_actions = self.estimates.size
+        offsets = self.actions + n_actions * np.arange(n_runs)[:, None]
+        counts = np.bincount(offsets.ravel(), minlength=n_runs * n_actions)
+        return pd.DataFrame(
+            counts.reshape(n_runs, n_actions) / n_draws,
+            columns=[f"action_{index}" for index in range(n_actions)],
+        )
+
+
+def _draw_uniforms(
+    n_actions: int, draws: int, runs: int, seed: int | np.random.Generator | None
+) -> Tuple[np.ndarray, np.ndarray]:
+    rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+    return rng.random((runs, draws)), rng.integers(0, n_actions, size=(runs, draws))
+
+
+def _epsilon_greedy_batch(
+    estimates: np.ndarray,
+    epsilon: float,
+    uniforms: np.ndarray,
+    random_actions: np.ndarray,
+) -> EpsilonGreedySimulation:
+    explore = uniforms < epsilon
+    actions = np.where(explore, random_actions, int(np.argmax(estimates)))
+    return EpsilonGreedySimulation(estimates, epsilon, actions, explore)
+
+
+def simulate_epsilon_greedy(
+    estimates: Sequence[float],
+    *,
+    epsilon: float = 0.1,
+    draws: int = 100,
+    runs: int = 1,
+    seed: int | np.random.Generator | None = None,
+) -> EpsilonGreedySimulation:
+    """Draw every exploration flag and action for ``runs`` x ``draws`` choices at once.
+
+    ``draws=0`` is allowed and yields empty ``(runs, 0)`` arrays.
+    """
+
+    values = np.asarray(estimates, dtype=float)
+    if values.size == 0:
+        raise ValueError("values must contain at least one estimate")
+    if not 0 <= epsilon <= 1:
+        raise ValueError("epsilon must be between 0 and 1")
+    if draws < 0 or runs < 1:
+        raise ValueError("draws must be non-negative and runs must be positive")
+    uniforms, random_actions = _draw_uniforms(values.size, draws, runs, seed)
+    return _epsilon_greedy_batch(values, epsilon, uniforms, random_actions)
+
+
+def epsilon_greedy_sweep(
+    estimates: Sequence[float] | Sequence[Sequence[float]],
+    epsilons: Sequence[float],
+    *,
+    draws: int = 100,
+    runs: int = 1_000,
+    seed: int | None = None,
+    quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+) -> pd.DataFrame:
+    """Summarise run-level distributions across a grid of epsilons and estimate scenarios.
+
+    ``estimates`` may be one vector of arm values or a 2-D array with one scenario
+    per row. The same random numbers are reused across the grid (common random
+    numbers), so differences between cells reflect the parameters, not noise.
+    """
+
+    scenarios = np.atleast_2d(np.asarray(estimates, dtype=float))
+    if scenarios.size == 0:
+        raise ValueError("values must contain at least one estimate")
+    if any(not 0 <= eps <= 1 for eps in epsilons):
+        raise ValueError("epsilon must be between 0 and 1")
+    uniforms, random_actions = _draw_uniforms(scenarios.shape[1], draws, runs, seed)
+    metrics = ["explore_rate", "best_action_share", "mean_reward", "regret"]
+    rows = []
+    for scenario, values in enumerate(scenarios):
+        for eps in epsilons:
+            runs_frame = _epsilon_greedy_batch(
+                values, float(eps), uniforms, random_actions
+            ).run_summary()
+            row: Dict[str, float] = {"scenario": scenario, "epsilon": float(eps)}
+            for metric in metrics:
+                column = runs_frame[metric]
+                row[f"{metric}_mean"] = float(column.mean())
+                row[f"{metric}_std"] = float(column.std(ddof=1)) if runs > 1 else 0.0
+                for q in quantiles:
+                    row[f"{metric}_p{round(q * 100):02d}"] = float(column.quantile(q))
+            rows.append(row)
+    return pd.DataFrame(rows)
 
 
 def reinforcement_learning_report(
-    estimates: Sequence[float], *, epsilon: float = 0.1, draws: int = 100, seed: int | None = None
+    estimates: Sequence[float],
+    *,
+    epsilon: float = 0.1,
+    draws: int = 100,
+    seed: int | None = None,
 ) -> pd.DataFrame:
     """Simulate epsilon-greedy choices to illustrate exploration vs exploitation."""
 
-    rng = np.random.default_rng(seed)
-    choices: List[int] = []
-    explore_flags: List[bool] = []
-    for _ in range(draws):
-        action, explore = epsilon_greedy_action(estimates, epsilon=epsilon, random_state=rng)
-        choices.append(action)
-        explore_flags.append(explore)
-    return pd.DataFrame({"action": choices, "explore": explore_flags})
+    simulation = simulate_epsilon_greedy(
+        estimates, epsilon=epsilon, draws=draws, seed=seed
+    )
+    return pd.DataFrame(
+        {"action": simulation.actions[0], "explore": simulation.explore[0]}
+    )
 
 
 if __name__ == "__main__":
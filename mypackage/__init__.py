@@ -7,6 +7,12 @@ Modules:
     - arithmetics: Basic mathematical operations for business calculations
     - greet: Business greeting and messaging functions
     - bar_system: Tools for managing bar inventory and sales
+    - bar_journal: Write-ahead journal that makes bar_system state durable
+    - bar_ledger: Columnar, time-indexed sales history for range queries and BI export
+    - bar_reorder: EWMA consumption rates and reorder suggestions for bar inventory
+    - bar_service: Asyncio JSON-lines front-end and change stream for bar_system
+    - bar_snapshot: Memory-mappable binary snapshots of bar_system state
+    - money: Integer-cents arithmetic with ROUND_HALF_UP semantics
     - bi_curriculum: Phase 5 Business Intelligence roadmap utilities
 
 Example Usage:
@@ -25,6 +31,10 @@ __author__ = "50 Days of Python Course"
 
 # Import key functions for easy access
 from .arithmetics import add_numbers, divide, multiply, power, remainder, subtract
+from .bar_journal import SalesJournal
+from .bar_ledger import SalesLedger
+from .bar_reorder import ReorderEngine
+from .bar_service import BarService
 from .bar_system import BarSystem, InventoryItem, SaleRecord
 from .bi_curriculum import (
     BiTopic,
@@ -48,6 +58,10 @@ __all__ = [
     "BarSystem",
     "InventoryItem",
     "SaleRecord",
+    "SalesJournal",
+    "SalesLedger",
+    "ReorderEngine",
+    "BarService",
     "BiTopic",
     "DEFAULT_DATA_PATH",
     "SUPPORTED_NODE_TYPES",
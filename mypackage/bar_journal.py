@@ -0,0 +1,208 @@
+"""Bitácora de escritura anticipada (WAL) para :mod:`mypackage.bar_system`.
+
+Cada mutación del inventario y cada venta se agrega como una línea JSON con
+un número de secuencia creciente. Las escrituras se agrupan: el archivo se
+sincroniza con ``os.fsync`` cuando se acumulan ``batch_size`` registros o
+cuando pasan ``flush_interval`` segundos desde la última sincronización, de
+modo que una venta no espera un viaje completo al disco. Un hilo de fondo
+revisa el intervalo aunque no lleguen más ventas, así que un registro nunca
+queda sin sincronizar más de ``flush_interval`` segundos.
+
+La recuperación lee la instantánea más reciente y reaplica solo los registros
+posteriores a su secuencia. Una última línea incompleta (por ejemplo, tras un
+corte de energía a mitad de escritura) se descarta y se trunca.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def _scan(path: Path) -> Tuple[List[Dict[str, Any]], int]:
+    """Devuelve los registros válidos y el número de bytes que ocupan."""
+
+    registros: List[Dict[str, Any]] = []
+    valido = 0
+    if not path.exists():
+        return registros, valido
+    with path.open("rb") as archivo:
+        for linea in archivo:
+            if not linea.endswith(b"\n"):
+                break
+            try:
+                registros.append(json.loads(linea))
+            except json.JSONDecodeError:
+                break
+            valido += len(linea)
+    return registros, valido
+
+
+def read_journal(path: PathLike, after_seq: int = 0) -> Iterator[Dict[str, Any]]:
+    """Itera los registros completos con secuencia mayor que ``after_seq``."""
+
+    registros, _ = _scan(Path(path))
+    for registro in registros:
+        if registro["seq"] > after_seq:
+            yield registro
+
+
+def _sincronizar_periodicamente(
+    referencia: "weakref.ReferenceType[SalesJournal]",
+    detener: threading.Event,
+    intervalo: float,
+) -> None:
+    # Solo guarda una referencia débil para no impedir que la bitácora se
+    # libere si nadie la cierra.
+    while not detener.wait(intervalo):
+        journal = referencia()
+        if journal is None:
+            return
+        journal.sync_if_due()
+        del journal
+
+
+class SalesJournal:
+    """Bitácora JSON-lines de solo anexado con sincronización por lotes."""
+
+    def __init__(
+        self,
+        path: PathLike,
+        *,
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size debe ser al menos 1.")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        registros, valido = _scan(self.path)
+        if self.path.exists() and self.path.stat().st_size > valido:
+            with self.path.open("r+b") as archivo:
+                archivo.truncate(valido)
+        self._last_seq = registros[-1]["seq"] if registros else 0
+        self._lock = threading.Lock()
+        # ``fsync`` se ejecuta fuera de ``_lock`` para que otros hilos sigan
+        # agregando registros mientras el disco confirma el lote anterior.
+        self._fsync_lock = threading.Lock()
+        self._file = self.path.open("ab")
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._detener = threading.Event()
+        self._sincronizador: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._sincronizador = threading.Thread(
+                target=_sincronizar_periodicamente,
+                args=(weakref.ref(self), self._detener, flush_interval),
+                name="sales-journal-sync",
+                daemon=True,
+            )
+            self._sincronizador.start()
+
+    @property
+    def last_seq(self) -> int:
+        """Secuencia del último registro agregado."""
+
+        return self._last_seq
+
+    @property
+    def empty(self) -> bool:
+        return self._last_seq == 0 and self.path.stat().st_size == 0
+
+    def resume_after(self, seq: int) -> None:
+        """Continúa la numeración después de ``seq`` (p. ej. la de una instantánea)."""
+
+        with self._lock:
+            self._last_seq = max(self._last_seq, seq)
+
+    def append(self, evento: Mapping[str, Any], *, sync: bool = True) -> int:
+        """Agrega un evento y sincroniza si el lote o el intervalo se cumplieron.
+
+        Con ``sync=False`` solo se escribe el registro; quien llama debe invocar
+        :meth:`sync_if_due` después de liberar sus propios candados, de modo que
+        un único ``fsync`` confirme los registros de varios hilos.
+        """
+
+        with self._lock:
+            self._last_seq += 1
+            seq = self._last_seq
+            registro = {"seq": seq, **evento}
+            linea = json.dumps(registro, separators=(",", ":"), ensure_ascii=False)
+            self._file.write(linea.encode("utf-8") + b"\n")
+            self._pending += 1
+        if sync:
+            self.sync_if_due()
+        return seq
+
+    def sync_if_due(self) -> None:
+        """Sincroniza el lote pendiente si alcanzó ``batch_size`` o venció."""
+
+        with self._lock:
+            if self._file.closed:
+                return
+            vencido = time.monotonic() - self._last_sync >= self.flush_interval
+            if not self._pending or (self._pending < self.batch_size and not vencido):
+                return
+            self._file.flush()
+            self._pending = 0
+            self._last_sync = time.monotonic()
+            archivo = self._file
+        self._fsync(archivo)
+
+    def flush(self) -> None:
+        """Fuerza la escritura y ``fsync`` de los registros pendientes."""
+
+        with self._fsync_lock, self._lock:
+            self._sync()
+
+    def _fsync(self, archivo: BinaryIO) -> None:
+        with self._fsync_lock:
+            if not archivo.closed:
+                os.fsync(archivo.fileno())
+
+    def _sync(self) -> None:
+        """Escribe y sincroniza con ``_fsync_lock`` y ``_lock`` ya tomados."""
+
+        if self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def records(self, after_seq: int = 0) -> Iterator[Dict[str, Any]]:
+        """Registros persistidos con secuencia mayor que ``after_seq``."""
+
+        self.flush()
+        return read_journal(self.path, after_seq)
+
+    def truncate(self) -> None:
+        """Vacía la bitácora tras guardar una instantánea; la secuencia continúa."""
+
+        with self._fsync_lock, self._lock:
+            self._sync()
+            self._file.close()
+            self._file = self.path.open("wb")
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._detener.set()
+        if self._sincronizador is not None:
+            self._sincronizador.join()
+        with self._fsync_lock, self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def __enter__(self) -> "SalesJournal":
+        return self
+
+    def __exit__(self, *exc_info: Optional[object]) -> None:
+        self.close()
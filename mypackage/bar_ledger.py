@@ -0,0 +1,426 @@
+"""Libro columnar de ventas indexado por tiempo para :mod:`mypackage.bar_system`.
+
+Cada línea vendida ocupa una fila en columnas ``numpy`` contiguas (marca de
+tiempo, tipo de venta, mesa, SKU, cantidad y precio), en lugar de un objeto
+por venta. Los textos repetidos (tipos, mesas y SKU) se guardan como códigos
+enteros contra un catálogo de categorías.
+
+Las ventas casi siempre llegan en orden cronológico, así que las consultas por
+rango usan ``searchsorted`` directamente sobre la columna de tiempo. Si alguna
+llega fuera de orden (por ejemplo, dos terminales que confirman casi a la
+vez), se construye una sola vez un índice ordenado que se reutiliza hasta la
+siguiente inserción.
+
+Las columnas crecen duplicando su capacidad; las filas ya escritas nunca se
+modifican, de modo que las exportaciones a pandas o Arrow comparten memoria
+con el libro en lugar de copiarla.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .money import cents_to_decimal, to_cents
+
+if TYPE_CHECKING:  # pragma: no cover - solo para anotaciones
+    import pandas as pd
+
+    from .bar_system import SaleRecord
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSEGUNDO = timedelta(microseconds=1)
+_MICROSEGUNDOS_POR_HORA = 3_600_000_000
+_SIN_MESA = -1
+
+_COLUMNAS = {
+    "fecha": np.int64,
+    "venta": np.int64,
+    "tipo": np.int32,
+    "mesa": np.int32,
+    "sku": np.int32,
+    "cantidad": np.float64,
+    "precio_centavos": np.int64,
+    "total_centavos": np.int64,
+}
+_CATEGORICAS = ("tipo", "mesa", "sku")
+AGRUPACIONES = ("tipo", "mesa", "sku", "hora")
+
+
+def _a_microsegundos(fecha: datetime) -> int:
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return (fecha - _EPOCH) // _MICROSEGUNDO
+
+
+def _desde_microsegundos(valor: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(valor))
+
+
+class _Catalogo:
+    """Asigna un código entero estable a cada valor de texto."""
+
+    def __init__(self) -> None:
+        self.valores: List[str] = []
+        self._codigos: Dict[str, int] = {}
+
+    def codigo(self, valor: str) -> int:
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = len(self.valores)
+            self._codigos[valor] = codigo
+            self.valores.append(valor)
+        return codigo
+
+    def buscar(self, valor: str) -> Optional[int]:
+        return self._codigos.get(str(valor))
+
+
+class SalesLedger:
+    """Historial de líneas de venta en columnas con índice temporal.
+
+    ``desde`` es inclusivo y ``hasta`` exclusivo en todas las consultas. Las
+    fechas sin zona horaria se interpretan como UTC.
+    """
+
+    def __init__(self, capacidad: int = 1024) -> None:
+        self._capacidad = max(int(capacidad), 1)
+        self._n = 0
+        self._columnas: Dict[str, np.ndarray] = {
+            nombre: np.empty(self._capacidad, dtype=tipo)
+            for nombre, tipo in _COLUMNAS.items()
+        }
+        self._catalogos = {nombre: _Catalogo() for nombre in _CATEGORICAS}
+        self._ventas: List[str] = []
+        self._ultimo_instante: Optional[int] = None
+        self._ordenado = True
+        self._orden: Optional[np.ndarray] = None
+        self._fechas_ordenadas: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def ventas(self) -> int:
+        """Número de ventas registradas (una venta puede tener varias filas)."""
+
+        return len(self._ventas)
+
+    def append(self, venta: "SaleRecord") -> None:
+        """Agrega una fila por cada línea de ``venta``."""
+
+        instante = _a_microsegundos(venta.fecha)
+        with self._lock:
+            filas = len(venta.lineas)
+            if self._n + filas > self._capacidad:
+                self._crecer(self._n + filas)
+            ordinal = len(self._ventas)
+            self._ventas.append(venta.identificador)
+            tipo = self._catalogos["tipo"].codigo(venta.tipo)
+            mesa = (
+                self._catalogos["mesa"].codigo(venta.mesa)
+                if venta.mesa is not None
+                else _SIN_MESA
+            )
+            columnas = self._columnas
+            for fila, linea in enumerate(venta.lineas, start=self._n):
+                columnas["fecha"][fila] = instante
+                columnas["venta"][fila] = ordinal
+                columnas["tipo"][fila] = tipo
+                columnas["mesa"][fila] = mesa
+                columnas["sku"][fila] = self._catalogos["sku"].codigo(linea.sku)
+                columnas["cantidad"][fila] = float(linea.cantidad)
+                columnas["precio_centavos"][fila] = to_cents(linea.precio_unitario)
+                columnas["total_centavos"][fila] = linea.total_centavos
+            if filas:
+                self._actualizar_orden(instante, instante, True)
+            self._n += filas
+
+    def extend(
+        self,
+        *,
+        identificadores: Sequence[str],
+        venta: np.ndarray,
+        fecha: np.ndarray,
+        tipo: np.ndarray,
+        mesa: np.ndarray,
+        sku: np.ndarray,
+        cantidad: np.ndarray,
+        precio_centavos: np.ndarray,
+        total_centavos: np.ndarray,
+        categorias: Mapping[str, Sequence[str]],
+    ) -> None:
+        """Agrega un bloque de filas que ya está en columnas.
+
+        ``venta`` indexa ``identificadores`` y los códigos de ``tipo``,
+        ``mesa`` y ``sku`` indexan ``categorias[nombre]`` (``-1`` = sin mesa).
+        Se usa al restaurar instantáneas sin volver a crear cada venta.
+        """
+
+        filas = len(venta)
+        with self._lock:
+            if self._n + filas > self._capacidad:
+                self._crecer(self._n + filas)
+            inicio, fin = self._n, self._n + filas
+            columnas = self._columnas
+            columnas["venta"][inicio:fin] = np.asarray(venta) + len(self._ventas)
+            self._ventas.extend(identificadores)
+            columnas["fecha"][inicio:fin] = fecha
+            for nombre, codigos in (("tipo", tipo), ("mesa", mesa), ("sku", sku)):
+                # El último elemento traduce el código -1 (sin mesa) a sí mismo.
+                traduccion = np.array(
+                    [
+                        self._catalogos[nombre].codigo(valor)
+                        for valor in categorias[nombre]
+                    ]
+                    + [_SIN_MESA],
+                    dtype=np.int32,
+                )
+                columnas[nombre][inicio:fin] = traduccion[codigos]
+            columnas["cantidad"][inicio:fin] = cantidad
+            columnas["precio_centavos"][inicio:fin] = precio_centavos
+            columnas["total_centavos"][inicio:fin] = total_centavos
+            if filas:
+                fecha = np.asarray(fecha)
+                self._actualizar_orden(
+                    int(fecha.min()),
+                    int(fecha.max()),
+                    bool(np.all(fecha[1:] >= fecha[:-1])),
+                )
+            self._n = fin
+
+    def _actualizar_orden(self, minimo: int, maximo: int, ordenado: bool) -> None:
+        if not ordenado or (
+            self._ultimo_instante is not None and minimo < self._ultimo_instante
+        ):
+            self._ordenado = False
+        if self._ultimo_instante is None or maximo > self._ultimo_instante:
+            self._ultimo_instante = maximo
+        self._orden = None
+
+    def _crecer(self, minimo: int) -> None:
+        capacidad = self._capacidad
+        while capacidad < minimo:
+            capacidad *= 2
+        for nombre, columna in self._columnas.items():
+            nueva = np.empty(capacidad, dtype=columna.dtype)
+            nueva[: self._n] = columna[: self._n]
+            self._columnas[nombre] = nueva
+        self._capacidad = capacidad
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def column(self, nombre: str) -> np.ndarray:
+        """Vista de solo lectura de la columna ``nombre`` (orden de inserción)."""
+
+        vista = self._columnas[nombre][: self._n]
+        vista.flags.writeable = False
+        return vista
+
+    def categories(self, nombre: str) -> List[str]:
+        """Valores correspondientes a los códigos de ``tipo``, ``mesa`` o ``sku``."""
+
+        return list(self._catalogos[nombre].valores)
+
+    def select(
+        self,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        *,
+        tipo: Optional[str] = None,
+        mesa: Optional[Any] = None,
+        sku: Optional[str] = None,
+    ) -> np.ndarray:
+        """Posiciones de las filas que cumplen los filtros, en orden cronológico."""
+
+        with self._lock:
+            n = self._n
+            ordenadas = self._columnas["fecha"][:n]
+            orden = None
+            if not self._ordenado:
+                if self._orden is None:
+                    self._orden = np.argsort(ordenadas, kind="stable")
+                    self._fechas_ordenadas = ordenadas[self._orden]
+                orden, ordenadas = self._orden, self._fechas_ordenadas
+            columnas = {nombre: self._columnas[nombre][:n] for nombre in _CATEGORICAS}
+        inicio = (
+            0
+            if desde is None
+            else int(np.searchsorted(ordenadas, _a_microsegundos(desde), side="left"))
+        )
+        fin = (
+            n
+            if hasta is None
+            else int(np.searchsorted(ordenadas, _a_microsegundos(hasta), side="left"))
+        )
+        filas = (
+            np.arange(inicio, max(inicio, fin))
+            if orden is None
+            else orden[inicio : max(inicio, fin)]
+        )
+        for nombre, valor in (("tipo", tipo), ("mesa", mesa), ("sku", sku)):
+            if valor is None:
+                continue
+            codigo = self._catalogos[nombre].buscar(valor)
+            if codigo is None:
+                return filas[:0]
+            filas = filas[columnas[nombre][filas] == codigo]
+        return filas
+
+    def totals_by(
+        self,
+        clave: str,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        *,
+        tipo: Optional[str] = None,
+        mesa: Optional[Any] = None,
+        sku: Optional[str] = None,
+    ) -> Dict[Any, Decimal]:
+        """Ingresos por ``tipo``, ``mesa``, ``sku`` u ``hora`` dentro del rango."""
+
+        return {
+            grupo: cents_to_decimal(int(monto))
+            for grupo, monto in self._agrupar(
+                clave, "total_centavos", desde, hasta, tipo=tipo, mesa=mesa, sku=sku
+            ).items()
+        }
+
+    def quantities_by(
+        self,
+        clave: str,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+        *,
+        tipo: Optional[str] = None,
+        mesa: Optional[Any] = None,
+        sku: Optional[str] = None,
+    ) -> Dict[Any, float]:
+        """Unidades vendidas por ``tipo``, ``mesa``, ``sku`` u ``hora``."""
+
+        return {
+            grupo: float(cantidad)
+            for grupo, cantidad in self._agrupar(
+                clave, "cantidad", desde, hasta, tipo=tipo, mesa=mesa, sku=sku
+            ).items()
+        }
+
+    def _agrupar(
+        self,
+        clave: str,
+        valor: str,
+        desde: Optional[datetime],
+        hasta: Optional[datetime],
+        **filtros: Any,
+    ) -> Dict[Any, Any]:
+        if clave not in AGRUPACIONES:
+            raise ValueError(f"Agrupación no soportada: {clave}.")
+        filas = self.select(desde, hasta, **filtros)
+        valores = self._columnas[valor][filas]
+        if clave == "hora":
+            codigos = self._columnas["fecha"][filas] // _MICROSEGUNDOS_POR_HORA
+        else:
+            codigos = self._columnas[clave][filas]
+        grupos, inverso = np.unique(codigos, return_inverse=True)
+        acumulado = np.zeros(len(grupos), dtype=valores.dtype)
+        np.add.at(acumulado, inverso, valores)
+        if clave == "hora":
+            etiquetas = [
+                _desde_microsegundos(grupo * _MICROSEGUNDOS_POR_HORA)
+                for grupo in grupos
+            ]
+        else:
+            catalogo = self._catalogos[clave].valores
+            etiquetas = [
+                None if grupo == _SIN_MESA else catalogo[grupo] for grupo in grupos
+            ]
+        return dict(zip(etiquetas, acumulado))
+
+    def sale_positions(
+        self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None
+    ) -> List[int]:
+        """Ordinales de las ventas con líneas dentro del rango, sin repetir."""
+
+        ordinales = self._columnas["venta"][self.select(desde, hasta)]
+        return [int(ordinal) for ordinal in dict.fromkeys(ordinales.tolist())]
+
+    # ------------------------------------------------------------------
+    # Exportación
+    # ------------------------------------------------------------------
+    def to_pandas(self) -> "pd.DataFrame":
+        """Exporta el libro como :class:`pandas.DataFrame`.
+
+        Las columnas numéricas y ``fecha`` (``datetime64[us]`` en UTC, sin zona
+        para no copiar) son vistas sobre la memoria del libro; ``tipo``,
+        ``mesa``, ``sku`` y ``venta`` se exponen como categorías construidas a
+        partir de los códigos.
+        """
+
+        import pandas as pd
+
+        with self._lock:
+            n = self._n
+            columnas = {
+                nombre: columna[:n] for nombre, columna in self._columnas.items()
+            }
+            catalogos = {
+                nombre: list(cat.valores) for nombre, cat in self._catalogos.items()
+            }
+            ventas = list(self._ventas)
+        datos: Dict[str, Any] = {
+            "fecha": columnas["fecha"].view("M8[us]"),
+            "venta": pd.Categorical.from_codes(columnas["venta"], categories=ventas),
+        }
+        for nombre in _CATEGORICAS:
+            datos[nombre] = pd.Categorical.from_codes(
+                columnas[nombre], categories=catalogos[nombre]
+            )
+        for nombre in ("cantidad", "precio_centavos", "total_centavos"):
+            datos[nombre] = columnas[nombre]
+        return pd.DataFrame(datos, copy=False)
+
+    def to_arrow(self) -> Any:
+        """Exporta el libro como ``pyarrow.Table`` sin copiar las columnas numéricas.
+
+        Requiere el paquete opcional ``pyarrow``.
+        """
+
+        try:
+            import pyarrow as pa
+        except ImportError as exc:  # pragma: no cover - depende del entorno
+            raise ImportError(
+                "SalesLedger.to_arrow requiere el paquete pyarrow."
+            ) from exc
+
+        with self._lock:
+            n = self._n
+            columnas = {
+                nombre: columna[:n] for nombre, columna in self._columnas.items()
+            }
+            catalogos = {
+                nombre: list(cat.valores) for nombre, cat in self._catalogos.items()
+            }
+            ventas = list(self._ventas)
+        arreglos = {
+            "fecha": pa.Array.from_buffers(
+                pa.timestamp("us", tz="UTC"), n, [None, pa.py_buffer(columnas["fecha"])]
+            ),
+            "venta": pa.DictionaryArray.from_arrays(
+                pa.array(columnas["venta"]), pa.array(ventas, type=pa.string())
+            ),
+        }
+        for nombre in _CATEGORICAS:
+            codigos = columnas[nombre]
+            arreglos[nombre] = pa.DictionaryArray.from_arrays(
+                pa.array(codigos, mask=codigos == _SIN_MESA),
+                pa.array(catalogos[nombre], type=pa.string()),
+            )
+        for nombre in ("cantidad", "precio_centavos", "total_centavos"):
+            arreglos[nombre] = pa.array(columnas[nombre])
+        return pa.table(arreglos)
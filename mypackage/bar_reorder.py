@@ -0,0 +1,244 @@
+"""Predicción de quiebres de stock y sugerencias de reposición.
+
+El motor mantiene, por SKU, una tasa de consumo exponencialmente ponderada
+en el tiempo: cada consumo de ``q`` unidades actualiza
+
+    tasa = tasa · exp(-Δt / τ) + q / τ
+
+donde ``τ`` se deriva de la vida media configurada. La actualización es O(1)
+y no necesita recorrer el historial; la tasa estimada converge al ritmo real
+de consumo (unidades por segundo) y olvida los turnos viejos.
+
+Con la tasa y las existencias se predice cuándo se agota cada SKU. Una cola de
+prioridad (``heapq``) ordena los SKU por el momento en que hay que pedir
+(agotamiento menos plazo de entrega), de modo que registrar un consumo cuesta
+O(log n) y consultar las sugerencias solo toca los SKU que vencen, sin
+recorrer todo el catálogo. Las entradas obsoletas del heap se descartan al
+salir (invalidación perezosa por versión).
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+DecimalLike = Union[str, int, float, Decimal]
+
+
+@dataclass(frozen=True, slots=True)
+class ReorderSuggestion:
+    """SKU que conviene reponer ahora para no quebrar stock."""
+
+    sku: str
+    existencias: Decimal
+    consumo_por_hora: float
+    agotamiento: Optional[datetime]
+    pedir_antes_de: Optional[datetime]
+    cantidad_sugerida: Decimal
+
+
+@dataclass(slots=True)
+class _SkuRate:
+    existencias: Decimal = Decimal("0")
+    tasa: float = 0.0  # unidades por segundo
+    ultimo: Optional[float] = None
+    version: int = 0
+
+
+def _a_decimal(valor: DecimalLike) -> Decimal:
+    return valor if isinstance(valor, Decimal) else Decimal(str(valor))
+
+
+def _segundos(fecha: Optional[datetime]) -> float:
+    if fecha is None:
+        fecha = datetime.now(tz=timezone.utc)
+    elif fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return fecha.timestamp()
+
+
+def _fecha(segundos: float) -> Optional[datetime]:
+    if math.isinf(segundos):
+        return None
+    return datetime.fromtimestamp(segundos, tz=timezone.utc)
+
+
+class ReorderEngine:
+    """Tasas de consumo EWMA por SKU y cola de prioridad de reposición.
+
+    ``plazo_entrega`` es el tiempo que tarda en llegar un pedido (se puede
+    fijar por SKU con ``plazos``) y ``cobertura`` el tiempo adicional que
+    debe cubrir la cantidad sugerida. ``vida_media`` controla cuánto pesa el
+    consumo reciente frente al antiguo.
+    """
+
+    def __init__(
+        self,
+        *,
+        vida_media: timedelta = timedelta(hours=6),
+        plazo_entrega: timedelta = timedelta(hours=24),
+        cobertura: timedelta = timedelta(days=3),
+        plazos: Optional[Mapping[str, timedelta]] = None,
+    ) -> None:
+        if vida_media <= timedelta(0):
+            raise ValueError("La vida media debe ser positiva.")
+        self._tau = vida_media.total_seconds() / math.log(2)
+        self.plazo_entrega = plazo_entrega
+        self.cobertura = cobertura
+        self._plazos = {
+            str(sku): plazo.total_seconds() for sku, plazo in (plazos or {}).items()
+        }
+        self._skus: Dict[str, _SkuRate] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._skus)
+
+    # ------------------------------------------------------------------
+    # Actualizaciones incrementales
+    # ------------------------------------------------------------------
+    def record_consumption(
+        self,
+        sku: str,
+        cantidad: DecimalLike,
+        existencias: DecimalLike,
+        fecha: Optional[datetime] = None,
+    ) -> None:
+        """Registra un consumo de ``cantidad`` y las existencias que quedaron."""
+
+        instante = _segundos(fecha)
+        with self._lock:
+            estado = self._skus.setdefault(sku, _SkuRate())
+            estado.tasa = self._tasa_en(estado, instante) + float(cantidad) / self._tau
+            estado.ultimo = instante
+            estado.existencias = _a_decimal(existencias)
+            self._reprogramar(sku, estado, instante)
+
+    def update_stock(
+        self, sku: str, existencias: DecimalLike, fecha: Optional[datetime] = None
+    ) -> None:
+        """Actualiza las existencias (alta o reposición) sin tocar la tasa."""
+
+        instante = _segundos(fecha)
+        with self._lock:
+            estado = self._skus.setdefault(sku, _SkuRate())
+            estado.existencias = _a_decimal(existencias)
+            self._reprogramar(sku, estado, instante)
+
+    def consumption_rate(self, sku: str, fecha: Optional[datetime] = None) -> float:
+        """Consumo estimado en unidades por hora en ``fecha``."""
+
+        with self._lock:
+            estado = self._skus.get(sku)
+            if estado is None:
+                return 0.0
+            return self._tasa_en(estado, _segundos(fecha)) * 3600
+
+    def _tasa_en(self, estado: _SkuRate, instante: float) -> float:
+        if estado.ultimo is None:
+            return 0.0
+        transcurrido = max(instante - estado.ultimo, 0.0)
+        return estado.tasa * math.exp(-transcurrido / self._tau)
+
+    def _plazo(self, sku: str) -> float:
+        return self._plazos.get(sku, self.plazo_entrega.total_seconds())
+
+    def _agotamiento(self, estado: _SkuRate, instante: float) -> float:
+        """Momento estimado de quiebre manteniendo la tasa actual."""
+
+        if estado.existencias <= 0:
+            return instante
+        tasa = self._tasa_en(estado, instante)
+        if tasa <= 0:
+            return math.inf
+        return instante + float(estado.existencias) / tasa
+
+    def _reprogramar(self, sku: str, estado: _SkuRate, instante: float) -> None:
+        estado.version += 1
+        clave = self._agotamiento(estado, instante) - self._plazo(sku)
+        if not math.isinf(clave):
+            heapq.heappush(self._heap, (clave, estado.version, sku))
+        # Las entradas obsoletas solo se descartan al salir; si dominan el
+        # heap se reconstruye para acotar la memoria.
+        if len(self._heap) > 4 * len(self._skus) + 64:
+            self._heap = [
+                entrada
+                for entrada in self._heap
+                if self._skus[entrada[2]].version == entrada[1]
+            ]
+            heapq.heapify(self._heap)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def next_due(self) -> Optional[Tuple[str, datetime]]:
+        """SKU con la fecha de pedido más próxima, sin recalcular la tasa."""
+
+        with self._lock:
+            while self._heap:
+                clave, version, sku = self._heap[0]
+                if self._skus[sku].version == version:
+                    return sku, _fecha(clave)
+                heapq.heappop(self._heap)
+        return None
+
+    def suggestions(
+        self, fecha: Optional[datetime] = None, horizonte: timedelta = timedelta(0)
+    ) -> List[ReorderSuggestion]:
+        """SKU que hay que pedir antes de ``fecha + horizonte``, los más urgentes primero.
+
+        La clave del heap se calculó con la tasa vigente en la última
+        actualización. Como la tasa solo decae entre consumos, esa clave es una
+        cota inferior: los candidatos se recalculan al salir y los que ya no
+        vencen se reprograman con su fecha actual.
+        """
+
+        instante = _segundos(fecha)
+        limite = instante + horizonte.total_seconds()
+        sugerencias: List[ReorderSuggestion] = []
+        vigentes: List[Tuple[float, int, str]] = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= limite:
+                _, version, sku = heapq.heappop(self._heap)
+                estado = self._skus[sku]
+                if estado.version != version:
+                    continue
+                agotamiento = self._agotamiento(estado, instante)
+                clave = agotamiento - self._plazo(sku)
+                if clave > limite:
+                    if not math.isinf(clave):
+                        heapq.heappush(self._heap, (clave, version, sku))
+                    continue
+                vigentes.append((clave, version, sku))
+                sugerencias.append(
+                    self._sugerencia(sku, estado, instante, agotamiento, clave)
+                )
+            for entrada in vigentes:
+                heapq.heappush(self._heap, entrada)
+        return sugerencias
+
+    def _sugerencia(
+        self,
+        sku: str,
+        estado: _SkuRate,
+        instante: float,
+        agotamiento: float,
+        clave: float,
+    ) -> ReorderSuggestion:
+        tasa = self._tasa_en(estado, instante)
+        objetivo = tasa * (self._plazo(sku) + self.cobertura.total_seconds())
+        faltante = max(objetivo - max(float(estado.existencias), 0.0), 0.0)
+        return ReorderSuggestion(
+            sku=sku,
+            existencias=estado.existencias,
+            consumo_por_hora=tasa * 3600,
+            agotamiento=_fecha(agotamiento),
+            pedir_antes_de=_fecha(clave),
+            cantidad_sugerida=Decimal(math.ceil(faltante)),
+        )
@@ -0,0 +1,476 @@
+"""Servicio asíncrono JSON-lines sobre :class:`~mypackage.bar_system.BarSystem`.
+
+Varias terminales se conectan por TCP o por un socket Unix y envían un objeto
+JSON por línea::
+
+    {"id": 7, "op": "venta_rapida", "items": {"CERV": 2}}
+
+y reciben la respuesta con el mismo ``id``::
+
+    {"id": 7, "ok": true, "resultado": {...}}
+
+Todas las operaciones pasan por una única cola atendida por una sola tarea
+escritora, de modo que el sistema nunca recibe dos comandos a la vez. Cada
+comando se ejecuta en un hilo auxiliar para que un ``fsync`` de la bitácora no
+detenga el bucle de eventos.
+
+Con ``{"op": "suscribir"}`` la conexión recibe además un flujo de cambios con
+número de secuencia: ventas (``venta``), existencias de los SKU afectados
+(``stock``) y alertas cuando un SKU cae por debajo de su umbral
+(``stock_bajo``). Un suscriptor que no consume a tiempo recibe ``desbordado``
+y se da de baja; debe volver a suscribirse y pedir ``estado_inventario``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from decimal import Decimal
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .bar_system import (
+    BarSystem,
+    DecimalLike,
+    SaleRecord,
+    _item_a_dict,
+    _linea_a_dict,
+    _normalizar_items,
+    _to_decimal,
+    _venta_a_dict,
+)
+
+_Resultado = Tuple[Any, List[SaleRecord], List[str]]
+_LIMITE_LINEA = 1 << 20
+
+
+def _venta_rapida(sistema: BarSystem, datos: Mapping[str, Any]) -> _Resultado:
+    venta = sistema.venta_rapida(datos["items"], nota=datos.get("nota"))
+    return _venta_a_dict(venta), [venta], [linea.sku for linea in venta.lineas]
+
+
+def _agregar_consumo_mesa(sistema: BarSystem, datos: Mapping[str, Any]) -> _Resultado:
+    lineas = sistema.agregar_consumo_mesa(datos["mesa"], datos["items"])
+    return (
+        [_linea_a_dict(linea) for linea in lineas],
+        [],
+        [linea.sku for linea in lineas],
+    )
+
+
+def _abrir_mesa(sistema: BarSystem, datos: Mapping[str, Any]) -> _Resultado:
+    sistema.abrir_mesa(datos["mesa"])
+    return None, [], []
+
+
+def _cerrar_mesa(sistema: BarSystem, datos: Mapping[str, Any]) -> _Resultado:
+    venta = sistema.cerrar_mesa(datos["mesa"])
+    return _venta_a_dict(venta), [venta], []
+
+
+def _consumir_insumo(sistema: BarSystem, datos: Mapping[str, Any]) -> _Resultado:
+    sistema.consumir_insumo(datos["items"], nota=datos.get("nota"))
+    return None, [], [sku for sku, _ in _normalizar_items(datos["items"])]
+
+
+def _procesar_pedidos(sistema: BarSystem, datos: Mapping[str, Any]) -> _Resultado:
+    resultado = sistema.procesar_pedidos(
+        datos["pedidos"], todo_o_nada=bool(datos.get("todo_o_nada", False))
+    )
+    respuesta = []
+    ventas: List[SaleRecord] = []
+    skus: List[str] = []
+    for pedido in resultado.pedidos:
+        respuesta.append(
+            {
+                "posicion": pedido.posicion,
+                "aceptado": pedido.aceptado,
+                "error": pedido.error,
+                "mesa": pedido.mesa,
+                "venta": _venta_a_dict(pedido.venta) if pedido.venta else None,
+            }
+        )
+        if pedido.venta is not None:
+            ventas.append(pedido.venta)
+        skus.extend(linea.sku for linea in pedido.lineas)
+    return respuesta, ventas, skus
+
+
+def _reabastecer(sistema: BarSystem, datos: Mapping[str, Any]) -> _Resultado:
+    item = sistema.reabastecer(datos["sku"], datos["cantidad"])
+    return _item_a_dict(item), [], [item.sku]
+
+
+def _agregar_item(sistema: BarSystem, datos: Mapping[str, Any]) -> _Resultado:
+    item = sistema.agregar_item_inventario(
+        datos["sku"],
+        datos["nombre"],
+        datos["precio_unitario"],
+        datos["cantidad_inicial"],
+        unidad_medida=datos.get("unidad_medida", "unidades"),
+        tipo=datos.get("tipo", "producto"),
+    )
+    return _item_a_dict(item), [], [item.sku]
+
+
+def _obtener_item(sistema: BarSystem, datos: Mapping[str, Any]) -> _Resultado:
+    return _item_a_dict(sistema.obtener_item(datos["sku"])), [], []
+
+
+def _estado_inventario(sistema: BarSystem, datos: Mapping[str, Any]) -> _Resultado:
+    return [_item_a_dict(item) for item in sistema.estado_inventario()], [], []
+
+
+def _resumen_ventas(sistema: BarSystem, datos: Mapping[str, Any]) -> _Resultado:
+    return str(sistema.resumen_ventas()), [], []
+
+
+def _mesas_abiertas(sistema: BarSystem, datos: Mapping[str, Any]) -> _Resultado:
+    return sistema.mesas_abiertas(), [], []
+
+
+COMANDOS: Dict[str, Callable[[BarSystem, Mapping[str, Any]], _Resultado]] = {
+    "venta_rapida": _venta_rapida,
+    "agregar_consumo_mesa": _agregar_consumo_mesa,
+    "abrir_mesa": _abrir_mesa,
+    "cerrar_mesa": _cerrar_mesa,
+    "consumir_insumo": _consumir_insumo,
+    "procesar_pedidos": _procesar_pedidos,
+    "reabastecer": _reabastecer,
+    "agregar_item_inventario": _agregar_item,
+    "obtener_item": _obtener_item,
+    "estado_inventario": _estado_inventario,
+    "resumen_ventas": _resumen_ventas,
+    "mesas_abiertas": _mesas_abiertas,
+}
+
+
+def _motivo(exc: Exception) -> str:
+    return str(exc.args[0]) if exc.args else type(exc).__name__
+
+
+async def _leer_linea(reader: asyncio.StreamReader) -> Tuple[bytes, bool]:
+    """Lee una línea; si supera el límite del lector la descarta completa.
+
+    Devuelve la línea (``b""`` al final del flujo) y si se descartó por larga.
+    """
+
+    descartada = False
+    while True:
+        try:
+            linea = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as exc:
+            return (b"" if descartada else exc.partial), descartada
+        except asyncio.LimitOverrunError as exc:
+            descartada = True
+            await reader.readexactly(exc.consumed)
+            continue
+        return (b"" if descartada else linea), descartada
+
+
+class CommandError(Exception):
+    """Un comando fue rechazado por el sistema o estaba mal formado."""
+
+
+class Subscription:
+    """Flujo de eventos de un suscriptor; se itera con ``async for``."""
+
+    def __init__(self, maxsize: int) -> None:
+        # Dos lugares como mínimo: el aviso de desbordamiento y el fin del flujo.
+        self._cola: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(
+            max(maxsize, 2)
+        )
+        self.activa = True
+
+    def _entregar(self, evento: Dict[str, Any]) -> bool:
+        """Encola ``evento``; devuelve ``False`` si el suscriptor se desbordó."""
+
+        try:
+            self._cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            while not self._cola.empty():
+                self._cola.get_nowait()
+            self._cola.put_nowait({"evento": "desbordado", "seq": evento["seq"]})
+            self._terminar()
+            return False
+        return True
+
+    def _terminar(self) -> None:
+        if self.activa:
+            self.activa = False
+            if self._cola.full():
+                # Quien se da de baja ya no espera eventos pendientes.
+                self._cola.get_nowait()
+            self._cola.put_nowait(None)
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        """Siguiente evento, o ``None`` cuando la suscripción terminó."""
+
+        return await self._cola.get()
+
+    def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        return self._iterar()
+
+    async def _iterar(self) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            evento = await self._cola.get()
+            if evento is None:
+                return
+            yield evento
+
+
+class BarService:
+    """Front-end asíncrono con un único escritor y flujo de cambios.
+
+    ``umbrales`` fija el nivel de alerta por SKU; los demás usan
+    ``umbral_stock_bajo``. La alerta ``stock_bajo`` se emite una vez al cruzar
+    el umbral y se rearma cuando un reabastecimiento lo supera de nuevo.
+    """
+
+    def __init__(
+        self,
+        sistema: BarSystem,
+        *,
+        umbral_stock_bajo: DecimalLike = 0,
+        umbrales: Optional[Mapping[str, DecimalLike]] = None,
+        max_pendientes: int = 10_000,
+    ) -> None:
+        self.sistema = sistema
+        self.umbral_stock_bajo = _to_decimal(umbral_stock_bajo)
+        self.umbrales = {
+            str(sku): _to_decimal(valor) for sku, valor in (umbrales or {}).items()
+        }
+        self._max_pendientes = max_pendientes
+        self._cola: Optional[asyncio.Queue] = None
+        self._escritor: Optional[asyncio.Task] = None
+        self._servidores: List[asyncio.AbstractServer] = []
+        self._suscripciones: Set[Subscription] = set()
+        self._alertados: Set[str] = set()
+        self._seq = 0
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+    async def start(self) -> None:
+        if self._escritor is None:
+            self._cola = asyncio.Queue(self._max_pendientes)
+            self._escritor = asyncio.create_task(self._atender_cola())
+
+    async def close(self) -> None:
+        for servidor in self._servidores:
+            servidor.close()
+            await servidor.wait_closed()
+        self._servidores.clear()
+        if self._escritor is not None:
+            self._escritor.cancel()
+            try:
+                await self._escritor
+            except asyncio.CancelledError:
+                pass
+            self._escritor = None
+        while self._cola is not None and not self._cola.empty():
+            _, _, futuro = self._cola.get_nowait()
+            if not futuro.done():
+                futuro.set_exception(CommandError("El servicio se cerró."))
+        for suscripcion in list(self._suscripciones):
+            self.unsubscribe(suscripcion)
+
+    async def __aenter__(self) -> "BarService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Optional[object]) -> None:
+        await self.close()
+
+    # ------------------------------------------------------------------
+    # API en proceso
+    # ------------------------------------------------------------------
+    async def submit(self, op: str, **datos: Any) -> Any:
+        """Encola un comando y espera su resultado serializable en JSON.
+
+        Lanza :class:`CommandError` si el sistema rechaza la operación.
+        """
+
+        if op not in COMANDOS:
+            raise CommandError(f"Operación desconocida: {op}.")
+        await self.start()
+        futuro: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        await self._cola.put((op, datos, futuro))
+        return await futuro
+
+    def subscribe(self, maxsize: int = 1_000) -> Subscription:
+        suscripcion = Subscription(maxsize)
+        self._suscripciones.add(suscripcion)
+        return suscripcion
+
+    def unsubscribe(self, suscripcion: Subscription) -> None:
+        self._suscripciones.discard(suscripcion)
+        suscripcion._terminar()
+
+    # ------------------------------------------------------------------
+    # Escritor único y flujo de cambios
+    # ------------------------------------------------------------------
+    async def _atender_cola(self) -> None:
+        while True:
+            op, datos, futuro = await self._cola.get()
+            try:
+                respuesta, ventas, skus = await asyncio.to_thread(
+                    COMANDOS[op], self.sistema, datos
+                )
+            except asyncio.CancelledError:
+                # ``close`` interrumpió la espera; el hilo puede terminar el
+                # comando, pero nadie publicará su resultado.
+                if not futuro.done():
+                    futuro.set_exception(
+                        CommandError(
+                            "El servicio se cerró antes de confirmar la operación."
+                        )
+                    )
+                raise
+            except (KeyError, TypeError, ValueError) as exc:
+                if not futuro.done():
+                    futuro.set_exception(CommandError(_motivo(exc)))
+                continue
+            except Exception as exc:  # noqa: BLE001 - el escritor no debe morir
+                if not futuro.done():
+                    futuro.set_exception(exc)
+                continue
+            if not futuro.done():
+                futuro.set_result(respuesta)
+            if self._suscripciones:
+                self._publicar(ventas, skus)
+            else:
+                self._actualizar_alertas(skus)
+
+    def _publicar(self, ventas: Iterable[SaleRecord], skus: Iterable[str]) -> None:
+        for venta in ventas:
+            self._emitir({"evento": "venta", "venta": _venta_a_dict(venta)})
+        for sku, cantidad, alerta in self._actualizar_alertas(skus):
+            self._emitir({"evento": "stock", "sku": sku, "cantidad": str(cantidad)})
+            if alerta:
+                self._emitir(
+                    {
+                        "evento": "stock_bajo",
+                        "sku": sku,
+                        "cantidad": str(cantidad),
+                        "umbral": str(self._umbral(sku)),
+                    }
+                )
+
+    def _actualizar_alertas(
+        self, skus: Iterable[str]
+    ) -> List[Tuple[str, Decimal, bool]]:
+        """Existencias de los SKU afectados y si cada uno acaba de cruzar su umbral."""
+
+        cambios = []
+        for sku in dict.fromkeys(skus):
+            cantidad = self.sistema.obtener_item(sku).cantidad
+            bajo = cantidad <= self._umbral(sku)
+            alerta = bajo and sku not in self._alertados
+            if bajo:
+                self._alertados.add(sku)
+            else:
+                self._alertados.discard(sku)
+            cambios.append((sku, cantidad, alerta))
+        return cambios
+
+    def _umbral(self, sku: str) -> Decimal:
+        return self.umbrales.get(sku, self.umbral_stock_bajo)
+
+    def _emitir(self, evento: Dict[str, Any]) -> None:
+        self._seq += 1
+        evento["seq"] = self._seq
+        for suscripcion in list(self._suscripciones):
+            if not suscripcion._entregar(evento):
+                self._suscripciones.discard(suscripcion)
+
+    # ------------------------------------------------------------------
+    # Transporte JSON-lines
+    # ------------------------------------------------------------------
+    async def serve_tcp(
+        self, host: str = "127.0.0.1", port: int = 0
+    ) -> asyncio.AbstractServer:
+        """Atiende terminales por TCP; ``port=0`` elige un puerto libre."""
+
+        await self.start()
+        servidor = await asyncio.start_server(
+            self._atender_conexion, host, port, limit=_LIMITE_LINEA
+        )
+        self._servidores.append(servidor)
+        return servidor
+
+    async def serve_unix(self, path: str) -> asyncio.AbstractServer:
+        """Atiende terminales locales por un socket Unix en ``path``."""
+
+        await self.start()
+        servidor = await asyncio.start_unix_server(
+            self._atender_conexion, path, limit=_LIMITE_LINEA
+        )
+        self._servidores.append(servidor)
+        return servidor
+
+    async def _atender_conexion(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        candado = asyncio.Lock()
+        suscripcion: Optional[Subscription] = None
+        bombeo: Optional[asyncio.Task] = None
+
+        async def enviar(mensaje: Mapping[str, Any]) -> None:
+            linea = json.dumps(mensaje, separators=(",", ":"), ensure_ascii=False)
+            async with candado:
+                writer.write(linea.encode("utf-8") + b"\n")
+                await writer.drain()
+
+        async def reenviar(flujo: Subscription) -> None:
+            async for evento in flujo:
+                await enviar(evento)
+
+        try:
+            while True:
+                linea, descartada = await _leer_linea(reader)
+                if descartada:
+                    error = f"La línea supera el límite de {_LIMITE_LINEA} bytes."
+                    await enviar({"id": None, "ok": False, "error": error})
+                    continue
+                if not linea:
+                    break
+                identificador: Union[int, str, None] = None
+                try:
+                    solicitud = json.loads(linea)
+                    if not isinstance(solicitud, dict):
+                        raise CommandError("La solicitud debe ser un objeto JSON.")
+                    identificador = solicitud.pop("id", None)
+                    op = solicitud.pop("op")
+                    if op == "suscribir":
+                        if suscripcion is None:
+                            suscripcion = self.subscribe()
+                            bombeo = asyncio.create_task(reenviar(suscripcion))
+                        respuesta: Any = {"seq": self._seq}
+                    else:
+                        respuesta = await self.submit(op, **solicitud)
+                except (CommandError, KeyError, TypeError, ValueError) as exc:
+                    await enviar(
+                        {"id": identificador, "ok": False, "error": _motivo(exc)}
+                    )
+                    continue
+                await enviar({"id": identificador, "ok": True, "resultado": respuesta})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if suscripcion is not None:
+                self.unsubscribe(suscripcion)
+            if bombeo is not None:
+                bombeo.cancel()
+            writer.close()
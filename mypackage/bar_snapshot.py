@@ -0,0 +1,262 @@
+"""Instantáneas binarias del estado de :class:`~mypackage.bar_system.BarSystem`.
+
+Formato de archivo (todos los enteros en orden de bytes nativo)::
+
+    MAGIC (8 bytes) | largo del encabezado (uint64) | encabezado JSON
+    | relleno hasta 64 bytes | arreglos numpy alineados a 64 bytes
+
+El encabezado guarda lo pequeño (inventario, mesas abiertas, catálogos de
+textos) y el directorio de arreglos. Las ventas se guardan en columnas: una
+fila por venta (fecha, tipo, mesa, nota, primera línea) y una por línea
+(SKU, nombre, cantidad, precio, total en centavos). Los textos repetidos se
+codifican contra catálogos, de modo que las cantidades y los precios se
+recuperan exactos como :class:`~decimal.Decimal`.
+
+Al leer, los arreglos se mapean en memoria (``mmap``) sin copiarlos ni
+interpretarlos. Una instantánea incremental contiene solo las ventas
+posteriores a la anterior (``desde``); una cadena base + incrementales
+reconstruye el historial completo.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .bar_journal import PathLike
+from .bar_ledger import _a_microsegundos, _Catalogo
+
+MAGIC = b"BARSNAP1"
+FORMAT_VERSION = 1
+_ALINEACION = 64
+_LARGO = struct.Struct("=Q")
+_SIN_VALOR = -1
+
+_CATALOGOS = ("tipos", "mesas", "notas", "skus", "nombres", "cantidades", "precios")
+
+
+def _alinear(posicion: int) -> int:
+    return -(-posicion // _ALINEACION) * _ALINEACION
+
+
+@dataclass(frozen=True, slots=True)
+class SalesBlock:
+    """Ventas de una instantánea en columnas; los códigos refieren a ``catalogos``.
+
+    ``desde`` es el ordinal de la primera venta del bloque dentro del
+    historial completo. ``inicio_lineas`` tiene una posición más que ventas:
+    las líneas de la venta ``i`` son ``inicio_lineas[i]:inicio_lineas[i + 1]``.
+    """
+
+    desde: int
+    catalogos: Mapping[str, Tuple[str, ...]]
+    fecha: np.ndarray
+    tipo: np.ndarray
+    mesa: np.ndarray
+    nota: np.ndarray
+    inicio_lineas: np.ndarray
+    sku: np.ndarray
+    nombre: np.ndarray
+    cantidad: np.ndarray
+    precio: np.ndarray
+    total_centavos: np.ndarray
+    ids_datos: np.ndarray
+    ids_inicio: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.fecha)
+
+    def identificadores(self) -> List[str]:
+        datos = self.ids_datos.tobytes()
+        limites = self.ids_inicio.tolist()
+        return [
+            datos[inicio:fin].decode("utf-8")
+            for inicio, fin in zip(limites, limites[1:])
+        ]
+
+    def venta_de_linea(self) -> np.ndarray:
+        """Posición (dentro del bloque) de la venta de cada línea."""
+
+        return np.repeat(
+            np.arange(len(self), dtype=np.int64), np.diff(self.inicio_lineas)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """Contenido de un archivo de instantánea binaria."""
+
+    secuencia: int
+    moneda: str
+    inventario: List[Dict[str, str]]
+    mesas: Dict[str, Optional[List[Dict[str, str]]]]
+    ventas: SalesBlock
+
+
+def encode_sales(
+    ventas: Sequence[Any],
+) -> Tuple[Dict[str, np.ndarray], Dict[str, List[str]]]:
+    """Convierte registros de venta en columnas y catálogos de textos."""
+
+    catalogos = {nombre: _Catalogo() for nombre in _CATALOGOS}
+    tipos, mesas, notas, skus, nombres, cantidades, precios = (
+        catalogos[nombre] for nombre in _CATALOGOS
+    )
+    por_venta: Dict[str, List[int]] = {
+        "fecha": [],
+        "tipo": [],
+        "mesa": [],
+        "nota": [],
+        "inicio_lineas": [0],
+    }
+    por_linea: Dict[str, List[int]] = {
+        "sku": [],
+        "nombre": [],
+        "cantidad": [],
+        "precio": [],
+        "total_centavos": [],
+    }
+    ids: List[bytes] = []
+    for venta in ventas:
+        por_venta["fecha"].append(_a_microsegundos(venta.fecha))
+        por_venta["tipo"].append(tipos.codigo(venta.tipo))
+        por_venta["mesa"].append(
+            _SIN_VALOR if venta.mesa is None else mesas.codigo(venta.mesa)
+        )
+        por_venta["nota"].append(
+            _SIN_VALOR if venta.nota is None else notas.codigo(venta.nota)
+        )
+        ids.append(venta.identificador.encode("utf-8"))
+        for linea in venta.lineas:
+            por_linea["sku"].append(skus.codigo(linea.sku))
+            por_linea["nombre"].append(nombres.codigo(linea.nombre))
+            por_linea["cantidad"].append(cantidades.codigo(str(linea.cantidad)))
+            por_linea["precio"].append(precios.codigo(str(linea.precio_unitario)))
+            por_linea["total_centavos"].append(linea.total_centavos)
+        por_venta["inicio_lineas"].append(len(por_linea["sku"]))
+
+    arreglos = {
+        "fecha": np.array(por_venta["fecha"], dtype=np.int64),
+        "tipo": np.array(por_venta["tipo"], dtype=np.int32),
+        "mesa": np.array(por_venta["mesa"], dtype=np.int32),
+        "nota": np.array(por_venta["nota"], dtype=np.int32),
+        "inicio_lineas": np.array(por_venta["inicio_lineas"], dtype=np.int64),
+        "sku": np.array(por_linea["sku"], dtype=np.int32),
+        "nombre": np.array(por_linea["nombre"], dtype=np.int32),
+        "cantidad": np.array(por_linea["cantidad"], dtype=np.int32),
+        "precio": np.array(por_linea["precio"], dtype=np.int32),
+        "total_centavos": np.array(por_linea["total_centavos"], dtype=np.int64),
+        "ids_datos": np.frombuffer(b"".join(ids), dtype=np.uint8),
+        "ids_inicio": np.concatenate(
+            ([0], np.cumsum([len(valor) for valor in ids], dtype=np.int64))
+        ).astype(np.int64),
+    }
+    return arreglos, {nombre: cat.valores for nombre, cat in catalogos.items()}
+
+
+def write_snapshot(
+    path: PathLike,
+    *,
+    secuencia: int,
+    moneda: str,
+    inventario: List[Dict[str, str]],
+    mesas: Mapping[str, Optional[List[Dict[str, str]]]],
+    ventas: Sequence[Any],
+    desde: int = 0,
+) -> None:
+    """Escribe la instantánea de forma atómica (archivo temporal + ``os.replace``)."""
+
+    arreglos, catalogos = encode_sales(ventas)
+    directorio: Dict[str, List[Any]] = {}
+    posicion = 0
+    for nombre, arreglo in arreglos.items():
+        directorio[nombre] = [arreglo.dtype.str, posicion, len(arreglo)]
+        posicion = _alinear(posicion + arreglo.nbytes)
+    encabezado = json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "secuencia": secuencia,
+            "moneda": moneda,
+            "inventario": inventario,
+            "mesas": dict(mesas),
+            "desde": desde,
+            "catalogos": catalogos,
+            "arreglos": directorio,
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    inicio_datos = _alinear(len(MAGIC) + _LARGO.size + len(encabezado))
+
+    destino = os.fspath(path)
+    temporal = f"{destino}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(MAGIC + _LARGO.pack(len(encabezado)) + encabezado)
+        for nombre, arreglo in arreglos.items():
+            archivo.seek(inicio_datos + directorio[nombre][1])
+            archivo.write(arreglo.tobytes())
+        archivo.truncate(inicio_datos + posicion)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, destino)
+
+
+def is_snapshot(path: PathLike) -> bool:
+    """Indica si ``path`` es una instantánea binaria (por su firma)."""
+
+    with open(path, "rb") as archivo:
+        return archivo.read(len(MAGIC)) == MAGIC
+
+
+def read_snapshot(path: PathLike, *, use_mmap: bool = True) -> Snapshot:
+    """Lee una instantánea; con ``use_mmap`` los arreglos apuntan al archivo mapeado.
+
+    El mapeo sigue siendo válido aunque el archivo se reemplace después con
+    :func:`write_snapshot`, porque ``os.replace`` no modifica el archivo
+    original.
+    """
+
+    with open(path, "rb") as archivo:
+        if archivo.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} no es una instantánea binaria de BarSystem.")
+        (largo,) = _LARGO.unpack(archivo.read(_LARGO.size))
+        encabezado = json.loads(archivo.read(largo))
+        if encabezado["version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"Versión de instantánea no soportada: {encabezado['version']}."
+            )
+        buffer: Union[mmap.mmap, bytes]
+        if use_mmap and Path(path).stat().st_size:
+            buffer = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            archivo.seek(0)
+            buffer = archivo.read()
+    inicio_datos = _alinear(len(MAGIC) + _LARGO.size + largo)
+    arreglos = {
+        nombre: np.frombuffer(
+            buffer, dtype=np.dtype(tipo), count=cantidad, offset=inicio_datos + posicion
+        )
+        for nombre, (tipo, posicion, cantidad) in encabezado["arreglos"].items()
+    }
+    bloque = SalesBlock(
+        desde=encabezado["desde"],
+        catalogos={
+            nombre: tuple(valores)
+            for nombre, valores in encabezado["catalogos"].items()
+        },
+        **arreglos,
+    )
+    return Snapshot(
+        secuencia=encabezado["secuencia"],
+        moneda=encabezado["moneda"],
+        inventario=encabezado["inventario"],
+        mesas=encabezado["mesas"],
+        ventas=bloque,
+    )
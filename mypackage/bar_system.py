@@ -12,10 +12,18 @@ mostrarse en interfaces gráficas.
 
 from __future__ import annotations
 
+import json
+import os
+import threading
+from collections.abc import Sequence as SequenceABC
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass, field, replace
-from datetime import datetime, timezone
-from decimal import ROUND_HALF_UP, Decimal
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 from typing import (
+    Any,
+    ContextManager,
+    Dict,
     Iterable,
     Iterator,
     List,
@@ -28,6 +36,14 @@ from typing import (
 )
 from uuid import uuid4
 
+import numpy as np
+
+from .bar_journal import PathLike, SalesJournal, read_journal
+from .bar_ledger import _EPOCH, _MICROSEGUNDOS_POR_HORA, SalesLedger
+from .bar_reorder import ReorderEngine
+from .bar_snapshot import SalesBlock, is_snapshot, read_snapshot, write_snapshot
+from .money import cents_to_decimal, line_total_cents, to_cents
+
 DecimalLike = Union[str, int, float, Decimal]
 
 
@@ -39,13 +55,26 @@ def _to_decimal(value: DecimalLike) -> Decimal:
     return Decimal(str(value))
 
 
-def _quantize_currency(value: Decimal) -> Decimal:
-    """Redondea un valor monetario a dos decimales usando ``ROUND_HALF_UP``."""
+def _validar_reposicion(cantidad: DecimalLike) -> Decimal:
+    incremento = _to_decimal(cantidad)
+    if incremento <= 0:
+        raise ValueError("La cantidad a reponer debe ser mayor que cero.")
+    return incremento
 
-    return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+def _validar_consumo(sku: str, disponible: Decimal, cantidad: DecimalLike) -> Decimal:
+    decremento = _to_decimal(cantidad)
+    if decremento <= 0:
+        raise ValueError("La cantidad a consumir debe ser mayor que cero.")
+    if decremento > disponible:
+        raise ValueError(
+            f"Stock insuficiente para {sku}: disponible {disponible}, "
+            f"solicitado {decremento}."
+        )
+    return decremento
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class InventoryItem:
     """Representa un artículo del inventario de productos o insumos."""
 
@@ -55,30 +84,70 @@ class InventoryItem:
     cantidad: Decimal
     unidad_medida: str = "unidades"
     tipo: str = "producto"  # producto o insumo
+    unidad_precio_centavos: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "unidad_precio_centavos", to_cents(self.unidad_precio))
 
     def restock(self, cantidad: DecimalLike) -> "InventoryItem":
         """Retorna una copia con la cantidad incrementada."""
 
-        incremento = _to_decimal(cantidad)
-        if incremento <= 0:
-            raise ValueError("La cantidad a reponer debe ser mayor que cero.")
-        return replace(self, cantidad=self.cantidad + incremento)
+        return replace(self, cantidad=self.cantidad + _validar_reposicion(cantidad))
 
     def consume(self, cantidad: DecimalLike) -> "InventoryItem":
         """Retorna una copia con la cantidad decrementada."""
 
-        decremento = _to_decimal(cantidad)
-        if decremento <= 0:
-            raise ValueError("La cantidad a consumir debe ser mayor que cero.")
-        if decremento > self.cantidad:
-            raise ValueError(
-                f"Stock insuficiente para {self.sku}: disponible {self.cantidad}, "
-                f"solicitado {decremento}."
-            )
+        decremento = _validar_consumo(self.sku, self.cantidad, cantidad)
         return replace(self, cantidad=self.cantidad - decremento)
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True)
+class _StockEntry:
+    """Fila interna y mutable del inventario.
+
+    Reponer o vender modifica ``cantidad`` en el mismo objeto en lugar de
+    crear un :class:`InventoryItem` nuevo por operación; las copias inmutables
+    se generan solo cuando se publican (``obtener_item``, ``estado_inventario``).
+    """
+
+    sku: str
+    nombre: str
+    unidad_precio: Decimal
+    cantidad: Decimal
+    unidad_medida: str
+    tipo: str
+    unidad_precio_centavos: int
+
+    @classmethod
+    def desde_item(cls, item: InventoryItem) -> "_StockEntry":
+        return cls(
+            item.sku,
+            item.nombre,
+            item.unidad_precio,
+            item.cantidad,
+            item.unidad_medida,
+            item.tipo,
+            item.unidad_precio_centavos,
+        )
+
+    def a_item(self) -> InventoryItem:
+        return InventoryItem(
+            sku=self.sku,
+            nombre=self.nombre,
+            unidad_precio=self.unidad_precio,
+            cantidad=self.cantidad,
+            unidad_medida=self.unidad_medida,
+            tipo=self.tipo,
+        )
+
+    def restock(self, cantidad: DecimalLike) -> None:
+        self.cantidad += _validar_reposicion(cantidad)
+
+    def consume(self, cantidad: DecimalLike) -> None:
+        self.cantidad -= _validar_consumo(self.sku, self.cantidad, cantidad)
+
+
+@dataclass(frozen=True, slots=True)
 class SaleLine:
     """Detalle de un producto vendido."""
 
@@ -86,13 +155,23 @@ class SaleLine:
     nombre: str
     cantidad: Decimal
     precio_unitario: Decimal
+    total_centavos: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # El total se calcula una sola vez en centavos enteros; ``total``
+        # conserva la API ``Decimal`` con el mismo redondeo ``ROUND_HALF_UP``.
+        object.__setattr__(
+            self,
+            "total_centavos",
+            line_total_cents(self.precio_unitario, self.cantidad),
+        )
 
     @property
     def total(self) -> Decimal:
-        return _quantize_currency(self.precio_unitario * self.cantidad)
+        return cents_to_decimal(self.total_centavos)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SaleRecord:
     """Representa una venta realizada en el bar."""
 
@@ -102,14 +181,78 @@ class SaleRecord:
     lineas: Tuple[SaleLine, ...]
     mesa: Optional[str] = None
     nota: Optional[str] = None
+    total_centavos: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "total_centavos", sum(linea.total_centavos for linea in self.lineas)
+        )
+
+    @property
+    def total(self) -> Decimal:
+        return cents_to_decimal(self.total_centavos)
+
+
+@dataclass(frozen=True, slots=True)
+class SkuSalesSummary:
+    """Acumulado de unidades e ingresos vendidos de un SKU."""
+
+    sku: str
+    cantidad: Decimal
+    ingresos: Decimal
+
+
+@dataclass(frozen=True, slots=True)
+class OrderResult:
+    """Resultado de un pedido procesado dentro de un lote."""
+
+    posicion: int
+    lineas: Tuple[SaleLine, ...] = ()
+    venta: Optional[SaleRecord] = None
+    mesa: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def aceptado(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True, slots=True)
+class BulkOrderResult:
+    """Resultados de :meth:`BarSystem.procesar_pedidos` en el orden de entrada."""
+
+    pedidos: Tuple[OrderResult, ...]
+
+    @property
+    def aceptados(self) -> List[OrderResult]:
+        return [pedido for pedido in self.pedidos if pedido.aceptado]
+
+    @property
+    def rechazados(self) -> List[OrderResult]:
+        return [pedido for pedido in self.pedidos if not pedido.aceptado]
 
     @property
     def total(self) -> Decimal:
-        monto = sum((linea.total for linea in self.lineas), Decimal("0"))
-        return _quantize_currency(monto)
+        """Importe de las líneas aceptadas (ventas rápidas y consumos de mesa)."""
+
+        return cents_to_decimal(
+            sum(
+                linea.total_centavos
+                for pedido in self.pedidos
+                for linea in pedido.lineas
+            )
+        )
+
+
+ItemsLike = Union[Mapping[str, DecimalLike], Sequence[Tuple[str, DecimalLike]]]
+_PedidoPreparado = Tuple[
+    int, Optional["TableSession"], Optional[str], List[Tuple[str, Decimal]]
+]
 
+_TIPOS_FACTURABLES = frozenset({"rapida", "mesa"})
 
-@dataclass
+
+@dataclass(slots=True)
 class TableSession:
     """Mantiene el estado de consumo de una mesa."""
 
@@ -132,22 +275,127 @@ class TableSession:
         self.lineas.clear()
 
 
+class _HistorialVentas(SequenceABC):
+    """Historial de ventas que crea bajo demanda las ventas restauradas.
+
+    Restaurar una instantánea binaria solo registra sus bloques columnares;
+    los :class:`SaleRecord` se construyen la primera vez que se consulta esa
+    parte del historial.
+    """
+
+    def __init__(self) -> None:
+        self._bloques: List[SalesBlock] = []
+        self._restauradas: List[SaleRecord] = []
+        self._n_restauradas = 0
+        self._nuevas: List[SaleRecord] = []
+
+    def agregar_bloque(self, bloque: SalesBlock) -> None:
+        if self._nuevas:
+            raise ValueError(
+                "Los bloques restaurados deben preceder a las ventas nuevas."
+            )
+        self._bloques.append(bloque)
+        self._n_restauradas += len(bloque)
+
+    def append(self, venta: SaleRecord) -> None:
+        self._nuevas.append(venta)
+
+    def __len__(self) -> int:
+        return self._n_restauradas + len(self._nuevas)
+
+    def _materializar(self) -> List[SaleRecord]:
+        for bloque in self._bloques:
+            self._restauradas.extend(_ventas_desde_bloque(bloque))
+        self._bloques.clear()
+        return self._restauradas
+
+    def __getitem__(self, indice: Any) -> Any:
+        if isinstance(indice, slice):
+            return [self[posicion] for posicion in range(len(self))[indice]]
+        posicion = range(len(self))[indice]
+        if posicion < self._n_restauradas:
+            return self._materializar()[posicion]
+        return self._nuevas[posicion - self._n_restauradas]
+
+    def __iter__(self) -> Iterator[SaleRecord]:
+        if self._n_restauradas:
+            yield from self._materializar()
+        yield from self._nuevas
+
+
 class BarSystem:
-    """Controlador principal del sistema de bar."""
+    """Controlador principal del sistema de bar.
 
-    def __init__(self, mesas: Iterable[Union[str, int]], moneda: str = "USD") -> None:
+    ``bloqueo`` elige cómo se sincronizan varias terminales. El modo
+    ``"global"`` (por defecto) serializa el stock y las mesas con un único
+    candado. El modo ``"sku"`` usa un candado por SKU y por mesa; en CPython con GIL no
+    vende más rápido (ver ``tools/benchmark_bar_system.py``) y solo conviene
+    en intérpretes sin GIL o cuando las secciones críticas esperan E/S.
+    """
+
+    def __init__(
+        self,
+        mesas: Iterable[Union[str, int]],
+        moneda: str = "USD",
+        journal: Optional[SalesJournal] = None,
+        bloqueo: str = "global",
+    ) -> None:
         mesas_iter = list(mesas)
         if not mesas_iter:
             raise ValueError(
                 "Debe proporcionar al menos una mesa para iniciar el sistema."
             )
+        if bloqueo not in {"sku", "global"}:
+            raise ValueError("El modo de bloqueo debe ser 'sku' o 'global'.")
         self.moneda = moneda
-        self._inventario: MutableMapping[str, InventoryItem] = {}
+        self._inventario: MutableMapping[str, _StockEntry] = {}
         self._mesas: MutableMapping[str, TableSession] = {
             str(identificador): TableSession(str(identificador))
             for identificador in mesas_iter
         }
-        self._ventas: List[SaleRecord] = []
+        self._ventas = _HistorialVentas()
+        # Ventas cubiertas por la última instantánea binaria; las incrementales
+        # solo escriben las posteriores.
+        self._ventas_en_snapshot = 0
+        # Copia columnar del historial para consultas por rango y exportación.
+        self._libro = SalesLedger()
+        # Motor de reposición opcional; se alimenta con cada descuento de stock.
+        # Los cambios se anotan por hilo bajo el candado del SKU y se entregan
+        # al motor (que tiene su propio candado global) una vez liberados.
+        self._reorden: Optional[ReorderEngine] = None
+        self._pendientes_reorden = threading.local()
+        # Acumulados incrementales: se actualizan al confirmar cada venta para
+        # que los reportes de cierre no dependan del número de ventas del día.
+        # Los montos se guardan en centavos enteros (ver :mod:`mypackage.money`).
+        self._totales_por_tipo: Dict[str, int] = {}
+        self._totales_mesa: Dict[str, int] = {}
+        self._cantidades_por_sku: Dict[str, Decimal] = {}
+        self._ingresos_por_sku: Dict[str, int] = {}
+        self._ingresos_por_hora: Dict[datetime, int] = {}
+        self._total_facturado = 0
+        # Varias terminales pueden compartir la instancia. El modo "global"
+        # serializa stock y mesas con un único candado. En el modo "sku" cada
+        # SKU y cada mesa tiene su propio candado y los SKU se bloquean en
+        # orden alfabético para evitar interbloqueos. En ambos modos el
+        # catálogo (altas y listados) y las ventas con sus acumulados tienen
+        # candados propios, que también toman los reportes.
+        self._bloqueo = bloqueo
+        self._candado_global = threading.RLock()
+        self._candado_catalogo = threading.Lock()
+        self._candado_ventas = threading.Lock()
+        self._candados_sku: Dict[str, threading.Lock] = {}
+        self._candados_mesa: Dict[str, threading.Lock] = {
+            identificador: threading.Lock() for identificador in self._mesas
+        }
+        self._journal: Optional[SalesJournal] = None
+        if journal is not None:
+            if not journal.empty:
+                raise ValueError(
+                    "La bitácora ya contiene eventos; use BarSystem.recuperar."
+                )
+            self._journal = journal
+            self._journal_evento("inicio", mesas=list(self._mesas), moneda=self.moneda)
+            self._confirmar_journal()
 
     # ------------------------------------------------------------------
     # Gestión de inventario
@@ -163,27 +411,38 @@ class BarSystem:
     ) -> InventoryItem:
         """Registra un nuevo artículo en el inventario."""
 
-        if sku in self._inventario:
-            raise ValueError(f"El SKU {sku} ya existe en el inventario.")
         item = InventoryItem(
             sku=str(sku),
             nombre=nombre,
-            unidad_precio=_quantize_currency(_to_decimal(precio_unitario)),
+            unidad_precio=cents_to_decimal(to_cents(precio_unitario)),
             cantidad=_to_decimal(cantidad_inicial),
             unidad_medida=unidad_medida,
             tipo=tipo,
         )
         if item.cantidad < 0:
             raise ValueError("La cantidad inicial no puede ser negativa.")
-        self._inventario[item.sku] = item
+        with self._candado_catalogo:
+            if item.sku in self._inventario:
+                raise ValueError(f"El SKU {sku} ya existe en el inventario.")
+            # Se registra antes de publicarlo para que ninguna venta del SKU
+            # llegue a la bitácora antes que su alta.
+            self._journal_evento("item", item=_item_a_dict(item))
+            self._candados_sku[item.sku] = threading.Lock()
+            self._inventario[item.sku] = _StockEntry.desde_item(item)
+            self._anotar_reorden(self._inventario[item.sku])
+        self._confirmar_journal()
         return item
 
     def reabastecer(self, sku: str, cantidad: DecimalLike) -> InventoryItem:
         """Incrementa el inventario de un artículo existente."""
 
-        item = self._obtener_item(sku)
-        actualizado = item.restock(cantidad)
-        self._inventario[item.sku] = actualizado
+        with self._bloquear_skus([str(sku)]):
+            entrada = self._obtener_item(sku)
+            entrada.restock(cantidad)
+            actualizado = entrada.a_item()
+            self._anotar_reorden(entrada)
+            self._journal_evento("reabastecer", sku=entrada.sku, cantidad=str(cantidad))
+        self._confirmar_journal()
         return actualizado
 
     def consumir_insumo(
@@ -193,24 +452,25 @@ class BarSystem:
     ) -> None:
         """Registra el uso interno de insumos sin generar una venta."""
 
-        lineas = list(self._preparar_lineas(items, tipo_requerido="insumo"))
-        # El consumo de insumos solo afecta el inventario; mantener un registro
-        # permite auditar desde ``obtener_historial_inventario``.
-        venta = SaleRecord(
-            identificador=str(uuid4()),
-            tipo="consumo",
-            fecha=datetime.now(tz=timezone.utc),
-            lineas=tuple(lineas),
-            nota=nota,
-        )
-        self._ventas.append(venta)
+        with self._reservar_lineas(items, tipo_requerido="insumo") as lineas:
+            # El consumo de insumos solo afecta el inventario; mantener un registro
+            # permite auditar desde ``obtener_historial_inventario``.
+            venta = SaleRecord(
+                identificador=str(uuid4()),
+                tipo="consumo",
+                fecha=datetime.now(tz=timezone.utc),
+                lineas=tuple(lineas),
+                nota=nota,
+            )
+            self._registrar_venta(venta)
+        self._confirmar_journal()
 
     def obtener_item(self, sku: str) -> InventoryItem:
         """Devuelve una copia inmutable del artículo solicitado."""
 
-        return replace(self._obtener_item(sku))
+        return self._obtener_item(sku).a_item()
 
-    def _obtener_item(self, sku: str) -> InventoryItem:
+    def _obtener_item(self, sku: str) -> _StockEntry:
         try:
             return self._inventario[str(sku)]
         except KeyError as exc:  # pragma: no cover - mensaje explicativo
@@ -219,32 +479,39 @@ class BarSystem:
     def estado_inventario(self) -> List[InventoryItem]:
         """Obtiene una instantánea del inventario actual."""
 
-        return [replace(item) for item in self._inventario.values()]
+        with self._candado_catalogo:
+            entradas = list(self._inventario.values())
+        return [entrada.a_item() for entrada in entradas]
 
     # ------------------------------------------------------------------
     # Gestión de mesas
     # ------------------------------------------------------------------
     def abrir_mesa(self, identificador: Union[str, int]) -> None:
         mesa = self._obtener_mesa(identificador)
-        mesa.abrir()
+        with self._bloquear_mesa(mesa):
+            mesa.abrir()
+            self._journal_evento("abrir_mesa", mesa=mesa.identificador)
+        self._confirmar_journal()
 
     def cerrar_mesa(self, identificador: Union[str, int]) -> SaleRecord:
         mesa = self._obtener_mesa(identificador)
-        if not mesa.abierta:
-            raise ValueError(f"La mesa {mesa.identificador} no está abierta.")
-        if not mesa.lineas:
-            raise ValueError(
-                f"La mesa {mesa.identificador} no tiene consumos registrados."
+        with self._bloquear_mesa(mesa):
+            if not mesa.abierta:
+                raise ValueError(f"La mesa {mesa.identificador} no está abierta.")
+            if not mesa.lineas:
+                raise ValueError(
+                    f"La mesa {mesa.identificador} no tiene consumos registrados."
+                )
+            venta = SaleRecord(
+                identificador=str(uuid4()),
+                tipo="mesa",
+                fecha=datetime.now(tz=timezone.utc),
+                lineas=tuple(mesa.lineas),
+                mesa=mesa.identificador,
             )
-        venta = SaleRecord(
-            identificador=str(uuid4()),
-            tipo="mesa",
-            fecha=datetime.now(tz=timezone.utc),
-            lineas=tuple(mesa.lineas),
-            mesa=mesa.identificador,
-        )
-        self._ventas.append(venta)
-        mesa.cerrar()
+            self._registrar_venta(venta)
+            self._liberar_mesa(mesa)
+        self._confirmar_journal()
         return venta
 
     def agregar_consumo_mesa(
@@ -253,16 +520,19 @@ class BarSystem:
         items: Union[Mapping[str, DecimalLike], Sequence[Tuple[str, DecimalLike]]],
     ) -> List[SaleLine]:
         mesa = self._obtener_mesa(identificador)
-        if not mesa.abierta:
-            mesa.abrir()
-        lineas = list(self._preparar_lineas(items))
-        mesa.lineas.extend(lineas)
-        return [replace(linea) for linea in lineas]
+        with self._reservar_lineas(items) as lineas, self._bloquear_mesa(mesa):
+            self._acumular_mesa(mesa, lineas)
+            self._journal_evento(
+                "consumo_mesa",
+                mesa=mesa.identificador,
+                lineas=[_linea_a_dict(linea) for linea in lineas],
+            )
+        self._confirmar_journal()
+        return list(lineas)
 
     def total_mesa(self, identificador: Union[str, int]) -> Decimal:
         mesa = self._obtener_mesa(identificador)
-        monto = sum((linea.total for linea in mesa.lineas), Decimal("0"))
-        return _quantize_currency(monto)
+        return cents_to_decimal(self._totales_mesa.get(mesa.identificador, 0))
 
     def mesas_abiertas(self) -> List[str]:
         return [mesa.identificador for mesa in self._mesas.values() if mesa.abierta]
@@ -275,70 +545,786 @@ class BarSystem:
         items: Union[Mapping[str, DecimalLike], Sequence[Tuple[str, DecimalLike]]],
         nota: Optional[str] = None,
     ) -> SaleRecord:
-        lineas = tuple(self._preparar_lineas(items))
-        venta = SaleRecord(
-            identificador=str(uuid4()),
-            tipo="rapida",
-            fecha=datetime.now(tz=timezone.utc),
-            lineas=lineas,
-            nota=nota,
-        )
-        self._ventas.append(venta)
+        with self._reservar_lineas(items) as lineas:
+            venta = SaleRecord(
+                identificador=str(uuid4()),
+                tipo="rapida",
+                fecha=datetime.now(tz=timezone.utc),
+                lineas=tuple(lineas),
+                nota=nota,
+            )
+            self._registrar_venta(venta)
+        self._confirmar_journal()
         return venta
 
-    def historial_ventas(self) -> List[SaleRecord]:
-        return list(self._ventas)
+    def procesar_pedidos(
+        self,
+        pedidos: Iterable[Union[ItemsLike, Mapping[str, Any]]],
+        *,
+        todo_o_nada: bool = False,
+    ) -> BulkOrderResult:
+        """Procesa un lote de pedidos con una sola reserva de inventario.
 
-    def resumen_ventas(self) -> Decimal:
-        monto = sum(
-            (venta.total for venta in self._ventas if venta.tipo in {"rapida", "mesa"}),
-            Decimal("0"),
+        Cada pedido es un mapeo SKU → cantidad (venta rápida) o un mapeo con
+        ``items`` y, opcionalmente, ``mesa`` o ``nota``. Con ``mesa`` las líneas
+        se cargan a la cuenta de la mesa como en :meth:`agregar_consumo_mesa`.
+
+        La demanda se suma por SKU antes de tomar los candados. Si el stock
+        alcanza para todo el lote, se acepta en un solo paso; si no, los pedidos
+        se asignan en orden de llegada y los que no caben se rechazan con su
+        motivo. Los pedidos aceptados se confirman juntos, sin que otra terminal
+        observe un estado intermedio. Con ``todo_o_nada`` cualquier rechazo
+        cancela el lote completo con ``ValueError``.
+        """
+
+        resultados: Dict[int, OrderResult] = {}
+        preparados: List[_PedidoPreparado] = []
+        demanda: Dict[str, Decimal] = {}
+        for posicion, pedido in enumerate(pedidos):
+            try:
+                mesa, nota, normalizados = self._preparar_pedido(pedido)
+            except (KeyError, TypeError, ValueError) as exc:
+                resultados[posicion] = OrderResult(posicion, error=_motivo(exc))
+                continue
+            preparados.append((posicion, mesa, nota, normalizados))
+            for sku, cantidad in normalizados:
+                demanda[sku] = demanda.get(sku, Decimal("0")) + cantidad
+
+        mesas = {
+            mesa.identificador: mesa for _, mesa, _, _ in preparados if mesa is not None
+        }
+        with ExitStack() as pila:
+            pila.enter_context(self._bloquear_skus(demanda))
+            for identificador in sorted(mesas):
+                pila.enter_context(self._bloquear_mesa(mesas[identificador]))
+            items = {sku: self._obtener_item(sku) for sku in demanda}
+            if all(
+                cantidad <= items[sku].cantidad for sku, cantidad in demanda.items()
+            ):
+                aceptados = preparados
+            else:
+                aceptados = self._asignar_stock(preparados, items, resultados)
+            if todo_o_nada and resultados:
+                raise ValueError(
+                    "Lote cancelado: "
+                    + "; ".join(
+                        f"pedido {posicion}: {resultado.error}"
+                        for posicion, resultado in sorted(resultados.items())
+                    )
+                )
+
+            consumido: Dict[str, Decimal] = {}
+            ventas: List[SaleRecord] = []
+            fecha = datetime.now(tz=timezone.utc)
+            for posicion, mesa, nota, normalizados in aceptados:
+                lineas = tuple(
+                    _linea_de_item(items[sku], cantidad)
+                    for sku, cantidad in normalizados
+                )
+                for sku, cantidad in normalizados:
+                    consumido[sku] = consumido.get(sku, Decimal("0")) + cantidad
+                if mesa is None:
+                    venta = SaleRecord(
+                        identificador=str(uuid4()),
+                        tipo="rapida",
+                        fecha=fecha,
+                        lineas=lineas,
+                        nota=nota,
+                    )
+                    ventas.append(venta)
+                    resultados[posicion] = OrderResult(posicion, lineas, venta=venta)
+                else:
+                    self._acumular_mesa(mesa, lineas)
+                    self._journal_evento(
+                        "consumo_mesa",
+                        mesa=mesa.identificador,
+                        lineas=[_linea_a_dict(linea) for linea in lineas],
+                    )
+                    resultados[posicion] = OrderResult(
+                        posicion, lineas, mesa=mesa.identificador
+                    )
+            self._consumir_stock(consumido)
+            self._registrar_ventas(ventas)
+        self._confirmar_journal()
+        return BulkOrderResult(
+            tuple(resultados[posicion] for posicion in sorted(resultados))
         )
-        return _quantize_currency(monto)
+
+    def historial_ventas(
+        self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None
+    ) -> List[SaleRecord]:
+        """Ventas registradas; con ``desde``/``hasta`` solo las de ese rango.
+
+        El rango se resuelve con el índice temporal del libro de ventas, sin
+        recorrer todo el historial.
+        """
+
+        with self._candado_ventas:
+            if desde is None and hasta is None:
+                return list(self._ventas)
+            return [
+                self._ventas[posicion]
+                for posicion in self._libro.sale_positions(desde, hasta)
+            ]
+
+    def activar_reorden(self, motor: Optional[ReorderEngine] = None) -> ReorderEngine:
+        """Conecta un motor de reposición alimentado por las ventas y consumos.
+
+        El motor recibe las existencias actuales de todo el inventario y, a
+        partir de ahí, cada descuento o reposición lo actualiza en O(log n).
+        Las sugerencias se consultan con ``motor.suggestions()``.
+        """
+
+        motor = motor if motor is not None else ReorderEngine()
+        with self._bloqueo_total():
+            for entrada in self._inventario.values():
+                motor.update_stock(entrada.sku, entrada.cantidad)
+            self._reorden = motor
+        return motor
+
+    @property
+    def reorden(self) -> Optional[ReorderEngine]:
+        """Motor de reposición activo, o ``None`` si no se activó."""
+
+        return self._reorden
+
+    @property
+    def libro_ventas(self) -> SalesLedger:
+        """Libro columnar con una fila por línea vendida (ver :mod:`mypackage.bar_ledger`)."""
+
+        return self._libro
+
+    def resumen_ventas(self) -> Decimal:
+        """Total facturado (ventas rápidas y de mesa) en tiempo constante."""
+
+        return cents_to_decimal(self._total_facturado)
+
+    def ventas_por_tipo(self) -> Dict[str, Decimal]:
+        """Totales acumulados por tipo de venta, incluidos los consumos internos."""
+
+        with self._candado_ventas:
+            totales = list(self._totales_por_tipo.items())
+        return {tipo: cents_to_decimal(monto) for tipo, monto in totales}
+
+    def ventas_por_sku(self) -> Dict[str, SkuSalesSummary]:
+        """Unidades e ingresos facturados por SKU."""
+
+        with self._candado_ventas:
+            acumulados = [
+                (sku, cantidad, self._ingresos_por_sku[sku])
+                for sku, cantidad in self._cantidades_por_sku.items()
+            ]
+        return {
+            sku: SkuSalesSummary(
+                sku=sku, cantidad=cantidad, ingresos=cents_to_decimal(ingresos)
+            )
+            for sku, cantidad, ingresos in acumulados
+        }
+
+    def ventas_por_hora(self) -> Dict[datetime, Decimal]:
+        """Ingresos facturados agrupados por hora (UTC) de la venta."""
+
+        with self._candado_ventas:
+            ingresos = sorted(self._ingresos_por_hora.items())
+        return {hora: cents_to_decimal(monto) for hora, monto in ingresos}
 
     # ------------------------------------------------------------------
     # Utilidades internas
     # ------------------------------------------------------------------
+    def _registrar_venta(self, venta: SaleRecord, *, journal: bool = True) -> None:
+        """Guarda la venta y actualiza los acumulados de reportes."""
+
+        self._registrar_ventas([venta], journal=journal)
+
+    def _registrar_ventas(
+        self, ventas: Iterable[SaleRecord], *, journal: bool = True
+    ) -> None:
+        with self._candado_ventas:
+            for venta in ventas:
+                self._ventas.append(venta)
+                if journal:
+                    self._journal_evento("venta", venta=_venta_a_dict(venta))
+                self._acumular_venta(venta)
+
+    def _acumular_venta(self, venta: SaleRecord) -> None:
+        self._libro.append(venta)
+        total = venta.total_centavos
+        self._totales_por_tipo[venta.tipo] = (
+            self._totales_por_tipo.get(venta.tipo, 0) + total
+        )
+        if venta.tipo not in _TIPOS_FACTURABLES:
+            return
+        self._total_facturado += total
+        hora = venta.fecha.replace(minute=0, second=0, microsecond=0)
+        self._ingresos_por_hora[hora] = self._ingresos_por_hora.get(hora, 0) + total
+        for linea in venta.lineas:
+            self._cantidades_por_sku[linea.sku] = (
+                self._cantidades_por_sku.get(linea.sku, Decimal("0")) + linea.cantidad
+            )
+            self._ingresos_por_sku[linea.sku] = (
+                self._ingresos_por_sku.get(linea.sku, 0) + linea.total_centavos
+            )
+
     def _obtener_mesa(self, identificador: Union[str, int]) -> TableSession:
         try:
             return self._mesas[str(identificador)]
         except KeyError as exc:  # pragma: no cover - mensaje explicativo
             raise KeyError(f"La mesa {identificador} no existe en el sistema.") from exc
 
-    def _preparar_lineas(
+    @contextmanager
+    def _bloquear_skus(self, skus: Iterable[str]) -> Iterator[None]:
+        """Adquiere los candados de los SKU en orden para evitar interbloqueos."""
+
+        if self._bloqueo == "global":
+            with self._candado_global:
+                yield
+            return
+        with ExitStack() as pila:
+            for sku in sorted(set(skus)):
+                try:
+                    candado = self._candados_sku[sku]
+                except KeyError as exc:
+                    raise KeyError(f"El SKU {sku} no existe en el inventario.") from exc
+                pila.enter_context(candado)
+            yield
+
+    def _bloquear_mesa(self, mesa: TableSession) -> ContextManager[bool]:
+        if self._bloqueo == "global":
+            return self._candado_global
+        return self._candados_mesa[mesa.identificador]
+
+    @contextmanager
+    def _bloqueo_total(self) -> Iterator[None]:
+        """Detiene todas las operaciones, p. ej. para una instantánea coherente."""
+
+        with ExitStack() as pila:
+            pila.enter_context(self._candado_catalogo)
+            pila.enter_context(self._bloquear_skus(list(self._candados_sku)))
+            if self._bloqueo == "sku":
+                for identificador in sorted(self._candados_mesa):
+                    pila.enter_context(self._candados_mesa[identificador])
+            pila.enter_context(self._candado_ventas)
+            yield
+
+    @contextmanager
+    def _reservar_lineas(
         self,
         items: Union[Mapping[str, DecimalLike], Sequence[Tuple[str, DecimalLike]]],
         tipo_requerido: Optional[str] = None,
-    ) -> Iterator[SaleLine]:
+    ) -> Iterator[List[SaleLine]]:
+        """Valida y descuenta el stock manteniendo bloqueados los SKU involucrados.
+
+        El cuerpo del ``with`` (registro de la venta y de la bitácora) se ejecuta
+        con los candados tomados, de modo que el orden de la bitácora respeta el
+        orden real de las mutaciones de cada SKU.
+        """
+
         normalizados = list(_normalizar_items(items))
         if not normalizados:
             raise ValueError("Debe proporcionar al menos un artículo.")
-        # Validar disponibilidad antes de afectar el inventario
-        for sku, cantidad in normalizados:
-            item = self._obtener_item(sku)
-            if tipo_requerido and item.tipo != tipo_requerido:
-                raise ValueError(
-                    f"El artículo {sku} es de tipo {item.tipo} y se requiere {tipo_requerido}."
+        with self._bloquear_skus(sku for sku, _ in normalizados):
+            # Validar disponibilidad antes de afectar el inventario
+            solicitado: Dict[str, Decimal] = {}
+            lineas: List[SaleLine] = []
+            for sku, cantidad in normalizados:
+                item = self._obtener_item(sku)
+                if tipo_requerido and item.tipo != tipo_requerido:
+                    raise ValueError(
+                        f"El artículo {sku} es de tipo {item.tipo} y se requiere {tipo_requerido}."
+                    )
+                solicitado[sku] = solicitado.get(sku, Decimal("0")) + cantidad
+                if solicitado[sku] > item.cantidad:
+                    raise ValueError(
+                        f"Stock insuficiente para {sku}: disponible {item.cantidad}, solicitado {solicitado[sku]}."
+                    )
+                lineas.append(_linea_de_item(item, cantidad))
+            self._consumir_stock(solicitado)
+            yield lineas
+
+    def _preparar_pedido(
+        self, pedido: Union[ItemsLike, Mapping[str, Any]]
+    ) -> Tuple[Optional[TableSession], Optional[str], List[Tuple[str, Decimal]]]:
+        """Normaliza un pedido del lote y valida sus SKU y su mesa."""
+
+        mesa: Optional[TableSession] = None
+        nota: Optional[str] = None
+        items = pedido
+        if isinstance(pedido, Mapping) and "items" in pedido:
+            items = pedido["items"]
+            nota = pedido.get("nota")
+            if pedido.get("mesa") is not None:
+                mesa = self._obtener_mesa(pedido["mesa"])
+        normalizados = list(_normalizar_items(items))
+        if not normalizados:
+            raise ValueError("Debe proporcionar al menos un artículo.")
+        for sku, _ in normalizados:
+            self._obtener_item(sku)
+        return mesa, nota, normalizados
+
+    def _asignar_stock(
+        self,
+        preparados: Sequence[_PedidoPreparado],
+        items: Mapping[str, _StockEntry],
+        resultados: Dict[int, OrderResult],
+    ) -> List[_PedidoPreparado]:
+        """Asigna el stock en orden de llegada y rechaza los pedidos que no caben."""
+
+        disponible = {sku: item.cantidad for sku, item in items.items()}
+        aceptados: List[_PedidoPreparado] = []
+        for preparado in preparados:
+            posicion, mesa, _, normalizados = preparado
+            solicitado: Dict[str, Decimal] = {}
+            for sku, cantidad in normalizados:
+                solicitado[sku] = solicitado.get(sku, Decimal("0")) + cantidad
+            faltante = next(
+                (
+                    sku
+                    for sku, cantidad in solicitado.items()
+                    if cantidad > disponible[sku]
+                ),
+                None,
+            )
+            if faltante is not None:
+                resultados[posicion] = OrderResult(
+                    posicion,
+                    mesa=mesa.identificador if mesa is not None else None,
+                    error=(
+                        f"Stock insuficiente para {faltante}: disponible "
+                        f"{disponible[faltante]}, solicitado {solicitado[faltante]}."
+                    ),
+                )
+                continue
+            for sku, cantidad in solicitado.items():
+                disponible[sku] -= cantidad
+            aceptados.append(preparado)
+        return aceptados
+
+    def _descontar_inventario(self, lineas: Iterable[SaleLine]) -> None:
+        solicitado: Dict[str, Decimal] = {}
+        for linea in lineas:
+            solicitado[linea.sku] = (
+                solicitado.get(linea.sku, Decimal("0")) + linea.cantidad
+            )
+        self._consumir_stock(solicitado)
+
+    def _consumir_stock(self, solicitado: Mapping[str, Decimal]) -> None:
+        """Descuenta la demanda ya validada con una sola copia por SKU."""
+
+        for sku, cantidad in solicitado.items():
+            entrada = self._obtener_item(sku)
+            entrada.consume(cantidad)
+            self._anotar_reorden(entrada, cantidad)
+
+    def _anotar_reorden(
+        self, entrada: _StockEntry, consumido: Optional[Decimal] = None
+    ) -> None:
+        """Deja pendiente para el motor de reposición un cambio de existencias."""
+
+        if self._reorden is None:
+            return
+        pendientes = getattr(self._pendientes_reorden, "cambios", None)
+        if pendientes is None:
+            pendientes = self._pendientes_reorden.cambios = []
+        pendientes.append((entrada, consumido))
+
+    def _notificar_reorden(self) -> None:
+        """Entrega al motor los cambios anotados por este hilo.
+
+        Se llama sin candados de SKU: el motor serializa sus propias
+        actualizaciones y así no alarga las secciones críticas del inventario.
+        Las existencias se leen al notificar, de modo que la última
+        notificación de un SKU siempre deja su valor más reciente aunque los
+        hilos lleguen al motor en otro orden.
+        """
+
+        pendientes = getattr(self._pendientes_reorden, "cambios", None)
+        motor = self._reorden
+        if not pendientes or motor is None:
+            return
+        self._pendientes_reorden.cambios = []
+        for entrada, consumido in pendientes:
+            if consumido is None:
+                motor.update_stock(entrada.sku, entrada.cantidad)
+            else:
+                motor.record_consumption(entrada.sku, consumido, entrada.cantidad)
+
+    def _acumular_mesa(self, mesa: TableSession, lineas: Sequence[SaleLine]) -> None:
+        if not mesa.abierta:
+            mesa.abrir()
+        mesa.lineas.extend(lineas)
+        acumulado = self._totales_mesa.get(mesa.identificador, 0)
+        self._totales_mesa[mesa.identificador] = acumulado + sum(
+            linea.total_centavos for linea in lineas
+        )
+
+    def _liberar_mesa(self, mesa: TableSession) -> None:
+        mesa.cerrar()
+        self._totales_mesa.pop(mesa.identificador, None)
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------
+    def _journal_evento(self, op: str, **datos: Any) -> None:
+        if self._journal is not None:
+            self._journal.append({"op": op, **datos}, sync=False)
+
+    def _confirmar_journal(self) -> None:
+        """Sincroniza la bitácora por lotes una vez liberados los candados.
+
+        También entrega al motor de reposición los cambios de stock anotados
+        durante la operación.
+        """
+
+        self._notificar_reorden()
+        if self._journal is not None:
+            self._journal.sync_if_due()
+
+    def _aplicar_evento(self, evento: Mapping[str, Any]) -> None:
+        """Reaplica un evento de la bitácora sin volver a registrarlo."""
+
+        op = evento["op"]
+        if op == "inicio":
+            return
+        if op == "item":
+            item = _item_desde_dict(evento["item"])
+            self._candados_sku[item.sku] = threading.Lock()
+            self._inventario[item.sku] = _StockEntry.desde_item(item)
+        elif op == "reabastecer":
+            self._obtener_item(evento["sku"]).restock(evento["cantidad"])
+        elif op == "abrir_mesa":
+            self._obtener_mesa(evento["mesa"]).abrir()
+        elif op == "consumo_mesa":
+            lineas = [_linea_desde_dict(linea) for linea in evento["lineas"]]
+            self._descontar_inventario(lineas)
+            self._acumular_mesa(self._obtener_mesa(evento["mesa"]), lineas)
+        elif op == "venta":
+            venta = _venta_desde_dict(evento["venta"])
+            if venta.tipo == "mesa":
+                self._liberar_mesa(self._obtener_mesa(venta.mesa))
+            else:
+                self._descontar_inventario(venta.lineas)
+            self._registrar_venta(venta, journal=False)
+        else:
+            raise ValueError(f"Evento de bitácora desconocido: {op}")
+
+    def _estado_a_dict(self) -> Dict[str, Any]:
+        return {
+            **self._estado_basico(),
+            "ventas": [_venta_a_dict(venta) for venta in self._ventas],
+        }
+
+    def _estado_basico(self) -> Dict[str, Any]:
+        """Todo el estado salvo el historial de ventas."""
+
+        return {
+            "version": 1,
+            "secuencia": self._journal.last_seq if self._journal else 0,
+            "moneda": self.moneda,
+            "inventario": [_item_a_dict(item) for item in self._inventario.values()],
+            "mesas": {
+                mesa.identificador: [_linea_a_dict(linea) for linea in mesa.lineas]
+                if mesa.abierta
+                else None
+                for mesa in self._mesas.values()
+            },
+        }
+
+    @classmethod
+    def _desde_estado(cls, estado: Mapping[str, Any]) -> "BarSystem":
+        sistema = cls(mesas=list(estado["mesas"]), moneda=estado["moneda"])
+        for datos in estado["inventario"]:
+            item = _item_desde_dict(datos)
+            sistema._candados_sku[item.sku] = threading.Lock()
+            sistema._inventario[item.sku] = _StockEntry.desde_item(item)
+        for identificador, lineas in estado["mesas"].items():
+            if lineas is not None:
+                sistema._acumular_mesa(
+                    sistema._mesas[identificador],
+                    [_linea_desde_dict(linea) for linea in lineas],
                 )
-            if cantidad > item.cantidad:
+        for datos in estado["ventas"]:
+            sistema._registrar_venta(_venta_desde_dict(datos), journal=False)
+        return sistema
+
+    def guardar_snapshot(self, path: PathLike) -> int:
+        """Escribe una instantánea atómica y vacía la bitácora asociada.
+
+        Devuelve la secuencia de bitácora cubierta por la instantánea.
+        """
+
+        with self._bloqueo_total():
+            if self._journal is not None:
+                self._journal.flush()
+            estado = self._estado_a_dict()
+            destino = os.fspath(path)
+            temporal = f"{destino}.tmp"
+            with open(temporal, "w", encoding="utf-8") as archivo:
+                json.dump(estado, archivo, ensure_ascii=False)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, destino)
+            if self._journal is not None:
+                self._journal.truncate()
+        return estado["secuencia"]
+
+    def guardar_snapshot_binario(
+        self, path: PathLike, *, incremental: bool = False
+    ) -> int:
+        """Escribe una instantánea binaria (ver :mod:`mypackage.bar_snapshot`).
+
+        Con ``incremental`` solo se guardan las ventas posteriores a la última
+        instantánea binaria; para restaurar se necesita la cadena completa,
+        desde la base hasta el último incremento. Vacía la bitácora asociada y
+        devuelve la secuencia cubierta.
+        """
+
+        with self._bloqueo_total():
+            if self._journal is not None:
+                self._journal.flush()
+            estado = self._estado_basico()
+            desde = self._ventas_en_snapshot if incremental else 0
+            write_snapshot(
+                path,
+                secuencia=estado["secuencia"],
+                moneda=estado["moneda"],
+                inventario=estado["inventario"],
+                mesas=estado["mesas"],
+                ventas=self._ventas[desde:],
+                desde=desde,
+            )
+            self._ventas_en_snapshot = len(self._ventas)
+            if self._journal is not None:
+                self._journal.truncate()
+        return estado["secuencia"]
+
+    @classmethod
+    def restaurar_snapshot(
+        cls, rutas: Union[PathLike, Sequence[PathLike]], *, use_mmap: bool = True
+    ) -> "BarSystem":
+        """Restaura una instantánea binaria o una cadena base + incrementales.
+
+        Los acumulados y el libro de ventas se reconstruyen con operaciones
+        vectorizadas sobre las columnas mapeadas; las ventas individuales se
+        crean recién cuando se consulta el historial.
+        """
+
+        if isinstance(rutas, (str, os.PathLike)):
+            rutas = [rutas]
+        sistema, _ = cls._desde_instantaneas(list(rutas), use_mmap=use_mmap)
+        return sistema
+
+    @classmethod
+    def _desde_instantaneas(
+        cls, rutas: Sequence[PathLike], *, use_mmap: bool = True
+    ) -> Tuple["BarSystem", int]:
+        instantaneas = [read_snapshot(ruta, use_mmap=use_mmap) for ruta in rutas]
+        if not instantaneas:
+            raise ValueError("Debe indicar al menos una instantánea.")
+        ultima = instantaneas[-1]
+        sistema = cls._desde_estado(
+            {
+                "moneda": ultima.moneda,
+                "inventario": ultima.inventario,
+                "mesas": ultima.mesas,
+                "ventas": [],
+            }
+        )
+        for instantanea in instantaneas:
+            bloque = instantanea.ventas
+            if bloque.desde != len(sistema._ventas):
                 raise ValueError(
-                    f"Stock insuficiente para {sku}: disponible {item.cantidad}, solicitado {cantidad}."
+                    f"La instantánea comienza en la venta {bloque.desde}, pero la "
+                    f"cadena anterior cubre {len(sistema._ventas)} ventas."
                 )
+            sistema._restaurar_bloque(bloque)
+        sistema._ventas_en_snapshot = len(sistema._ventas)
+        return sistema, ultima.secuencia
+
+    def _restaurar_bloque(self, bloque: SalesBlock) -> None:
+        """Equivalente vectorizado de ``_registrar_ventas`` para un bloque."""
 
-        lineas: List[SaleLine] = []
-        for sku, cantidad in normalizados:
-            item = self._obtener_item(sku)
-            actualizado = item.consume(cantidad)
-            self._inventario[item.sku] = actualizado
-            lineas.append(
-                SaleLine(
-                    sku=item.sku,
-                    nombre=item.nombre,
-                    cantidad=_to_decimal(cantidad),
-                    precio_unitario=item.unidad_precio,
+        if not len(bloque):
+            return
+        catalogos = bloque.catalogos
+        venta_de_linea = bloque.venta_de_linea()
+        total_venta = np.zeros(len(bloque), dtype=np.int64)
+        np.add.at(total_venta, venta_de_linea, bloque.total_centavos)
+        with self._candado_ventas:
+            self._ventas.agregar_bloque(bloque)
+            self._libro.extend(
+                identificadores=bloque.identificadores(),
+                venta=venta_de_linea,
+                fecha=bloque.fecha[venta_de_linea],
+                tipo=bloque.tipo[venta_de_linea],
+                mesa=bloque.mesa[venta_de_linea],
+                sku=bloque.sku,
+                cantidad=np.array(
+                    [float(valor) for valor in catalogos["cantidades"]],
+                    dtype=np.float64,
+                )[bloque.cantidad],
+                precio_centavos=np.array(
+                    [to_cents(Decimal(valor)) for valor in catalogos["precios"]],
+                    dtype=np.int64,
+                )[bloque.precio],
+                total_centavos=bloque.total_centavos,
+                categorias={
+                    "tipo": catalogos["tipos"],
+                    "mesa": catalogos["mesas"],
+                    "sku": catalogos["skus"],
+                },
+            )
+            for codigo, tipo in enumerate(catalogos["tipos"]):
+                monto = int(total_venta[bloque.tipo == codigo].sum())
+                self._totales_por_tipo[tipo] = (
+                    self._totales_por_tipo.get(tipo, 0) + monto
+                )
+
+            facturables = np.isin(
+                bloque.tipo,
+                [
+                    codigo
+                    for codigo, tipo in enumerate(catalogos["tipos"])
+                    if tipo in _TIPOS_FACTURABLES
+                ],
+            )
+            self._total_facturado += int(total_venta[facturables].sum())
+            horas, por_hora = _sumar_por_grupo(
+                bloque.fecha[facturables] // _MICROSEGUNDOS_POR_HORA,
+                total_venta[facturables],
+            )
+            for hora, monto in zip(horas, por_hora):
+                clave = _EPOCH + timedelta(microseconds=hora * _MICROSEGUNDOS_POR_HORA)
+                self._ingresos_por_hora[clave] = (
+                    self._ingresos_por_hora.get(clave, 0) + monto
                 )
+
+            lineas = facturables[venta_de_linea]
+            skus = bloque.sku[lineas].astype(np.int64)
+            codigos, ingresos = _sumar_por_grupo(skus, bloque.total_centavos[lineas])
+            for codigo, monto in zip(codigos, ingresos):
+                sku = catalogos["skus"][codigo]
+                self._ingresos_por_sku[sku] = self._ingresos_por_sku.get(sku, 0) + monto
+            # Las cantidades siguen siendo Decimal exactos: se cuenta cada par
+            # (SKU, cantidad) y se multiplica en lugar de sumar línea por línea.
+            distintas = len(catalogos["cantidades"])
+            pares, veces = np.unique(
+                skus * distintas + bloque.cantidad[lineas], return_counts=True
             )
-        return iter(lineas)
+            for par, repeticiones in zip(pares.tolist(), veces.tolist()):
+                sku = catalogos["skus"][par // distintas]
+                cantidad = Decimal(catalogos["cantidades"][par % distintas])
+                self._cantidades_por_sku[sku] = (
+                    self._cantidades_por_sku.get(sku, Decimal("0"))
+                    + cantidad * repeticiones
+                )
+
+    @classmethod
+    def recuperar(
+        cls,
+        journal_path: PathLike,
+        snapshot_path: Union[PathLike, Sequence[PathLike], None] = None,
+        *,
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+    ) -> "BarSystem":
+        """Reconstruye el sistema desde la instantánea y la bitácora posterior.
+
+        ``snapshot_path`` puede ser una instantánea JSON (:meth:`guardar_snapshot`),
+        una binaria o una cadena de binarias (:meth:`guardar_snapshot_binario`).
+        El sistema devuelto sigue escribiendo en la misma bitácora.
+        """
+
+        secuencia = 0
+        sistema: Optional[BarSystem] = None
+        rutas = _rutas_instantanea(snapshot_path)
+        if rutas and is_snapshot(rutas[0]):
+            sistema, secuencia = cls._desde_instantaneas(rutas)
+        elif rutas:
+            with open(rutas[0], encoding="utf-8") as archivo:
+                estado = json.load(archivo)
+            sistema = cls._desde_estado(estado)
+            secuencia = estado["secuencia"]
+        for evento in read_journal(journal_path, after_seq=secuencia):
+            if sistema is None:
+                if evento["op"] != "inicio":
+                    raise ValueError(
+                        "La bitácora no comienza con un evento de inicio y no hay "
+                        "instantánea disponible."
+                    )
+                sistema = cls(mesas=evento["mesas"], moneda=evento["moneda"])
+            sistema._aplicar_evento(evento)
+        if sistema is None:
+            raise ValueError("No hay instantánea ni eventos para recuperar.")
+        journal = SalesJournal(
+            journal_path, batch_size=batch_size, flush_interval=flush_interval
+        )
+        journal.resume_after(secuencia)
+        sistema._journal = journal
+        return sistema
+
+    def cerrar_journal(self) -> None:
+        """Sincroniza y cierra la bitácora asociada, si existe."""
+
+        if self._journal is not None:
+            self._journal.close()
+
+
+def _rutas_instantanea(
+    rutas: Union[PathLike, Sequence[PathLike], None],
+) -> List[PathLike]:
+    """Una ruta inexistente equivale a no tener instantánea; una cadena debe existir."""
+
+    if rutas is None:
+        return []
+    if isinstance(rutas, (str, os.PathLike)):
+        return [rutas] if os.path.exists(rutas) else []
+    return list(rutas)
+
+
+def _sumar_por_grupo(
+    claves: np.ndarray, valores: np.ndarray
+) -> Tuple[List[int], List[int]]:
+    grupos, inverso = np.unique(claves, return_inverse=True)
+    sumas = np.zeros(len(grupos), dtype=np.int64)
+    np.add.at(sumas, inverso, valores)
+    return grupos.tolist(), sumas.tolist()
+
+
+def _ventas_desde_bloque(bloque: SalesBlock) -> List[SaleRecord]:
+    catalogos = bloque.catalogos
+    skus, nombres = catalogos["skus"], catalogos["nombres"]
+    tipos, mesas, notas = catalogos["tipos"], catalogos["mesas"], catalogos["notas"]
+    cantidades = [Decimal(valor) for valor in catalogos["cantidades"]]
+    precios = [Decimal(valor) for valor in catalogos["precios"]]
+    lineas = [
+        SaleLine(skus[sku], nombres[nombre], cantidades[cantidad], precios[precio])
+        for sku, nombre, cantidad, precio in zip(
+            bloque.sku.tolist(),
+            bloque.nombre.tolist(),
+            bloque.cantidad.tolist(),
+            bloque.precio.tolist(),
+        )
+    ]
+    inicio = bloque.inicio_lineas.tolist()
+    return [
+        SaleRecord(
+            identificador=identificador,
+            tipo=tipos[tipo],
+            fecha=_EPOCH + timedelta(microseconds=fecha),
+            lineas=tuple(lineas[inicio[posicion] : inicio[posicion + 1]]),
+            mesa=None if mesa < 0 else mesas[mesa],
+            nota=None if nota < 0 else notas[nota],
+        )
+        for posicion, (identificador, tipo, fecha, mesa, nota) in enumerate(
+            zip(
+                bloque.identificadores(),
+                bloque.tipo.tolist(),
+                bloque.fecha.tolist(),
+                bloque.mesa.tolist(),
+                bloque.nota.tolist(),
+            )
+        )
+    ]
 
 
 def _normalizar_items(
@@ -360,3 +1346,78 @@ def _normalizar_items(
         if cantidad_decimal <= 0:
             raise ValueError("Las cantidades deben ser mayores que cero.")
         yield str(sku), cantidad_decimal
+
+
+def _motivo(exc: Exception) -> str:
+    return str(exc.args[0]) if exc.args else type(exc).__name__
+
+
+def _linea_de_item(item: _StockEntry, cantidad: Decimal) -> SaleLine:
+    return SaleLine(
+        sku=item.sku,
+        nombre=item.nombre,
+        cantidad=cantidad,
+        precio_unitario=item.unidad_precio,
+    )
+
+
+def _item_a_dict(item: Union[InventoryItem, _StockEntry]) -> Dict[str, str]:
+    return {
+        "sku": item.sku,
+        "nombre": item.nombre,
+        "unidad_precio": str(item.unidad_precio),
+        "cantidad": str(item.cantidad),
+        "unidad_medida": item.unidad_medida,
+        "tipo": item.tipo,
+    }
+
+
+def _item_desde_dict(datos: Mapping[str, str]) -> InventoryItem:
+    return InventoryItem(
+        sku=datos["sku"],
+        nombre=datos["nombre"],
+        unidad_precio=Decimal(datos["unidad_precio"]),
+        cantidad=Decimal(datos["cantidad"]),
+        unidad_medida=datos["unidad_medida"],
+        tipo=datos["tipo"],
+    )
+
+
+def _linea_a_dict(linea: SaleLine) -> Dict[str, str]:
+    return {
+        "sku": linea.sku,
+        "nombre": linea.nombre,
+        "cantidad": str(linea.cantidad),
+        "precio_unitario": str(linea.precio_unitario),
+    }
+
+
+def _linea_desde_dict(datos: Mapping[str, str]) -> SaleLine:
+    return SaleLine(
+        sku=datos["sku"],
+        nombre=datos["nombre"],
+        cantidad=Decimal(datos["cantidad"]),
+        precio_unitario=Decimal(datos["precio_unitario"]),
+    )
+
+
+def _venta_a_dict(venta: SaleRecord) -> Dict[str, Any]:
+    return {
+        "identificador": venta.identificador,
+        "tipo": venta.tipo,
+        "fecha": venta.fecha.isoformat(),
+        "lineas": [_linea_a_dict(linea) for linea in venta.lineas],
+        "mesa": venta.mesa,
+        "nota": venta.nota,
+    }
+
+
+def _venta_desde_dict(datos: Mapping[str, Any]) -> SaleRecord:
+    return SaleRecord(
+        identificador=datos["identificador"],
+        tipo=datos["tipo"],
+        fecha=datetime.fromisoformat(datos["fecha"]),
+        lineas=tuple(_linea_desde_dict(linea) for linea in datos["lineas"]),
+        mesa=datos["mesa"],
+        nota=datos["nota"],
+    )
@@ -0,0 +1,103 @@
+"""Aritmética monetaria en centavos enteros para :mod:`mypackage.bar_system`.
+
+Los montos se guardan como ``int`` de unidades menores (centavos). El
+redondeo reproduce exactamente ``Decimal.quantize(Decimal("0.01"),
+rounding=ROUND_HALF_UP)``: los empates se alejan de cero. Los productos se
+calculan como fracciones enteras exactas, por lo que el resultado coincide
+con la ruta basada en :class:`~decimal.Decimal` sin pagar su costo en cada
+suma.
+
+>>> to_cents("3.505")
+351
+>>> line_total_cents(Decimal("2.25"), Decimal("3"))
+675
+>>> cents_to_decimal(675)
+Decimal('6.75')
+"""
+
+from __future__ import annotations
+
+import re
+from decimal import Decimal
+from typing import Dict, Tuple, Union
+
+MoneyLike = Union[str, int, float, Decimal]
+
+_NUMERO = re.compile(r"([+-]?)(\d*)(?:\.(\d*))?")
+
+# En un bar se repiten pocas cantidades y precios; memorizar su fracción
+# evita ``Decimal.as_integer_ratio`` (la operación más cara) en cada línea.
+_FRACCIONES: Dict[Decimal, Tuple[int, int]] = {}
+_MAX_FRACCIONES = 4096
+
+
+def _fraccion(valor: Decimal) -> Tuple[int, int]:
+    fraccion = _FRACCIONES.get(valor)
+    if fraccion is None:
+        fraccion = valor.as_integer_ratio()
+        if len(_FRACCIONES) < _MAX_FRACCIONES:
+            _FRACCIONES[valor] = fraccion
+    return fraccion
+
+
+def _half_up(numerador: int, denominador: int) -> int:
+    """Cociente entero redondeado al más cercano; empates lejos de cero."""
+
+    cociente, resto = divmod(abs(numerador), denominador)
+    if 2 * resto >= denominador:
+        cociente += 1
+    return -cociente if numerador < 0 else cociente
+
+
+def to_cents(valor: MoneyLike) -> int:
+    """Convierte un monto a centavos redondeando con ``ROUND_HALF_UP``.
+
+    Los flotantes se interpretan por su representación decimal (``str``),
+    igual que ``_to_decimal`` en :mod:`mypackage.bar_system`.
+    """
+
+    if isinstance(valor, bool):
+        raise TypeError("Un booleano no es un monto válido.")
+    if isinstance(valor, int):
+        return valor * 100
+    if isinstance(valor, Decimal):
+        numerador, denominador = _fraccion(valor)
+        return _half_up(numerador * 100, denominador)
+    texto = str(valor).strip()
+    coincidencia = _NUMERO.fullmatch(texto)
+    if coincidencia is None or not (coincidencia.group(2) or coincidencia.group(3)):
+        return to_cents(Decimal(texto))
+    signo, enteros, decimales = coincidencia.groups()
+    decimales = decimales or ""
+    centavos = int(enteros or "0") * 100 + int((decimales[:2] or "0").ljust(2, "0"))
+    if decimales[2:3] >= "5":
+        centavos += 1
+    return -centavos if signo == "-" else centavos
+
+
+def line_total_cents(precio: Union[int, Decimal], cantidad: Union[int, Decimal]) -> int:
+    """Total de ``precio × cantidad`` en centavos, exacto y con ``ROUND_HALF_UP``.
+
+    ``precio`` puede ser un :class:`~decimal.Decimal` en unidades monetarias o
+    un ``int`` ya expresado en centavos.
+    """
+
+    if isinstance(precio, int):
+        numerador, denominador = precio, 1
+    else:
+        numerador, denominador = _fraccion(precio)
+        numerador *= 100
+    if isinstance(cantidad, int):
+        cantidad_num, cantidad_den = cantidad, 1
+    else:
+        cantidad_num, cantidad_den = _fraccion(cantidad)
+    denominador *= cantidad_den
+    if denominador == 1:
+        return numerador * cantidad_num
+    return _half_up(numerador * cantidad_num, denominador)
+
+
+def cents_to_decimal(centavos: int) -> Decimal:
+    """Devuelve el monto como ``Decimal`` con exactamente dos decimales."""
+
+    return Decimal(centavos).scaleb(-2)
@@ -1,14 +1,32 @@
 """Tests para el módulo ``mypackage.bar_system``."""
 
+import asyncio
+import json
 import os
 import sys
-from decimal import Decimal
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import List
 
+import numpy as np
 import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from mypackage import BarSystem
+from mypackage import (
+    BarService,
+    BarSystem,
+    ReorderEngine,
+    SalesJournal,
+    SalesLedger,
+    bar_service,
+    money,
+)
+from mypackage.bar_journal import read_journal
+from mypackage.bar_service import CommandError
+from mypackage.bar_system import SaleLine, SaleRecord
 
 
 @pytest.fixture
@@ -64,3 +82,580 @@ def test_resumen_ventas_suma_mesas_y_rapidas(sistema_bar: BarSystem) -> None:
     sistema_bar.cerrar_mesa(2)
     sistema_bar.consumir_insumo({"LIM": 2})  # no suma al resumen
     assert sistema_bar.resumen_ventas() == Decimal("13.75")
+
+
+def test_acumulados_coinciden_con_recalculo_completo(sistema_bar: BarSystem) -> None:
+    sistema_bar.venta_rapida({"CERV": 2, "EMP": 1})
+    sistema_bar.agregar_consumo_mesa(1, {"CERV": 1})
+    sistema_bar.agregar_consumo_mesa(1, {"EMP": 3})
+    assert sistema_bar.total_mesa(1) == Decimal("10.25")
+    sistema_bar.cerrar_mesa(1)
+    assert sistema_bar.total_mesa(1) == Decimal("0.00")
+    sistema_bar.consumir_insumo({"LIM": 4})
+
+    historial = sistema_bar.historial_ventas()
+    facturadas = [venta for venta in historial if venta.tipo in {"rapida", "mesa"}]
+    assert sistema_bar.resumen_ventas() == sum(
+        (venta.total for venta in facturadas), Decimal("0")
+    )
+    por_tipo = sistema_bar.ventas_por_tipo()
+    assert por_tipo == {
+        "rapida": Decimal("9.25"),
+        "mesa": Decimal("10.25"),
+        "consumo": Decimal("0.80"),
+    }
+    por_sku = sistema_bar.ventas_por_sku()
+    assert por_sku["CERV"].cantidad == Decimal("3")
+    assert por_sku["EMP"].ingresos == Decimal("9.00")
+    assert "LIM" not in por_sku
+    assert sum(sistema_bar.ventas_por_hora().values()) == Decimal("19.50")
+
+
+def _operar(sistema: BarSystem) -> None:
+    sistema.agregar_item_inventario("CERV", "Cerveza artesanal", 3.5, 50)
+    sistema.agregar_item_inventario("LIM", "Limones", 0.2, 100, tipo="insumo")
+    sistema.reabastecer("CERV", 10)
+    sistema.venta_rapida({"CERV": 2}, nota="barra")
+    sistema.agregar_consumo_mesa(1, {"CERV": 3})
+    sistema.cerrar_mesa(1)
+    sistema.consumir_insumo({"LIM": 4})
+    sistema.agregar_consumo_mesa(2, {"CERV": 1})
+
+
+def _estado(sistema: BarSystem):
+    return (
+        sistema.estado_inventario(),
+        sistema.historial_ventas(),
+        sistema.mesas_abiertas(),
+        sistema.total_mesa(2),
+        sistema.resumen_ventas(),
+    )
+
+
+def test_recuperacion_desde_bitacora_reproduce_el_estado(tmp_path) -> None:
+    ruta = tmp_path / "bar.wal"
+    sistema = BarSystem(mesas=[1, 2], journal=SalesJournal(ruta, batch_size=4))
+    _operar(sistema)
+    sistema.cerrar_journal()
+
+    with ruta.open("ab") as archivo:  # escritura interrumpida a mitad de línea
+        archivo.write(b'{"seq": 99, "op": "vent')
+    recuperado = BarSystem.recuperar(ruta)
+    assert _estado(recuperado) == _estado(sistema)
+
+    recuperado.venta_rapida({"CERV": 1})
+    recuperado.cerrar_journal()
+    de_nuevo = BarSystem.recuperar(ruta)
+    assert de_nuevo.obtener_item("CERV").cantidad == Decimal("53")
+    assert len(de_nuevo.historial_ventas()) == 4
+    de_nuevo.cerrar_journal()
+
+
+def test_snapshot_trunca_bitacora_y_recupera_eventos_posteriores(tmp_path) -> None:
+    ruta, snapshot = tmp_path / "bar.wal", tmp_path / "bar.snapshot.json"
+    sistema = BarSystem(mesas=[1, 2], journal=SalesJournal(ruta))
+    _operar(sistema)
+    secuencia = sistema.guardar_snapshot(snapshot)
+    assert secuencia > 0 and ruta.stat().st_size == 0
+    sistema.venta_rapida({"CERV": 5})
+    sistema.cerrar_journal()
+
+    recuperado = BarSystem.recuperar(ruta, snapshot)
+    assert _estado(recuperado) == _estado(sistema)
+    assert recuperado.ventas_por_tipo() == sistema.ventas_por_tipo()
+    recuperado.cerrar_journal()
+    with SalesJournal(ruta) as journal, pytest.raises(ValueError):
+        BarSystem(mesas=[1], journal=journal)
+
+
+def test_bitacora_sincroniza_un_registro_aislado_tras_el_intervalo(
+    tmp_path, monkeypatch
+) -> None:
+    sincronizados: List[int] = []
+    fsync_real = os.fsync
+
+    def fsync(fd: int) -> None:
+        sincronizados.append(fd)
+        fsync_real(fd)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    ruta = tmp_path / "bar.wal"
+    with SalesJournal(ruta, batch_size=1_000, flush_interval=0.02) as journal:
+        journal.append({"tipo": "reabastecer", "sku": "CERV"}, sync=False)
+        limite = time.monotonic() + 2
+        while not sincronizados and time.monotonic() < limite:
+            time.sleep(0.01)
+        # Nadie más llamó a la bitácora: el hilo de fondo hizo el fsync.
+        assert sincronizados
+        assert [r["sku"] for r in read_journal(ruta)] == ["CERV"]
+
+
+@pytest.mark.parametrize("bloqueo", ["sku", "global"])
+def test_ventas_concurrentes_no_sobrevenden(bloqueo: str) -> None:
+    sistema = BarSystem(mesas=[1, 2, 3, 4], bloqueo=bloqueo)
+    sistema.agregar_item_inventario("CERV", "Cerveza artesanal", 3.5, 50)
+    sistema.agregar_item_inventario("EMP", "Empanada", 2.25, 1_000)
+    exitosas: List[int] = []
+    rechazadas: List[int] = []
+
+    def terminal(numero: int) -> None:
+        for _ in range(20):
+            try:
+                if numero % 2:
+                    sistema.venta_rapida([("EMP", 1), ("CERV", 1)])
+                else:
+                    sistema.agregar_consumo_mesa(numero % 4 + 1, {"CERV": 1, "EMP": 1})
+                exitosas.append(numero)
+            except ValueError:
+                rechazadas.append(numero)
+
+    hilos = [threading.Thread(target=terminal, args=(n,)) for n in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert len(exitosas) == 50 and len(rechazadas) == 110
+    assert sistema.obtener_item("CERV").cantidad == Decimal("0")
+    assert sistema.obtener_item("EMP").cantidad == Decimal("950")
+    abiertas = sum(sistema.total_mesa(mesa) for mesa in sistema.mesas_abiertas())
+    assert sistema.resumen_ventas() + abiertas == Decimal("5.75") * 50
+
+
+@pytest.mark.parametrize("bloqueo", ["sku", "global"])
+def test_reportes_concurrentes_con_altas_y_ventas(bloqueo: str) -> None:
+    # Cambios de hilo muy frecuentes para que el lector choque con las altas.
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    sistema = BarSystem(mesas=[1], bloqueo=bloqueo)
+    terminado = threading.Event()
+    errores: List[BaseException] = []
+
+    def lector() -> None:
+        try:
+            while not terminado.is_set():
+                sistema.estado_inventario()
+                sistema.ventas_por_sku()
+                sistema.ventas_por_tipo()
+                sistema.ventas_por_hora()
+        except BaseException as exc:  # pragma: no cover - solo si hay carrera
+            errores.append(exc)
+
+    hilo = threading.Thread(target=lector)
+    hilo.start()
+    try:
+        for indice in range(300):
+            sku = f"SKU{indice:03d}"
+            sistema.agregar_item_inventario(sku, f"Producto {indice}", 1, 5)
+            sistema.venta_rapida({sku: 1})
+    finally:
+        terminado.set()
+        hilo.join()
+        sys.setswitchinterval(intervalo)
+
+    assert errores == []
+    assert len(sistema.estado_inventario()) == 300
+    assert len(sistema.ventas_por_sku()) == 300
+
+
+def test_venta_con_sku_repetido_valida_la_cantidad_total(
+    sistema_bar: BarSystem,
+) -> None:
+    with pytest.raises(ValueError):
+        sistema_bar.venta_rapida([("CERV", 30), ("CERV", 30)])
+    assert sistema_bar.obtener_item("CERV").cantidad == Decimal("50")
+
+
+def test_centavos_enteros_coinciden_con_redondeo_decimal() -> None:
+    centavo = Decimal("0.01")
+    for texto in ["3.505", "-3.505", "0.005", "2.675", "1e1", " 7 "]:
+        esperado = Decimal(texto.strip()).quantize(centavo, rounding=ROUND_HALF_UP)
+        assert money.cents_to_decimal(money.to_cents(texto)) == esperado
+    assert money.to_cents(1.005) == 101  # str(1.005) == "1.005"
+    for precio, cantidad in [("2.25", "3"), ("0.35", "0.5"), ("1.99", "0.333")]:
+        esperado = (Decimal(precio) * Decimal(cantidad)).quantize(
+            centavo, rounding=ROUND_HALF_UP
+        )
+        centavos = money.line_total_cents(Decimal(precio), Decimal(cantidad))
+        assert money.cents_to_decimal(centavos) == esperado
+        assert money.line_total_cents(money.to_cents(precio), Decimal(cantidad)) == (
+            centavos
+        )
+
+    sistema = BarSystem(mesas=[1])
+    sistema.agregar_item_inventario("VINO", "Copa de vino", "4.995", 10)
+    venta = sistema.venta_rapida({"VINO": "1.5"})
+    assert sistema.obtener_item("VINO").unidad_precio == Decimal("5.00")
+    assert venta.total == Decimal("7.50") and venta.total_centavos == 750
+    assert str(sistema.resumen_ventas()) == "7.50"
+
+
+def test_libro_columnar_consulta_rangos_y_agrupa() -> None:
+    inicio = datetime(2024, 3, 1, 20, tzinfo=timezone.utc)
+    libro = SalesLedger(capacidad=2)
+
+    def venta(minutos: int, tipo: str, mesa, lineas) -> SaleRecord:
+        return SaleRecord(
+            identificador=f"V{minutos}",
+            tipo=tipo,
+            fecha=inicio + timedelta(minutes=minutos),
+            lineas=tuple(
+                SaleLine(sku, sku, Decimal(cantidad), Decimal(precio))
+                for sku, cantidad, precio in lineas
+            ),
+            mesa=mesa,
+        )
+
+    libro.append(venta(10, "rapida", None, [("CERV", 2, "3.50"), ("EMP", 1, "2.25")]))
+    libro.append(venta(70, "mesa", "1", [("CERV", 3, "3.50")]))
+    # Llega fuera de orden: el índice temporal debe reordenarla.
+    libro.append(venta(5, "rapida", None, [("EMP", 4, "2.25")]))
+    libro.append(venta(130, "mesa", "2", [("CERV", 1, "3.50")]))
+
+    assert len(libro) == 5 and libro.ventas == 4
+    filas = libro.select(inicio, inicio + timedelta(hours=2))
+    assert libro.column("fecha")[filas].tolist() == sorted(libro.column("fecha")[filas])
+    assert libro.column("venta")[filas].tolist() == [2, 0, 0, 1]
+    assert libro.totals_by("sku", inicio, inicio + timedelta(hours=1)) == {
+        "CERV": Decimal("7.00"),
+        "EMP": Decimal("11.25"),
+    }
+    assert libro.totals_by("mesa", tipo="mesa") == {
+        "1": Decimal("10.50"),
+        "2": Decimal("3.50"),
+    }
+    assert libro.quantities_by("sku", mesa=1) == {"CERV": 3.0}
+    assert libro.totals_by("hora") == {
+        inicio: Decimal("18.25"),
+        inicio + timedelta(hours=1): Decimal("10.50"),
+        inicio + timedelta(hours=2): Decimal("3.50"),
+    }
+    assert libro.totals_by("sku", sku="NADA") == {}
+
+    tabla = libro.to_pandas()
+    assert np.shares_memory(
+        tabla["total_centavos"].to_numpy(), libro.column("total_centavos")
+    )
+    assert tabla["sku"].tolist() == ["CERV", "EMP", "CERV", "EMP", "CERV"]
+    assert tabla["mesa"].isna().tolist() == [True, True, False, True, False]
+    assert tabla.groupby("tipo", observed=True)["total_centavos"].sum().to_dict() == {
+        "mesa": 1400,
+        "rapida": 1825,
+    }
+
+
+def test_historial_por_rango_usa_el_libro(sistema_bar: BarSystem) -> None:
+    antes = datetime.now(tz=timezone.utc)
+    primera = sistema_bar.venta_rapida({"CERV": 1})
+    sistema_bar.consumir_insumo({"LIM": 2})
+    sistema_bar.agregar_consumo_mesa(1, {"EMP": 2})
+    mesa = sistema_bar.cerrar_mesa(1)
+
+    assert sistema_bar.historial_ventas(desde=antes) == sistema_bar.historial_ventas()
+    assert sistema_bar.historial_ventas(hasta=antes) == []
+    assert sistema_bar.historial_ventas(desde=mesa.fecha) == [mesa]
+    assert sistema_bar.historial_ventas(hasta=mesa.fecha)[0] == primera
+    libro = sistema_bar.libro_ventas
+    assert libro.totals_by("tipo") == sistema_bar.ventas_por_tipo()
+    assert libro.totals_by("sku", tipo="rapida") == {"CERV": Decimal("3.50")}
+
+
+def test_procesar_pedidos_reserva_en_lote_y_reporta_rechazos(
+    sistema_bar: BarSystem,
+) -> None:
+    resultado = sistema_bar.procesar_pedidos(
+        [
+            {"CERV": 20, "EMP": 5},
+            {"items": {"CERV": 25}, "mesa": 1},
+            {"CERV": 10},  # ya no queda stock suficiente
+            {"NADA": 1},
+            {"items": [("EMP", 3)], "nota": "barra"},
+        ]
+    )
+
+    assert [pedido.aceptado for pedido in resultado.pedidos] == [
+        True,
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert "Stock insuficiente para CERV" in resultado.rechazados[0].error
+    assert "NADA" in resultado.rechazados[1].error
+    assert resultado.pedidos[1].mesa == "1" and resultado.pedidos[1].venta is None
+    assert resultado.pedidos[4].venta.nota == "barra"
+    assert resultado.total == Decimal("175.50")
+    assert sistema_bar.obtener_item("CERV").cantidad == Decimal("5")
+    assert sistema_bar.obtener_item("EMP").cantidad == Decimal("22")
+    assert sistema_bar.total_mesa(1) == Decimal("87.50")
+    assert len(sistema_bar.historial_ventas()) == 2
+
+    with pytest.raises(ValueError, match="Lote cancelado"):
+        sistema_bar.procesar_pedidos([{"EMP": 2}, {"CERV": 6}], todo_o_nada=True)
+    assert sistema_bar.obtener_item("EMP").cantidad == Decimal("22")
+
+
+def test_procesar_pedidos_se_recupera_desde_bitacora(tmp_path) -> None:
+    journal = SalesJournal(tmp_path / "bar.wal", batch_size=1)
+    sistema = BarSystem(mesas=[1], journal=journal)
+    sistema.agregar_item_inventario("CERV", "Cerveza", "3.50", 10)
+    sistema.procesar_pedidos([{"CERV": 2}, {"items": {"CERV": 3}, "mesa": 1}])
+    sistema.cerrar_journal()
+
+    recuperado = BarSystem.recuperar(tmp_path / "bar.wal")
+    assert recuperado.obtener_item("CERV").cantidad == Decimal("5")
+    assert recuperado.total_mesa(1) == Decimal("10.50")
+    assert recuperado.resumen_ventas() == Decimal("7.00")
+    recuperado.cerrar_journal()
+
+
+def test_inventario_publica_copias_inmutables_y_compactas(
+    sistema_bar: BarSystem,
+) -> None:
+    antes = sistema_bar.obtener_item("CERV")
+    venta = sistema_bar.venta_rapida({"CERV": 2})
+    sistema_bar.reabastecer("CERV", 5)
+
+    assert antes.cantidad == Decimal("50")
+    assert sistema_bar.obtener_item("CERV").cantidad == Decimal("53")
+    assert sistema_bar.obtener_item("CERV").unidad_precio_centavos == 350
+    for objeto in (antes, venta, venta.lineas[0]):
+        assert not hasattr(objeto, "__dict__")
+    with pytest.raises(ValueError, match="Stock insuficiente"):
+        antes.consume(51)
+
+
+def test_servicio_asincrono_serializa_comandos_y_publica_cambios(
+    sistema_bar: BarSystem,
+) -> None:
+    async def escenario() -> None:
+        async with BarService(sistema_bar, umbrales={"CERV": 10}) as servicio:
+            flujo = servicio.subscribe()
+            ventas = await asyncio.gather(
+                *(servicio.submit("venta_rapida", items={"CERV": 2}) for _ in range(20))
+            )
+            assert len({venta["identificador"] for venta in ventas}) == 20
+            with pytest.raises(CommandError, match="Stock insuficiente"):
+                await servicio.submit("venta_rapida", items={"CERV": 20})
+            await servicio.submit("reabastecer", sku="CERV", cantidad=5)
+
+            eventos = []
+            servicio.unsubscribe(flujo)
+            async for evento in flujo:
+                eventos.append(evento)
+            assert [evento["seq"] for evento in eventos] == list(
+                range(1, len(eventos) + 1)
+            )
+            assert sum(evento["evento"] == "venta" for evento in eventos) == 20
+            alertas = [e for e in eventos if e["evento"] == "stock_bajo"]
+            assert [(e["sku"], e["cantidad"]) for e in alertas] == [("CERV", "10")]
+            assert eventos[-1] == {
+                "evento": "stock",
+                "sku": "CERV",
+                "cantidad": "15",
+                "seq": len(eventos),
+            }
+
+            servidor = await servicio.serve_tcp()
+            puerto = servidor.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", puerto)
+            for mensaje in (
+                {"id": 1, "op": "suscribir"},
+                {"id": 2, "op": "venta_rapida", "items": {"EMP": 3}},
+                {"id": 3, "op": "venta_rapida", "items": {"NADA": 1}},
+            ):
+                writer.write(json.dumps(mensaje).encode() + b"\n")
+            await writer.drain()
+            recibidos = [json.loads(await reader.readline()) for _ in range(5)]
+            writer.close()
+            respuestas = {m["id"]: m for m in recibidos if "id" in m}
+            assert (
+                respuestas[2]["ok"] and respuestas[2]["resultado"]["tipo"] == "rapida"
+            )
+            assert not respuestas[3]["ok"] and "NADA" in respuestas[3]["error"]
+            assert [m["evento"] for m in recibidos if "evento" in m] == [
+                "venta",
+                "stock",
+            ]
+
+    asyncio.run(escenario())
+    assert sistema_bar.obtener_item("EMP").cantidad == Decimal("27")
+
+
+def _estado_comparable(sistema: BarSystem) -> tuple:
+    return (
+        sistema.historial_ventas(),
+        sistema.estado_inventario(),
+        sistema.ventas_por_tipo(),
+        sistema.ventas_por_sku(),
+        sistema.ventas_por_hora(),
+        sistema.resumen_ventas(),
+        sistema.mesas_abiertas(),
+        sistema.libro_ventas.totals_by("sku"),
+    )
+
+
+def test_snapshot_binario_incremental_restaura_el_estado(tmp_path) -> None:
+    journal = SalesJournal(tmp_path / "bar.wal", batch_size=1)
+    sistema = BarSystem(mesas=[1, 2], journal=journal)
+    sistema.agregar_item_inventario("CERV", "Cerveza artesanal", 3.5, 100)
+    sistema.agregar_item_inventario("VINO", "Copa de vino", "4.99", "20.5")
+    sistema.agregar_item_inventario("LIM", "Limones", 0.2, 100, tipo="insumo")
+    sistema.venta_rapida({"CERV": 2, "VINO": "0.333"}, nota="happy hour")
+    sistema.agregar_consumo_mesa(1, {"CERV": 3})
+    sistema.cerrar_mesa(1)
+    sistema.consumir_insumo({"LIM": 4})
+    base = tmp_path / "base.snap"
+    sistema.guardar_snapshot_binario(base)
+
+    sistema.venta_rapida({"VINO": "1.5"})
+    sistema.agregar_consumo_mesa(2, {"CERV": 1})
+    delta = tmp_path / "delta.snap"
+    sistema.guardar_snapshot_binario(delta, incremental=True)
+    sistema.reabastecer("CERV", 10)
+    sistema.venta_rapida({"CERV": 1})
+    esperado = _estado_comparable(sistema)
+    sistema.cerrar_journal()
+
+    restaurado = BarSystem.restaurar_snapshot([base, delta])
+    assert len(restaurado.historial_ventas()) == 4
+    assert restaurado.total_mesa(2) == Decimal("3.50")
+    assert restaurado.historial_ventas()[0].nota == "happy hour"
+
+    recuperado = BarSystem.recuperar(tmp_path / "bar.wal", [base, delta])
+    assert _estado_comparable(recuperado) == esperado
+    recuperado.cerrar_journal()
+
+    with pytest.raises(ValueError, match="cadena"):
+        BarSystem.restaurar_snapshot([delta])
+
+
+def test_motor_de_reposicion_prioriza_por_agotamiento() -> None:
+    inicio = datetime(2024, 3, 1, 20, tzinfo=timezone.utc)
+    motor = ReorderEngine(
+        vida_media=timedelta(hours=1),
+        plazo_entrega=timedelta(hours=2),
+        cobertura=timedelta(hours=4),
+    )
+    motor.update_stock("AGUA", 40, inicio)
+    motor.record_consumption("CERV", 10, 90, inicio)
+    motor.record_consumption("VINO", 40, 10, inicio)
+
+    # La tasa EWMA se reduce a la mitad tras una vida media sin consumos.
+    tasa = motor.consumption_rate("CERV", inicio)
+    assert motor.consumption_rate("CERV", inicio + timedelta(hours=1)) == (
+        pytest.approx(tasa / 2)
+    )
+    assert motor.consumption_rate("AGUA", inicio) == 0.0
+
+    urgentes = motor.suggestions(inicio)
+    assert [s.sku for s in urgentes] == ["VINO"]
+    vino = urgentes[0]
+    assert vino.existencias == Decimal("10")
+    assert vino.agotamiento == inicio + timedelta(hours=10 / vino.consumo_por_hora)
+    assert vino.cantidad_sugerida == Decimal(
+        int(np.ceil(vino.consumo_por_hora * 6 - 10))
+    )
+    assert motor.next_due() == ("VINO", vino.pedir_antes_de)
+
+    # Con más horizonte aparece la cerveza; el agua sin consumo nunca vence.
+    proximos = motor.suggestions(inicio, horizonte=timedelta(days=2))
+    assert [s.sku for s in proximos] == ["VINO", "CERV"]
+
+    motor.update_stock("VINO", 500, inicio)
+    assert [s.sku for s in motor.suggestions(inicio)] == []
+    motor.update_stock("AGUA", 0, inicio)
+    assert [s.sku for s in motor.suggestions(inicio)] == ["AGUA"]
+
+
+def test_reposicion_se_alimenta_de_las_ventas(sistema_bar: BarSystem) -> None:
+    motor = sistema_bar.activar_reorden(ReorderEngine(plazo_entrega=timedelta(0)))
+    assert sistema_bar.reorden is motor
+    assert len(motor) == 3
+
+    sistema_bar.venta_rapida({"CERV": 20})
+    sistema_bar.procesar_pedidos([{"EMP": 30}])
+    assert motor.consumption_rate("CERV") > 0
+    assert [s.sku for s in motor.suggestions()] == ["EMP"]
+
+    sistema_bar.reabastecer("EMP", 30)
+    sistema_bar.agregar_item_inventario("HIELO", "Hielo", 0.1, 0, tipo="insumo")
+    assert [s.sku for s in motor.suggestions()] == ["HIELO"]
+
+
+def test_reposicion_se_notifica_sin_candados_de_sku() -> None:
+    sistema_bar = BarSystem(mesas=[1], bloqueo="sku")
+    sistema_bar.agregar_item_inventario("CERV", "Cerveza artesanal", 3.5, 50)
+    sistema_bar.agregar_item_inventario("EMP", "Empanada", 2.25, 30)
+
+    class MotorVigilado(ReorderEngine):
+        vigilar = False
+
+        def _sin_candados(self, sku: str) -> None:
+            assert not (self.vigilar and sistema_bar._candados_sku[sku].locked())
+
+        def update_stock(self, sku, existencias, fecha=None) -> None:
+            self._sin_candados(sku)
+            super().update_stock(sku, existencias, fecha)
+
+        def record_consumption(self, sku, cantidad, existencias, fecha=None) -> None:
+            self._sin_candados(sku)
+            super().record_consumption(sku, cantidad, existencias, fecha)
+
+    # La carga inicial ocurre con todo bloqueado; se vigila a partir de ahí.
+    motor = sistema_bar.activar_reorden(MotorVigilado(plazo_entrega=timedelta(0)))
+    motor.vigilar = True
+    sistema_bar.venta_rapida({"CERV": 20})
+    sistema_bar.procesar_pedidos([{"EMP": 30}])
+    sistema_bar.reabastecer("CERV", 5)
+    assert motor.consumption_rate("CERV") > 0
+    assert [s.sku for s in motor.suggestions()] == ["EMP"]
+
+
+def test_servicio_responde_a_solicitudes_malformadas(
+    sistema_bar: BarSystem, monkeypatch
+) -> None:
+    monkeypatch.setattr(bar_service, "_LIMITE_LINEA", 64)
+
+    async def escenario() -> None:
+        async with BarService(sistema_bar) as servicio:
+            servidor = await servicio.serve_tcp()
+            puerto = servidor.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", puerto)
+            writer.write(b'[1]\n"x"\n')
+            writer.write(b'{"id": 9, "nota": "' + b"a" * 500 + b'"}\n')
+            writer.write(b'{"id": 10, "op": "obtener_item", "sku": "EMP"}\n')
+            await writer.drain()
+            respuestas = [json.loads(await reader.readline()) for _ in range(4)]
+            writer.close()
+            assert [r["ok"] for r in respuestas] == [False, False, False, True]
+            assert "objeto JSON" in respuestas[0]["error"]
+            assert "límite" in respuestas[2]["error"]
+            assert respuestas[3]["id"] == 10
+
+    asyncio.run(escenario())
+
+
+def test_cerrar_servicio_falla_el_comando_en_curso(
+    sistema_bar: BarSystem, monkeypatch
+) -> None:
+    iniciado = threading.Event()
+    liberar = threading.Event()
+
+    def lento(sistema: BarSystem, datos: dict) -> tuple:
+        iniciado.set()
+        liberar.wait(5)
+        return None, [], []
+
+    monkeypatch.setitem(bar_service.COMANDOS, "lento", lento)
+
+    async def escenario() -> None:
+        servicio = BarService(sistema_bar)
+        pendiente = asyncio.create_task(servicio.submit("lento"))
+        await asyncio.to_thread(iniciado.wait, 5)
+        await servicio.close()
+        liberar.set()
+        with pytest.raises(CommandError, match="se cerró"):
+            await asyncio.wait_for(pendiente, 5)
+
+    asyncio.run(escenario())
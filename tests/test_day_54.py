@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import numpy as np
 import pytest
+from scipy.stats import multivariate_normal
 
 from Day_54_Probabilistic_Modeling import solutions as day54
 
@@ -41,3 +42,79 @@ def test_hidden_markov_log_likelihood_matches_expected() -> None:
     observations = np.array([[0.2], [-0.3], [2.6], [3.3], [2.9]])
     log_like = day54.hmm_log_likelihood(hmm, observations)
     assert log_like == pytest.approx(-6.69642, rel=1e-5)
+
+
+def test_hmm_log_parameters_follow_reassignment() -> None:
+    hmm = day54.build_demo_hmm(random_state=7)
+    observations = np.array([[0.2], [-0.3], [2.6], [3.3], [2.9]])
+    before = day54.hmm_log_likelihood(hmm, observations)
+    hmm.transition = np.array([[0.5, 0.5], [0.5, 0.5]])
+    hmm.startprob = np.array([0.1, 0.9])
+    assert np.allclose(hmm.log_transition, np.log(0.5))
+    assert np.allclose(hmm.log_startprob, np.log([0.1, 0.9]))
+    fresh = day54.HiddenMarkovModel(
+        hmm.transition, hmm.startprob, hmm.means, hmm.covariances
+    )
+    after = day54.hmm_log_likelihood(hmm, observations)
+    assert after != pytest.approx(before)
+    assert after == pytest.approx(day54.hmm_log_likelihood(fresh, observations))
+
+
+def test_emission_log_probs_match_multivariate_normal(gaussian_dataset) -> None:
+    X, _ = gaussian_dataset
+    hmm = day54.HiddenMarkovModel(
+        transition=np.array([[0.9, 0.1], [0.3, 0.7]]),
+        startprob=np.array([0.5, 0.5]),
+        means=np.array([[0.0, 0.0], [3.5, 2.8]]),
+        covariances=np.array([[[0.8, 0.2], [0.2, 0.6]], [[0.5, -0.15], [-0.15, 0.7]]]),
+    )
+    log_probs = day54.gaussian_emission_log_probs(hmm, X[:20])
+    expected = np.column_stack(
+        [
+            multivariate_normal(hmm.means[k], hmm.covariances[k]).logpdf(X[:20])
+            for k in range(2)
+        ]
+    )
+    assert np.allclose(log_probs, expected)
+
+
+def test_forward_backward_posteriors_and_batched_likelihoods() -> None:
+    hmm = day54.build_demo_hmm(random_state=7)
+    observations = np.array([[0.2], [-0.3], [2.6], [3.3], [2.9]])
+    batch = np.stack([observations, observations[::-1]])
+    result = day54.forward_backward(hmm, batch)
+    assert result.log_likelihood[0] == pytest.approx(-6.69642, rel=1e-5)
+    assert result.log_likelihood[1] == pytest.approx(
+        day54.hmm_log_likelihood(hmm, observations[::-1])
+    )
+    assert np.allclose(result.state_posteriors.sum(axis=2), 1.0)
+    assert result.transition_counts.sum() == pytest.approx(2 * 4)
+
+
+def test_viterbi_recovers_regime_switch() -> None:
+    hmm = day54.build_demo_hmm(random_state=7)
+    observations = np.array([[0.2], [-0.3], [2.6], [3.3], [2.9]])
+    path, log_prob = day54.viterbi_decode(hmm, observations)
+    assert path.tolist() == [0, 0, 1, 1, 1]
+    assert log_prob <= day54.hmm_log_likelihood(hmm, observations)
+
+
+def test_baum_welch_improves_likelihood_on_sampled_sequences() -> None:
+    rng = np.random.default_rng(7)
+    true_states = np.repeat([0, 1, 0, 1], 25)
+    sequences = np.stack(
+        [
+            rng.normal(np.where(true_states == 1, 3.0, 0.0), 0.6)[:, np.newaxis]
+            for _ in range(4)
+        ]
+    )
+    initial = day54.HiddenMarkovModel(
+        transition=np.array([[0.5, 0.5], [0.5, 0.5]]),
+        startprob=np.array([0.5, 0.5]),
+        means=np.array([[0.5], [2.0]]),
+        covariances=np.array([[[1.5]], [[1.5]]]),
+    )
+    fitted, history = day54.fit_hmm_baum_welch(initial, sequences, n_iter=30)
+    assert np.all(np.diff(history) > -1e-6)
+    assert sorted(fitted.means.ravel().round(0).tolist()) == [0.0, 3.0]
+    assert np.all(np.diag(fitted.transition) > 0.8)
@@ -2,7 +2,14 @@
 
 from __future__ import annotations
 
+import os
+import signal
+import threading
+import time
+
 import numpy as np
+import pandas as pd
+import pytest
 
 from Day_56_Time_Series_and_Forecasting import solutions as day56
 
@@ -47,3 +54,242 @@ def test_rolling_origin_backtest_runs_without_error() -> None:
     assert {"mae", "rmse", "mape", "smape", "start"}.issubset(backtest.columns)
     assert float(np.mean(backtest["mae"])) < 1.5
     assert len(backtest) > 5
+
+
+def _ar1_builder(train, steps, start_params=None):
+    return day56.fit_arima_forecast(
+        train, order=(1, 0, 0), steps=steps, start_params=start_params
+    )
+
+
+def test_parallel_warm_started_backtest_matches_fold_layout() -> None:
+    series = day56.generate_seasonal_series(periods=60, random_state=7)
+    folds = day56.backtest_folds(len(series), 40, 4, window="sliding", stride=3)
+    assert [fold.train_end for fold in folds] == [40, 43, 46, 49, 52, 55]
+    assert all(fold.train_end - fold.train_start == 40 for fold in folds)
+
+    cold = day56.rolling_origin_backtest(
+        series, 40, 4, _ar1_builder, window="sliding", stride=3
+    )
+    warm = day56.rolling_origin_backtest(
+        series,
+        40,
+        4,
+        _ar1_builder,
+        window="sliding",
+        stride=3,
+        warm_start=True,
+        n_jobs=2,
+    )
+    assert list(warm["fold"]) == list(range(6))
+    assert list(warm["start"]) == list(cold["start"])
+    assert (warm["train_size"] == 40).all()
+    np.testing.assert_allclose(warm["mae"], cold["mae"], rtol=1e-3)
+
+    streamed = list(
+        day56.iter_rolling_origin_backtest(series, 50, 4, _ar1_builder, stride=2)
+    )
+    assert [row["train_size"] for row in streamed] == [50, 52, 54, 56]
+
+
+def _failing_tail_builder(train, steps, start_params=None):
+    if len(train) in {46, 55}:
+        raise RuntimeError("fit failed")
+    return _ar1_builder(train, steps, start_params)
+
+
+def test_warm_started_parallel_backtest_streams_rows_per_fold() -> None:
+    series = day56.generate_seasonal_series(periods=60, random_state=7)
+    rows = []
+    # Two warm-start chains of three folds; each fails on its last fold, so
+    # only per-fold streaming delivers the first two rows of each chain.
+    with pytest.raises(RuntimeError, match="fit failed"):
+        for row in day56.iter_rolling_origin_backtest(
+            series, 40, 4, _failing_tail_builder, stride=3, warm_start=True, n_jobs=2
+        ):
+            rows.append(row)
+    assert sorted(row["train_size"] for row in rows) == [40, 43, 49, 52]
+
+
+def _slow_builder(train, steps):
+    if train.iloc[0] > 100:
+        time.sleep(5)
+    return day56.fit_exponential_smoothing(
+        train, trend="add", seasonal=None, steps=steps
+    )
+
+
+def _long_frame(n_series: int, periods: int) -> pd.DataFrame:
+    frames = []
+    for i in range(n_series):
+        series = day56.generate_seasonal_series(periods=periods, random_state=i)
+        frames.append(
+            pd.DataFrame(
+                {"sku": f"sku-{i}", "date": series.index, "value": series.values}
+            )
+        )
+    return pd.concat(frames, ignore_index=True).sample(frac=1.0, random_state=0)
+
+
+def test_many_series_engine_isolates_failures_and_writes_incrementally(
+    tmp_path,
+) -> None:
+    frame = _long_frame(5, 48)
+    short = pd.DataFrame(
+        {
+            "sku": "sku-short",
+            "date": pd.date_range("2020-01-01", periods=5, freq="MS"),
+            "value": np.arange(5.0),
+        }
+    )
+    output = tmp_path / "forecasts.csv"
+    result = day56.forecast_many_series(
+        pd.concat([frame, short]),
+        id_col="sku",
+        steps=6,
+        n_jobs=2,
+        chunk_size=2,
+        output_path=output,
+    )
+    assert sorted(result.forecasts["sku"].unique()) == [f"sku-{i}" for i in range(5)]
+    assert len(result.forecasts) == 5 * 6
+    assert list(result.failures["sku"]) == ["sku-short"]
+    written = pd.read_csv(output)
+    assert len(written) == len(result.forecasts)
+    with pytest.raises(FileExistsError):
+        day56.forecast_many_series(short, id_col="sku", output_path=output)
+    day56.forecast_many_series(
+        frame[frame["sku"] == "sku-0"],
+        id_col="sku",
+        steps=6,
+        output_path=output,
+        overwrite=True,
+    )
+    assert len(pd.read_csv(output)) == 6
+    single = day56.fit_exponential_smoothing(
+        day56.generate_seasonal_series(periods=48, random_state=3), steps=6
+    )
+    np.testing.assert_allclose(
+        result.forecasts.loc[result.forecasts["sku"] == "sku-3", "forecast"],
+        single.forecast.values,
+    )
+
+
+def test_many_series_engine_times_out_slow_series() -> None:
+    frame = _long_frame(2, 36)
+    frame.loc[frame["sku"] == "sku-1", "value"] += 500
+    result = day56.forecast_many_series(
+        frame, id_col="sku", model=_slow_builder, steps=3, timeout=0.5
+    )
+    assert list(result.forecasts["sku"].unique()) == ["sku-0"]
+    assert result.failures["error"].str.startswith("SeriesTimeoutError").all()
+
+
+def _stuck_builder(train, steps):
+    if train.iloc[0] > 100:
+        # Stand-in for a fit stuck in compiled code: SIGALRM cannot reach it.
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        time.sleep(30)
+    return _slow_builder(train, steps)
+
+
+def _crashing_builder(train, steps):
+    if train.iloc[0] > 100:
+        os._exit(1)
+    return _slow_builder(train, steps)
+
+
+def test_many_series_timeouts_work_off_the_main_thread() -> None:
+    frame = _long_frame(2, 36)
+    frame.loc[frame["sku"] == "sku-1", "value"] += 500
+    handler = signal.getsignal(signal.SIGALRM)
+    results = []
+    worker = threading.Thread(
+        target=lambda: results.append(
+            day56.forecast_many_series(
+                frame, id_col="sku", model=_slow_builder, steps=3, timeout=0.5
+            )
+        )
+    )
+    worker.start()
+    worker.join()
+    assert list(results[0].forecasts["sku"].unique()) == ["sku-0"]
+    assert list(results[0].failures["sku"]) == ["sku-1"]
+    assert signal.getsignal(signal.SIGALRM) is handler
+
+
+def test_many_series_engine_recycles_hung_and_crashed_workers(monkeypatch) -> None:
+    monkeypatch.setattr(day56, "_WORKER_GRACE", 0.5)
+    frame = _long_frame(4, 36)
+    frame.loc[frame["sku"] == "sku-1", "value"] += 500
+    for builder in (_stuck_builder, _crashing_builder):
+        result = day56.forecast_many_series(
+            frame,
+            id_col="sku",
+            model=builder,
+            steps=3,
+            n_jobs=2,
+            chunk_size=2,
+            timeout=0.5,
+        )
+        assert sorted(result.forecasts["sku"].unique()) == ["sku-0", "sku-2", "sku-3"]
+        assert list(result.failures["sku"]) == ["sku-1"]
+    assert result.failures["error"].str.startswith("BrokenProcessPool").all()
+
+
+def test_grouped_metrics_match_per_series_loop() -> None:
+    rng = np.random.default_rng(39)
+    frame = pd.DataFrame(
+        {
+            "sku": np.repeat(["a", "b", "c"], 8),
+            "step": np.tile(np.arange(1, 9), 3),
+            "actual": rng.uniform(5, 15, size=24),
+            "volume": rng.uniform(1, 3, size=24),
+        }
+    )
+    frame["forecast"] = frame["actual"] + rng.normal(0, 1, size=24)
+    frame.loc[0, "actual"] = 0.0
+    history = pd.DataFrame(
+        {"sku": np.repeat(["a", "b", "c"], 12), "value": rng.normal(10, 2, 36)}
+    )
+    scale = day56.naive_scale(history, "sku")
+    metrics = day56.grouped_forecast_metrics(
+        frame, "sku", weight_col="volume", scale=scale
+    ).set_index("sku")
+
+    for sku, group in frame.groupby("sku"):
+        expected = day56.forecast_metrics(group["actual"], group["forecast"])
+        for name, value in expected.items():
+            assert np.isclose(metrics.loc[sku, name], value, rtol=1e-12)
+        abs_err = np.abs(group["actual"] - group["forecast"])
+        assert np.isclose(metrics.loc[sku, "mase"], abs_err.mean() / scale[sku])
+        weighted = np.average(abs_err, weights=group["volume"])
+        assert np.isclose(metrics.loc[sku, "weighted_mae"], weighted)
+        wape = abs_err.sum() / group["actual"].abs().sum() * 100
+        assert np.isclose(metrics.loc[sku, "wape"], wape)
+
+    by_step = day56.grouped_forecast_metrics(frame, ["sku", "step"], scale=scale)
+    assert len(by_step) == 24
+    assert np.allclose(by_step["mase"] * scale.repeat(8).to_numpy(), by_step["mae"])
+
+
+def test_grouped_metrics_handle_missing_values_and_zero_demand() -> None:
+    frame = pd.DataFrame(
+        {
+            "sku": ["gap"] * 4 + ["intermittent"] * 4,
+            "actual": [0.0, np.nan, 12.0, 8.0, 0.0, 0.0, 5.0, 4.0],
+            "forecast": [1.0, 10.0, 11.0, 9.0, 0.0, 0.0, 4.0, 4.0],
+        }
+    )
+    metrics = day56.grouped_forecast_metrics(frame, "sku").set_index("sku")
+
+    for sku, group in frame.groupby("sku"):
+        expected = day56.forecast_metrics(group["actual"], group["forecast"])
+        for name, value in expected.items():
+            assert np.isclose(metrics.loc[sku, name], value, equal_nan=True)
+
+    assert metrics.loc["gap", ["mae", "mape", "wape"]].isna().all()
+    assert metrics.loc["gap", "count"] == 4
+    intermittent = metrics.loc["intermittent"]
+    assert np.isclose(intermittent["mape"], 100 * (1 / 5) / 4)
+    assert np.isclose(intermittent["smape"], 100 * (1 / 4.5) / 4)
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import numpy as np
+import pytest
+
 from Day_59_Generative_Models import solutions as day59
 
 
@@ -18,3 +21,48 @@ def test_vae_and_diffusion_losses_drop() -> None:
     diffusion_log = day59.train_diffusion_denoiser(data=data, epochs=80)
     assert vae_log.losses[0] - vae_log.losses[-1] > 0.05
     assert diffusion_log.losses[0] - diffusion_log.losses[-1] > 0.05
+
+
+def test_minibatch_float32_training_reduces_loss() -> None:
+    data = day59.generate_swiss_roll(n_samples=2048, random_state=61)
+    log = day59.train_autoencoder_synthetic(
+        data=data, epochs=20, batch_size=64, dtype="float32"
+    )
+    assert log.reconstructions.dtype == np.float32
+    assert log.parameters["W1"].dtype == np.float32
+    assert log.losses[0] - log.losses[-1] > 0.05
+
+    vae_log = day59.train_variational_autoencoder_synthetic(
+        data=data, epochs=20, batch_size=100
+    )
+    assert vae_log.losses[-1] < vae_log.losses[0]
+
+
+def test_early_stopping_truncates_training() -> None:
+    data = day59.generate_swiss_roll(random_state=59)
+    log = day59.train_autoencoder_synthetic(
+        data=data, epochs=5000, patience=3, min_delta=1e-4
+    )
+    assert len(log.losses) < 5000
+    with pytest.raises(ValueError):
+        day59.TrainingConfig(dtype="float16")
+
+
+def test_batched_diffusion_sampler_generates_requested_samples() -> None:
+    data = day59.generate_swiss_roll(n_samples=512, random_state=62)
+    log = day59.train_diffusion_denoiser(data=data, epochs=60, batch_size=128)
+    samples = day59.sample_diffusion(log, n_samples=5000)
+    assert samples.shape == (5000, 2)
+    assert np.all(np.isfinite(samples))
+    with pytest.raises(ValueError):
+        day59.sample_diffusion(day59.train_autoencoder_synthetic(epochs=1))
+
+
+def test_diffusion_sampler_reuses_the_trained_schedule_length() -> None:
+    data = day59.generate_swiss_roll(n_samples=256, random_state=63)
+    log = day59.train_diffusion_denoiser(data=data, timesteps=25, epochs=20)
+    assert int(log.parameters["timesteps"]) == 25
+    np.testing.assert_array_equal(
+        day59.sample_diffusion(log, n_samples=50),
+        day59.sample_diffusion(log, n_samples=50, timesteps=25),
+    )
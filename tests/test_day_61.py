@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import numpy as np
+import pandas as pd
 
 from Day_61_Reinforcement_and_Offline_Learning import solutions as day61
 
@@ -24,3 +25,91 @@ def test_offline_evaluation_reports_stable_estimate() -> None:
     offline = day61.offline_evaluation(random_state=61)
     assert offline["estimate"] > 0.75
     assert offline["effective_sample_size"] > 50
+
+
+def test_vectorised_estimators_match_per_decision_loop() -> None:
+    data = day61.simulate_logged_bandit(num_samples=400, random_state=3)
+    evaluation_policy = np.array([0.1, 0.2, 0.7])
+    reward_model = np.array([0.25, 0.45, 0.9])
+    estimates = day61.off_policy_statistics(
+        data, evaluation_policy, reward_model
+    ).estimates()
+
+    weights = [
+        evaluation_policy[a] / p for a, p in zip(data.actions, data.propensities)
+    ]
+    ips = sum(w * r for w, r in zip(weights, data.rewards)) / len(data)
+    direct = float(evaluation_policy @ reward_model)
+    dr = np.mean(
+        [
+            direct + w * (r - reward_model[a])
+            for w, r, a in zip(weights, data.rewards, data.actions)
+        ]
+    )
+    assert np.isclose(estimates["ips"], ips)
+    assert np.isclose(estimates["doubly_robust"], dr)
+    assert estimates["snips"] > 0.75
+
+
+def test_streamed_chunks_match_in_memory_statistics(tmp_path) -> None:
+    data = day61.simulate_logged_bandit(num_samples=1000, random_state=11)
+    path = tmp_path / "logged.csv"
+    pd.DataFrame(
+        {
+            "action": data.actions,
+            "reward": data.rewards,
+            "propensity": data.propensities,
+        }
+    ).to_csv(path, index=False)
+    evaluation_policy = np.array([0.1, 0.2, 0.7])
+    streamed = day61.evaluate_policy_stream(
+        day61.iter_logged_bandit_chunks(path, chunk_size=128), evaluation_policy
+    )
+    in_memory = day61.off_policy_statistics(data, evaluation_policy).estimates()
+    for key, value in in_memory.items():
+        assert np.isclose(streamed[key], value)
+
+
+def test_bootstrap_intervals_bracket_point_estimates() -> None:
+    data = day61.simulate_logged_bandit(num_samples=2000, random_state=5)
+    evaluation_policy = np.array([0.1, 0.2, 0.7])
+    reward_model = np.array([0.2, 0.5, 1.0])
+    point = day61.off_policy_statistics(
+        data, evaluation_policy, reward_model
+    ).estimates()
+    intervals = day61.bootstrap_off_policy_intervals(
+        data,
+        evaluation_policy,
+        reward_model,
+        n_bootstrap=200,
+        n_jobs=2,
+        block_size=512,
+    )
+    for name, (low, high) in intervals.items():
+        assert low < point[name] < high
+    assert intervals["doubly_robust"][1] - intervals["doubly_robust"][0] < (
+        intervals["ips"][1] - intervals["ips"][0]
+    )
+
+
+def test_bootstrap_intervals_stream_chunks_independent_of_workers(tmp_path) -> None:
+    data = day61.simulate_logged_bandit(num_samples=3000, random_state=9)
+    path = tmp_path / "logged.csv"
+    pd.DataFrame(
+        {
+            "action": data.actions,
+            "reward": data.rewards,
+            "propensity": data.propensities,
+        }
+    ).to_csv(path, index=False)
+    evaluation_policy = np.array([0.1, 0.2, 0.7])
+    options = dict(n_bootstrap=100, block_size=256)
+    in_memory = day61.bootstrap_off_policy_intervals(data, evaluation_policy, **options)
+    streamed = day61.bootstrap_off_policy_intervals(
+        day61.iter_logged_bandit_chunks(path, chunk_size=1024),
+        evaluation_policy,
+        n_jobs=2,
+        **options,
+    )
+    for name, bounds in in_memory.items():
+        np.testing.assert_allclose(streamed[name], bounds, rtol=1e-12)
@@ -3,6 +3,7 @@ import os
 import sys
 
 import numpy as np
+import pandas as pd
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -63,3 +64,80 @@ def test_fairness_mitigation_reduces_gap():
     mitigated = day62.mitigation_effect(dataset)
     assert abs(mitigated.statistical_parity) < abs(baseline.statistical_parity)
     assert mitigated.disparate_impact >= baseline.disparate_impact - 1e-6
+
+
+def test_batch_explainer_matches_single_instance_helpers():
+    model = day62.train_default_risk_model()
+    dataset = day62.load_credit_dataset()
+    instances = np.vstack([_encode_row(row) for _, row in dataset.iterrows()])
+    explainer = day62.BatchExplainer.from_dataset(model, dataset)
+
+    contributions = explainer.shap_values(instances)
+    reconstructed = explainer.base_value + contributions.sum(axis=1)
+    assert np.allclose(reconstructed, model.predict_batch(instances))
+    single = day62.compute_shap_values(model, instances[3], dataset)
+    assert np.allclose(contributions[3], single.contributions)
+
+    batch = explainer.lime(instances, num_samples=300, kernel_width=1e4, chunk_size=7)
+    assert len(batch) == len(dataset)
+    assert np.allclose(batch.weights, model.coefficients, rtol=1e-4, atol=1e-9)
+    local = batch.explanation(10).local_prediction(instances[10])
+    assert math.isclose(local, model.predict(instances[10]), rel_tol=1e-9)
+
+
+def test_batch_lime_is_independent_of_worker_count():
+    model = day62.train_default_risk_model()
+    dataset = day62.load_credit_dataset()
+    instances = np.vstack([_encode_row(row) for _, row in dataset.iterrows()])
+    explainer = day62.BatchExplainer.from_dataset(model)
+    serial = explainer.lime(instances, chunk_size=8, n_jobs=1)
+    parallel = explainer.lime(instances, chunk_size=8, n_jobs=2)
+    assert np.allclose(serial.weights, parallel.weights)
+    assert np.allclose(serial.intercepts, parallel.intercepts)
+
+
+def test_vectorised_reweighing_matches_row_by_row_weights():
+    dataset = day62.load_credit_dataset()
+    reweighted = day62.apply_reweighing(dataset)
+    rates = dataset.groupby("gender")["approved"].mean()
+    target = dataset["approved"].mean()
+    expected = [target / (rates[g] + 1e-12) for g in dataset["gender"]]
+    assert np.allclose(reweighted["sample_weight"], expected)
+
+
+def test_streamed_intersectional_report_matches_in_memory():
+    dataset = day62.load_credit_dataset()
+    dataset["income_band"] = np.where(dataset["income"] > 50_000, "high", "low")
+    protected = ["gender", "income_band"]
+    threshold = float(dataset["default_risk"].median())
+    in_memory = day62.group_fairness_report(
+        day62.group_outcome_sums(dataset, protected, risk_threshold=threshold),
+        reference_group=("M", "high"),
+    )
+    chunks = (dataset.iloc[i : i + 7] for i in range(0, len(dataset), 7))
+    streamed = day62.stream_group_fairness(
+        chunks, protected, risk_threshold=threshold, reference_group=("M", "high")
+    )
+    assert list(streamed.index) == list(in_memory.index)
+    assert np.allclose(streamed["selection_rate"], in_memory["selection_rate"])
+    assert streamed.loc[("M", "high"), "disparate_impact"] == 1.0
+    assert in_memory["count"].sum() == len(dataset)
+
+
+def test_group_sums_skip_rows_with_missing_protected_values():
+    dataset = day62.load_credit_dataset()
+    dataset["income_band"] = np.where(dataset["income"] > 50_000, "high", "low")
+    missing = dataset.copy()
+    missing.loc[[0, 5], "gender"] = np.nan
+    missing.loc[7, "income_band"] = None
+    threshold = float(dataset["default_risk"].median())
+    for protected in ("gender", ["gender", "income_band"]):
+        sums = day62.group_outcome_sums(missing, protected, risk_threshold=threshold)
+        expected = day62.group_outcome_sums(
+            missing.dropna(subset=day62._as_columns(protected)),
+            protected,
+            risk_threshold=threshold,
+        )
+        pd.testing.assert_frame_equal(sums, expected)
+    report = day62.fairness_metrics(missing)
+    assert np.isfinite(report.statistical_parity)
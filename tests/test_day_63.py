@@ -2,6 +2,9 @@ import math
 import os
 import sys
 
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from Day_63_Causal_Inference_and_Uplift import solutions as day63
@@ -25,3 +28,86 @@ def test_two_model_uplift_is_positive():
     uplift = day63.two_model_uplift(data)
     assert uplift.uplift > 0
     assert uplift.treatment_response > uplift.control_response
+
+
+def test_newton_propensity_matches_gradient_descent_in_few_iterations():
+    data = day63.generate_synthetic_treatment_data(random_state=63)
+    newton = day63.fit_propensity_model(data, max_iter=8)
+    gradient = day63.fit_propensity_model(data, solver="gradient", epochs=800)
+    assert np.allclose(newton.weights, gradient.weights, atol=1e-3)
+
+
+def test_newton_propensity_handles_separable_and_collinear_data():
+    data = day63.generate_synthetic_treatment_data(random_state=63)
+    separable = data.assign(treatment=(data["age"] > data["age"].median()).astype(int))
+    model = day63.fit_propensity_model(separable)
+    scores = model.predict_proba(day63._prepare_design_matrix(separable))
+    assert np.all(np.isfinite(model.weights))
+    treated = separable["treatment"].to_numpy() == 1
+    assert scores[treated].min() > 0.99 and scores[~treated].max() < 0.01
+
+    collinear = data.assign(income=2 * data["age"])
+    model = day63.fit_propensity_model(collinear)
+    assert np.all(np.isfinite(model.weights))
+
+
+def test_k_fold_cross_fitting_supports_pluggable_models_and_workers():
+    data = day63.generate_synthetic_treatment_data(n=1200, random_state=11)
+    true_effect = data["true_effect"].iloc[0]
+    serial = day63.cross_fit_double_ml(data, n_folds=5, shuffle=True)
+    parallel = day63.cross_fit_double_ml(data, n_folds=5, shuffle=True, n_jobs=2)
+    assert serial.ate == parallel.ate
+    assert math.isclose(serial.ate, true_effect, rel_tol=0.2)
+
+    forest = day63.cross_fit_double_ml(
+        data,
+        n_folds=3,
+        outcome_model=RandomForestRegressor(n_estimators=30, random_state=0),
+    )
+    assert math.isclose(forest.ate, true_effect, rel_tol=0.3)
+    assert forest.nuisance_r2[0] > serial.nuisance_r2[0]
+
+
+def test_bootstrap_intervals_cover_every_estimator():
+    data = day63.generate_synthetic_treatment_data(random_state=63)
+    propensity_model = day63.fit_propensity_model(data)
+    intervals = day63.bootstrap_effect_intervals(
+        data, n_bootstrap=400, propensity_model=propensity_model, block_size=128
+    )
+    expected = {
+        "difference_in_means": day63.difference_in_means(data).lift,
+        "ipw_ate": day63.estimate_ipw_ate(data, propensity_model),
+        "double_ml_ate": day63.double_machine_learning(data).ate,
+        "two_model_uplift": day63.two_model_uplift(data).uplift,
+    }
+    for name, point in expected.items():
+        interval = intervals[name]
+        assert math.isclose(interval.estimate, point, rel_tol=1e-9)
+        assert interval.ci_low < point < interval.ci_high
+
+    analytic = day63.difference_in_means(data).stderr
+    bootstrap = intervals["difference_in_means"].stderr
+    assert math.isclose(bootstrap, analytic, rel_tol=0.2)
+
+
+def test_multinomial_bootstrap_is_reproducible_across_workers():
+    data = day63.generate_synthetic_treatment_data(n=300, random_state=5)
+    first = day63.bootstrap_effect_intervals(
+        data, n_bootstrap=100, method="multinomial", n_jobs=2
+    )
+    second = day63.bootstrap_effect_intervals(
+        data, n_bootstrap=100, method="multinomial", n_jobs=2
+    )
+    assert first == second
+
+
+def test_bootstrap_uses_the_configured_cross_fitting():
+    data = day63.generate_synthetic_treatment_data(n=600, random_state=7)
+    options = {"n_folds": 5, "shuffle": True, "random_state": 3}
+    configured = day63.cross_fit_double_ml(data, **options)
+    intervals = day63.bootstrap_effect_intervals(
+        data, n_bootstrap=200, method="multinomial", dml_options=options
+    )
+    dml = intervals["double_ml_ate"]
+    assert math.isclose(dml.estimate, configured.ate, rel_tol=1e-12)
+    assert dml.ci_low < configured.ate < dml.ci_high
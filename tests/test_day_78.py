@@ -101,3 +101,231 @@ def test_reinforcement_learning_report_consistency() -> None:
     assert set(report.columns) == {"action", "explore"}
     assert report["explore"].sum() == 0
     assert report["action"].nunique() == 1
+
+    empty = solutions.reinforcement_learning_report([0.1, 0.3, 0.5], draws=0, seed=1)
+    assert empty.empty and list(empty.columns) == ["action", "explore"]
+
+
+def test_streaming_accumulator_matches_in_memory_statistics() -> None:
+    rng = np.random.default_rng(78)
+    control = rng.normal(100, 5, size=5_000)
+    treatment = rng.normal(101, 5, size=4_000)
+    events = pd.DataFrame(
+        {
+            "variant": ["control"] * control.size + ["treatment"] * treatment.size,
+            "value": np.concatenate([control, treatment]),
+        }
+    ).sample(frac=1.0, random_state=1)
+
+    workers = [solutions.ExperimentAccumulator() for _ in range(3)]
+    for index, start in enumerate(range(0, len(events), 1_000)):
+        workers[index % 3].ingest_frame(events.iloc[start : start + 1_000])
+    merged = workers[0].merge(workers[1]).merge(workers[2])
+
+    assert merged["control"].count == control.size
+    assert merged["control"].mean == pytest.approx(control.mean(), rel=1e-12)
+    assert merged["treatment"].variance == pytest.approx(
+        treatment.var(ddof=1), rel=1e-9
+    )
+
+    streamed = solutions.summarize_ab_test(merged["control"], merged["treatment"])
+    in_memory = solutions.summarize_ab_test(control, treatment)
+    pd.testing.assert_frame_equal(streamed, in_memory, check_exact=False, rtol=1e-9)
+    assert solutions.welch_t_p_value(
+        merged["control"], merged["treatment"]
+    ) == pytest.approx(solutions.welch_t_p_value(control, treatment), rel=1e-9)
+
+    generator_moments = solutions.StreamingMoments().update(iter(treatment[:10]))
+    result = solutions.run_hypothesis_test(generator_moments, baseline=100)
+    assert result == solutions.run_hypothesis_test(list(treatment[:10]), baseline=100)
+
+
+@pytest.mark.filterwarnings("ignore:invalid value encountered:RuntimeWarning")
+def test_streaming_moments_skip_missing_values_on_both_ingest_paths() -> None:
+    values = [1.0, 2.0, np.nan, 4.0]
+    summary = solutions.summarize_ab_test(values, [2.0, 3.0])
+    assert summary.loc[0, "mean"] == pytest.approx(7 / 3)
+    assert summary.loc[0, "count"] == 3
+    assert summary.loc[1, "lift_vs_control"] == pytest.approx(2.5 / (7 / 3) - 1)
+
+    frame = pd.DataFrame({"variant": "control", "value": values})
+    from_frame = solutions.ExperimentAccumulator().ingest_frame(frame)["control"]
+    from_values = solutions.ExperimentAccumulator().ingest("control", values)["control"]
+    assert (from_frame.count, from_frame.mean) == (from_values.count, from_values.mean)
+    assert from_frame.variance == pytest.approx(from_values.variance)
+
+    # Like pandas, infinite values are kept rather than skipped.
+    with_inf = [1.0, np.nan, np.inf]
+    series = pd.Series(with_inf)
+    for moments in (
+        solutions.StreamingMoments.from_values(with_inf),
+        solutions.ExperimentAccumulator().ingest_frame(
+            pd.DataFrame({"variant": "a", "value": with_inf})
+        )["a"],
+    ):
+        assert moments.count == series.count() == 2
+        assert moments.mean == series.mean() == np.inf
+        assert np.isnan(moments.variance) and np.isnan(series.var())
+
+
+def test_incremental_cohort_refresh_matches_full_recompute() -> None:
+    events = pd.DataFrame(
+        {
+            "cohort": [
+                "2024-01",
+                "2024-01",
+                "2024-02",
+                "2024-02",
+                "2024-01",
+                "2024-02",
+                "2024-03",
+            ],
+            "period": [0, 1, 0, 1, 2, 2, 0],
+            "active_users": [200, 150, 180, 90, 120, 60, 50],
+        }
+    )
+    history, latest = events[events["period"] < 2], events[events["period"] == 2]
+    state = solutions.CohortRetentionState.from_events(history)
+    refreshed = state.update(latest).retention()
+    pd.testing.assert_frame_equal(refreshed, solutions.cohort_retention(events))
+
+    categorical = events.assign(cohort=events["cohort"].astype("category"))
+    retention = solutions.cohort_retention(categorical)
+    assert list(retention.columns) == ["cohort", "period_0", "period_1", "period_2"]
+    assert retention["period_2"].tolist() == pytest.approx([0.6, 1 / 3, 0.0], abs=1e-4)
+
+
+def test_cohort_retention_skips_missing_labels_like_groupby() -> None:
+    events = pd.DataFrame(
+        {
+            "cohort": ["2024-01", "2024-01", None, "2024-02", "2024-02", "2024-01"],
+            "period": [0, 1, 0, 0, np.nan, 1],
+            "active_users": [200, 150, 999, 180, 999, np.nan],
+        }
+    )
+    retention = solutions.cohort_retention(events)
+    baseline = (
+        events.groupby(["cohort", "period"])["active_users"].sum().unstack(fill_value=0)
+    )
+    assert list(retention["cohort"]) == list(baseline.index)
+    np.testing.assert_allclose(
+        retention[["period_0", "period_1"]], (baseline.T / baseline[0.0]).T.round(4)
+    )
+    assert retention.loc[0, "period_1"] == 0.75
+
+
+def test_rule_based_segmentation_streams_with_shared_thresholds() -> None:
+    rng = np.random.default_rng(35)
+    frame = pd.DataFrame(
+        {
+            "spend": rng.gamma(2.0, 50.0, size=1_000),
+            "engagement": rng.poisson(6, size=1_000),
+            "tenure": rng.integers(1, 60, size=1_000),
+        }
+    )
+    default = solutions.segment_customers_by_behavior(frame)
+    assert isinstance(default["segment"].dtype, pd.CategoricalDtype)
+    spend_high = frame["spend"] >= frame["spend"].median()
+    engaged = frame["engagement"] >= frame["engagement"].median()
+    assert (default.loc[spend_high & engaged, "segment"] == "high_value").all()
+    assert (default.loc[~spend_high & ~engaged, "segment"] == "at_risk").all()
+
+    rules = [
+        solutions.SegmentRule("loyal_whale", high=("spend", "tenure"), low=()),
+        solutions.SegmentRule("new_and_engaged", high=("engagement",), low=("tenure",)),
+    ]
+    thresholds = solutions.quantile_thresholds(
+        frame, ["spend", "engagement", "tenure"], quantile={"spend": 0.9}
+    )
+    in_memory = solutions.segment_by_rules(frame, rules, thresholds=thresholds)
+    chunks = (frame.iloc[i : i + 128] for i in range(0, len(frame), 128))
+    streamed = pd.concat(
+        solutions.segment_in_chunks(chunks, rules, thresholds=thresholds)
+    )
+    pd.testing.assert_series_equal(streamed["segment"], in_memory["segment"])
+    assert list(in_memory["segment"].cat.categories) == [
+        "loyal_whale",
+        "new_and_engaged",
+        "other",
+    ]
+
+    scorecard = solutions.unsupervised_scorecard(in_memory)
+    assert scorecard["segment"].astype(str).tolist() == sorted(
+        scorecard["segment"].astype(str)
+    )
+    with pytest.raises(ValueError, match="at least one SegmentRule"):
+        solutions.segment_by_rules(frame, [])
+    repeated = solutions.segment_by_rules(
+        frame,
+        [rules[0], solutions.SegmentRule("loyal_whale", high=("engagement",))],
+        thresholds=thresholds,
+    )
+    assert set(repeated["segment"]) <= {"loyal_whale", "other"}
+    assert (repeated["segment"] == "loyal_whale").sum() >= (
+        in_memory["segment"] == "loyal_whale"
+    ).sum()
+
+
+def test_batched_epsilon_greedy_simulation_and_sweep() -> None:
+    estimates = [0.1, 0.3, 0.5]
+    simulation = solutions.simulate_epsilon_greedy(
+        estimates, epsilon=0.2, draws=500, runs=200, seed=3
+    )
+    assert simulation.actions.shape == simulation.explore.shape == (200, 500)
+    assert (simulation.actions[~simulation.explore] == 2).all()
+    assert simulation.explore.mean() == pytest.approx(0.2, abs=0.01)
+    shares = simulation.action_shares()
+    assert np.allclose(shares.sum(axis=1), 1.0)
+    runs = simulation.run_summary()
+    assert len(runs) == 200
+    assert np.allclose(runs["best_action_share"], shares["action_2"])
+
+    sweep = solutions.epsilon_greedy_sweep(
+        [estimates, [0.5, 0.5, 0.0]], [0.0, 0.1, 0.5], draws=200, runs=300, seed=7
+    )
+    assert len(sweep) == 6
+    greedy = sweep[(sweep["scenario"] == 0) & (sweep["epsilon"] == 0.0)].iloc[0]
+    assert greedy["regret_mean"] == 0.0 and greedy["explore_rate_p95"] == 0.0
+    regrets = sweep.loc[sweep["scenario"] == 0, "regret_mean"].tolist()
+    assert regrets == sorted(regrets)
+    assert {"mean_reward_p05", "mean_reward_p50", "mean_reward_p95"}.issubset(
+        sweep.columns
+    )
+
+
+def test_matrix_trend_and_seasonal_forecast_matches_per_series() -> None:
+    rng = np.random.default_rng(40)
+    time = np.arange(24)
+    kpis = np.vstack(
+        [
+            50 + 2.0 * time + 5 * np.sin(2 * np.pi * time / 4) + rng.normal(0, 0.5, 24),
+            10 - 0.5 * time + rng.normal(0, 0.5, 24),
+            np.full(24, 7.0),
+        ]
+    )
+    intercepts, slopes = solutions.estimate_trend_coefficients(kpis)
+    assert intercepts.shape == slopes.shape == (3,)
+    for row, values in enumerate(kpis):
+        intercept, slope = solutions.estimate_trend_coefficients(values)
+        assert intercepts[row] == pytest.approx(intercept) and slopes[
+            row
+        ] == pytest.approx(slope)
+        assert np.allclose(
+            solutions.seasonal_pattern(kpis, 4)[row],
+            solutions.seasonal_pattern(values, 4),
+        )
+
+    history = pd.DataFrame(kpis.T, columns=["revenue", "churn", "flat"])
+    combined = solutions.forecast_business_metrics(history, horizon=3, season_length=4)
+    assert len(combined) == 9
+    for column in history.columns:
+        _, single = solutions.forecast_business_metric(
+            history, value_col=column, horizon=3, season_length=4
+        )
+        subset = combined[combined["metric"] == column].reset_index(drop=True)
+        assert np.allclose(subset["forecast"], single["forecast"])
+    assert np.allclose(combined.loc[combined["metric"] == "flat", "forecast"], 7.0)
+    assert solutions.fit_trend_seasonal(kpis, season_length=4).forecast(3).shape == (
+        3,
+        3,
+    )
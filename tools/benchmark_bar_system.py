@@ -0,0 +1,559 @@
+"""Benchmarks for the point-of-sale workloads in ``mypackage.bar_system``."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from mypackage.bar_journal import SalesJournal  # noqa: E402
+from mypackage.bar_ledger import SalesLedger  # noqa: E402
+from mypackage.bar_reorder import ReorderEngine  # noqa: E402
+from mypackage.bar_system import BarSystem, SaleLine, SaleRecord  # noqa: E402
+from mypackage.money import cents_to_decimal, line_total_cents, to_cents  # noqa: E402
+
+
+def _build_system(
+    bloqueo: str, skus: int, journal: Optional[SalesJournal] = None
+) -> BarSystem:
+    sistema = BarSystem(mesas=range(1, 33), bloqueo=bloqueo, journal=journal)
+    for indice in range(skus):
+        sistema.agregar_item_inventario(
+            f"SKU{indice:03d}", f"Producto {indice}", "4.50", 10_000_000
+        )
+    return sistema
+
+
+def contention(
+    *,
+    threads: int = 8,
+    sales_per_thread: int = 2_000,
+    skus: int = 64,
+    journal_batch: Optional[int] = None,
+) -> Dict[str, Dict[str, float]]:
+    """Throughput of concurrent ``venta_rapida`` calls with per-SKU vs global locks.
+
+    With ``journal_batch`` every sale is also written to a temporary journal.
+    The fsync runs after the locks are released in both modes, so it does not
+    favour either one.
+    """
+
+    resultados: Dict[str, Dict[str, float]] = {}
+    for bloqueo in ("sku", "global"):
+        with tempfile.TemporaryDirectory() as carpeta:
+            journal = (
+                SalesJournal(Path(carpeta) / "bench.wal", batch_size=journal_batch)
+                if journal_batch
+                else None
+            )
+            sistema = _build_system(bloqueo, skus, journal)
+            barrera = threading.Barrier(threads + 1)
+
+            def terminal(numero: int) -> None:
+                barrera.wait()
+                for venta in range(sales_per_thread):
+                    primero = (numero * 7 + venta) % skus
+                    segundo = (primero + 1 + venta % 3) % skus
+                    sistema.venta_rapida(
+                        {f"SKU{primero:03d}": 1, f"SKU{segundo:03d}": 2}
+                    )
+
+            hilos = [
+                threading.Thread(target=terminal, args=(numero,))
+                for numero in range(threads)
+            ]
+            for hilo in hilos:
+                hilo.start()
+            barrera.wait()
+            inicio = time.perf_counter()
+            for hilo in hilos:
+                hilo.join()
+            elapsed = time.perf_counter() - inicio
+            sistema.cerrar_journal()
+        total = threads * sales_per_thread
+        resultados[bloqueo] = {
+            "seconds": elapsed,
+            "sales_per_second": total / elapsed,
+            "sales": float(total),
+        }
+    return resultados
+
+
+def money(*, lines: int = 200_000) -> Dict[str, Dict[str, float]]:
+    """Line totals folded into per-SKU and shift aggregates: ``Decimal`` vs cents.
+
+    Mirrors what ``BarSystem`` does per committed line: compute the rounded
+    line total, then add it to the shift total and the line's SKU bucket.
+    """
+
+    precios = [Decimal(f"{1 + indice % 997 / 100:.2f}") for indice in range(lines)]
+    cantidades = [Decimal(1 + indice % 4) for indice in range(lines)]
+    skus = [f"SKU{indice % 64:03d}" for indice in range(lines)]
+    centavo = Decimal("0.01")
+
+    inicio = time.perf_counter()
+    turno_decimal = Decimal("0")
+    por_sku_decimal: Dict[str, Decimal] = {}
+    for precio, cantidad, sku in zip(precios, cantidades, skus):
+        total = (precio * cantidad).quantize(centavo, rounding=ROUND_HALF_UP)
+        turno_decimal += total
+        por_sku_decimal[sku] = por_sku_decimal.get(sku, Decimal("0")) + total
+    turno_decimal = turno_decimal.quantize(centavo, rounding=ROUND_HALF_UP)
+    decimal_seconds = time.perf_counter() - inicio
+
+    precios_centavos = [to_cents(precio) for precio in precios]
+    inicio = time.perf_counter()
+    turno_centavos = 0
+    por_sku_centavos: Dict[str, int] = {}
+    for precio, cantidad, sku in zip(precios_centavos, cantidades, skus):
+        total = line_total_cents(precio, cantidad)
+        turno_centavos += total
+        por_sku_centavos[sku] = por_sku_centavos.get(sku, 0) + total
+    cents_seconds = time.perf_counter() - inicio
+
+    if cents_to_decimal(turno_centavos) != turno_decimal:
+        raise AssertionError("Integer-cents total diverged from the Decimal path")
+    return {
+        "decimal": {
+            "seconds": decimal_seconds,
+            "lines_per_second": lines / decimal_seconds,
+        },
+        "cents": {"seconds": cents_seconds, "lines_per_second": lines / cents_seconds},
+    }
+
+
+def bulk(*, orders: int = 20_000, skus: int = 64) -> Dict[str, Dict[str, float]]:
+    """An event-night burst of orders: one ``venta_rapida`` each vs ``procesar_pedidos``."""
+
+    pedidos = [
+        {f"SKU{indice % skus:03d}": 1 + indice % 3, f"SKU{(indice * 7) % skus:03d}": 1}
+        for indice in range(orders)
+    ]
+    resultados: Dict[str, Dict[str, float]] = {}
+    for variante in ("single", "bulk"):
+        sistema = _build_system("sku", skus)
+        inicio = time.perf_counter()
+        if variante == "single":
+            for pedido in pedidos:
+                sistema.venta_rapida(pedido)
+        else:
+            for desde in range(0, orders, 500):
+                sistema.procesar_pedidos(pedidos[desde : desde + 500])
+        elapsed = time.perf_counter() - inicio
+        resultados[variante] = {
+            "seconds": elapsed,
+            "orders_per_second": orders / elapsed,
+            "revenue": float(sistema.resumen_ventas()),
+        }
+    if resultados["single"]["revenue"] != resultados["bulk"]["revenue"]:
+        raise AssertionError("Bulk processing diverged from one-by-one sales")
+    return resultados
+
+
+def history(*, sales: int = 100_000, queries: int = 50) -> Dict[str, Dict[str, float]]:
+    """Per-day revenue by SKU over months of history: list scan vs ``SalesLedger``."""
+
+    inicio = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    paso = timedelta(days=180) / sales
+    ventas = [
+        SaleRecord(
+            identificador=str(indice),
+            tipo="rapida",
+            fecha=inicio + paso * indice,
+            lineas=(
+                SaleLine(
+                    f"SKU{indice % 64:03d}",
+                    "Producto",
+                    Decimal(1 + indice % 3),
+                    Decimal("4.50"),
+                ),
+                SaleLine(
+                    f"SKU{indice % 7:03d}", "Producto", Decimal(1), Decimal("2.25")
+                ),
+            ),
+        )
+        for indice in range(sales)
+    ]
+    libro = SalesLedger()
+    for venta in ventas:
+        libro.append(venta)
+    dias = [inicio + timedelta(days=(dia * 37) % 180) for dia in range(queries)]
+
+    arranque = time.perf_counter()
+    for dia in dias:
+        fin = dia + timedelta(days=1)
+        por_sku: Dict[str, int] = {}
+        for venta in ventas:
+            if dia <= venta.fecha < fin:
+                for linea in venta.lineas:
+                    por_sku[linea.sku] = (
+                        por_sku.get(linea.sku, 0) + linea.total_centavos
+                    )
+    scan_seconds = time.perf_counter() - arranque
+
+    arranque = time.perf_counter()
+    for dia in dias:
+        resultado = libro.totals_by("sku", dia, dia + timedelta(days=1))
+    ledger_seconds = time.perf_counter() - arranque
+
+    if resultado != {sku: cents_to_decimal(monto) for sku, monto in por_sku.items()}:
+        raise AssertionError("Ledger totals diverged from the list scan")
+    return {
+        "list_scan": {
+            "seconds": scan_seconds,
+            "queries_per_second": queries / scan_seconds,
+        },
+        "ledger": {
+            "seconds": ledger_seconds,
+            "queries_per_second": queries / ledger_seconds,
+        },
+    }
+
+
+@dataclass(frozen=True)
+class _DictSaleLine:
+    """``SaleLine`` as it was before ``slots=True``, kept as a memory baseline."""
+
+    sku: str
+    nombre: str
+    cantidad: Decimal
+    precio_unitario: Decimal
+    total_centavos: int
+
+
+@dataclass(frozen=True)
+class _DictSaleRecord:
+    identificador: str
+    tipo: str
+    fecha: datetime
+    lineas: Tuple[_DictSaleLine, ...]
+    mesa: Optional[str]
+    nota: Optional[str]
+    total_centavos: int
+
+
+def _traced_bytes(build: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        retained = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del retained
+    return current
+
+
+def memory(*, days: int = 365, sales_per_day: int = 300) -> Dict[str, Dict[str, float]]:
+    """Memory retained by a year of sales history in each representation."""
+
+    inicio = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    paso = timedelta(days=1) / sales_per_day
+    total_ventas = days * sales_per_day
+    precio = Decimal("4.50")
+    nombres = [f"Producto {indice}" for indice in range(64)]
+
+    def detalle(indice: int) -> List[Tuple[str, str, Decimal]]:
+        return [
+            (
+                f"SKU{(indice + salto) % 64:03d}",
+                nombres[(indice + salto) % 64],
+                Decimal(1 + salto),
+            )
+            for salto in range(1 + indice % 3)
+        ]
+
+    def dict_records() -> List[_DictSaleRecord]:
+        ventas = []
+        for indice in range(total_ventas):
+            lineas = tuple(
+                _DictSaleLine(
+                    sku, nombre, cantidad, precio, line_total_cents(precio, cantidad)
+                )
+                for sku, nombre, cantidad in detalle(indice)
+            )
+            ventas.append(
+                _DictSaleRecord(
+                    str(indice),
+                    "rapida",
+                    inicio + paso * indice,
+                    lineas,
+                    None,
+                    None,
+                    sum(linea.total_centavos for linea in lineas),
+                )
+            )
+        return ventas
+
+    def slotted_records() -> List[SaleRecord]:
+        return [
+            SaleRecord(
+                identificador=str(indice),
+                tipo="rapida",
+                fecha=inicio + paso * indice,
+                lineas=tuple(
+                    SaleLine(sku, nombre, cantidad, precio)
+                    for sku, nombre, cantidad in detalle(indice)
+                ),
+            )
+            for indice in range(total_ventas)
+        ]
+
+    def ledger() -> SalesLedger:
+        libro = SalesLedger()
+        for indice in range(total_ventas):
+            libro.append(
+                SaleRecord(
+                    identificador=str(indice),
+                    tipo="rapida",
+                    fecha=inicio + paso * indice,
+                    lineas=tuple(
+                        SaleLine(sku, nombre, cantidad, precio)
+                        for sku, nombre, cantidad in detalle(indice)
+                    ),
+                )
+            )
+        return libro
+
+    resultados: Dict[str, Dict[str, float]] = {}
+    for variante, build in (
+        ("dataclass", dict_records),
+        ("slots", slotted_records),
+        ("ledger", ledger),
+    ):
+        retenido = _traced_bytes(build)
+        resultados[variante] = {
+            "megabytes": retenido / 1_000_000,
+            "bytes_per_sale": retenido / total_ventas,
+        }
+    return resultados
+
+
+def restore(*, sales: int = 20_000) -> Dict[str, Dict[str, float]]:
+    """Save and restore a shift of sales: JSON snapshot vs binary snapshot."""
+
+    sistema = _build_system("sku", 64)
+    pedidos = [
+        {f"SKU{indice % 64:03d}": 1 + indice % 3, f"SKU{(indice * 7) % 64:03d}": 1}
+        for indice in range(sales)
+    ]
+    for desde in range(0, sales, 500):
+        sistema.procesar_pedidos(pedidos[desde : desde + 500])
+    total = sistema.resumen_ventas()
+
+    resultados: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as carpeta:
+        for variante in ("json", "binary"):
+            ruta = Path(carpeta) / f"turno.{variante}"
+            guardar = (
+                sistema.guardar_snapshot
+                if variante == "json"
+                else sistema.guardar_snapshot_binario
+            )
+            inicio = time.perf_counter()
+            guardar(ruta)
+            save_seconds = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            restaurado = (
+                BarSystem.recuperar(Path(carpeta) / "vacio.wal", ruta)
+                if variante == "json"
+                else BarSystem.restaurar_snapshot(ruta)
+            )
+            restore_seconds = time.perf_counter() - inicio
+            if restaurado.resumen_ventas() != total:
+                raise AssertionError(
+                    f"{variante} restore diverged from the live system"
+                )
+            inicio = time.perf_counter()
+            restaurado.historial_ventas()
+            history_seconds = time.perf_counter() - inicio
+            restaurado.cerrar_journal()
+            resultados[variante] = {
+                "save_seconds": save_seconds,
+                "restore_seconds": restore_seconds,
+                "first_history_seconds": history_seconds,
+                "megabytes": ruta.stat().st_size / 1_000_000,
+            }
+    return resultados
+
+
+def reorder(
+    *, catalogue: int = 5_000, sales: int = 2_000
+) -> Dict[str, Dict[str, float]]:
+    """Reorder checks after every sale: full catalogue scan vs ``ReorderEngine``."""
+
+    inicio = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    iniciales = {f"SKU{indice:05d}": 20 + indice % 200 for indice in range(catalogue)}
+    existencias = dict(iniciales)
+    # Half of the sales hit a small set of best sellers so some SKUs run low.
+    consumos = []
+    for indice in range(sales):
+        universo = catalogue if indice % 2 else min(catalogue, 200)
+        sku = f"SKU{(indice * 7919) % universo:05d}"
+        cantidad = 1 + indice % 5
+        existencias[sku] = max(existencias[sku] - cantidad, 0)
+        consumos.append(
+            (sku, cantidad, existencias[sku], inicio + timedelta(seconds=30 * indice))
+        )
+    vida_media = timedelta(hours=6)
+    motor = ReorderEngine(vida_media=vida_media)
+    tau = vida_media.total_seconds() / math.log(2)
+    plazo = motor.plazo_entrega.total_seconds()
+
+    resultados: Dict[str, Dict[str, float]] = {}
+    # Baseline: the same EWMA rates, but every SKU is re-checked after each sale.
+    stock = dict(iniciales)
+    tasas: Dict[str, Tuple[float, float]] = {}
+    comienzo = time.perf_counter()
+    for sku, cantidad, restante, fecha in consumos:
+        ahora = fecha.timestamp()
+        tasa, ultimo = tasas.get(sku, (0.0, ahora))
+        tasas[sku] = (tasa * math.exp(-(ahora - ultimo) / tau) + cantidad / tau, ahora)
+        stock[sku] = restante
+        vencidos = []
+        for candidato, unidades in stock.items():
+            if candidato not in tasas:
+                continue
+            tasa, ultimo = tasas[candidato]
+            tasa *= math.exp(-(ahora - ultimo) / tau)
+            if unidades <= 0 or unidades / tasa <= plazo:
+                vencidos.append(candidato)
+    elapsed = time.perf_counter() - comienzo
+    resultados["scan"] = {
+        "seconds": elapsed,
+        "sales_per_second": sales / elapsed,
+        "due": len(vencidos),
+    }
+
+    for sku, unidades in iniciales.items():
+        motor.update_stock(sku, unidades, inicio)
+    comienzo = time.perf_counter()
+    for sku, cantidad, restante, fecha in consumos:
+        motor.record_consumption(sku, cantidad, restante, fecha)
+        sugerencias = motor.suggestions(fecha)
+    elapsed = time.perf_counter() - comienzo
+    resultados["heap"] = {
+        "seconds": elapsed,
+        "sales_per_second": sales / elapsed,
+        "due": len(sugerencias),
+    }
+    if sorted(vencidos) != sorted(s.sku for s in sugerencias):
+        raise AssertionError("ReorderEngine diverged from the full scan")
+    return resultados
+
+
+SCENARIOS: Dict[str, Callable[..., Dict[str, Dict[str, float]]]] = {
+    "contention": contention,
+    "money": money,
+    "history": history,
+    "bulk": bulk,
+    "memory": memory,
+    "restore": restore,
+    "reorder": reorder,
+}
+
+
+def run_benchmarks(
+    names: List[str], repeats: int, **options: int
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    report: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name in names:
+        runs = [SCENARIOS[name](**options.get(name, {})) for _ in range(repeats)]
+        report[name] = {
+            variant: {
+                metric: statistics.mean(run[variant][metric] for run in runs)
+                for metric in runs[0][variant]
+            }
+            for variant in runs[0]
+        }
+    return report
+
+
+def _print_summary(report: Dict[str, Dict[str, Dict[str, float]]]) -> None:
+    print("Bar System Benchmarks")
+    print("=" * 21)
+    for name, variants in report.items():
+        print(f"• {name}")
+        for variant, metrics in variants.items():
+            formatted = ", ".join(
+                f"{key}={value:,.4g}" for key, value in metrics.items()
+            )
+            print(f"  {variant}: {formatted}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark BarSystem workloads.")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable); defaults to all",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--sales", type=int, default=2_000, help="Sales per thread")
+    parser.add_argument("--skus", type=int, default=64)
+    parser.add_argument("--lines", type=int, default=200_000, help="Lines for money")
+    parser.add_argument("--orders", type=int, default=20_000, help="Orders for bulk")
+    parser.add_argument(
+        "--days", type=int, default=365, help="Days of history for memory"
+    )
+    parser.add_argument(
+        "--shift-sales", type=int, default=20_000, help="Sales saved for restore"
+    )
+    parser.add_argument(
+        "--history-sales", type=int, default=100_000, help="Sales kept for history"
+    )
+    parser.add_argument(
+        "--catalogue", type=int, default=5_000, help="SKUs tracked by reorder"
+    )
+    parser.add_argument(
+        "--journal-batch",
+        type=int,
+        default=None,
+        help="Journal every sale with this fsync batch size",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("bar-benchmark-results.json"),
+        help="Path to write JSON results",
+    )
+    args = parser.parse_args()
+
+    options = {
+        "contention": {
+            "threads": args.threads,
+            "sales_per_thread": args.sales,
+            "skus": args.skus,
+            "journal_batch": args.journal_batch,
+        },
+        "money": {"lines": args.lines},
+        "history": {"sales": args.history_sales},
+        "bulk": {"orders": args.orders, "skus": args.skus},
+        "memory": {"days": args.days},
+        "restore": {"sales": args.shift_sales},
+        "reorder": {"catalogue": args.catalogue, "sales": args.sales},
+    }
+    report = run_benchmarks(args.scenario or list(SCENARIOS), args.repeats, **options)
+    _print_summary(report)
+    args.output.write_text(
+        json.dumps({"benchmarks": report, "repeats": args.repeats}, indent=2)
+    )
+    print(f"Benchmark results written to {args.output.resolve()}")
+
+
+if __name__ == "__main__":
+    main()